@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the output highlighter.
+
+Replays recorded PTY byte streams (scripts/bench_corpora/*.pty.gz) through
+OutputHighlighter.highlight_line / highlight_text and through the proxy's
+_process_data_streaming path with a fake terminal sink. No window or display
+is needed. The GLib main context is iterated by hand to run queued feeds.
+
+The bundled rules in src/zashterminal/data/highlights are used with a
+throw-away config directory, so results only depend on the tree being
+measured. Save results with --json and compare two commits with --compare:
+
+    python scripts/bench_highlighter.py --json before.json
+    git checkout <other> && python scripts/bench_highlighter.py --compare before.json
+
+New corpora can be recorded from a real PTY:
+
+    python scripts/bench_highlighter.py --record dmesg -- dmesg --color=always
+
+--verify replays the corpora through the proxy and checks that its output
+only differs from the input by added colors, and that the binary and
+non-UTF-8 corpora come out byte for byte. --fuzz N does the same for N
+generated streams mixing text, Latin-1, binary data and escape sequences,
+split at random chunk boundaries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+CORPORA_DIR = ROOT / "scripts" / "bench_corpora"
+
+# name -> (file, natural context, repeat)
+# The natural context is the highlight context the output belongs to; None
+# means the corpus is only measured with the global rules.
+CORPORA: Dict[str, Tuple[str, Optional[str], int]] = {
+    "ping": ("ping.pty.gz", "ping", 1),
+    "docker_ps": ("docker_ps.pty.gz", "docker", 1),
+    "journalctl": ("journalctl.pty.gz", "journalctl", 1),
+    "gcc_errors": ("gcc_errors.pty.gz", "gcc", 1),
+    "log_100k": ("app_log.pty.gz", None, 100),
+    "ansi_heavy": ("ansi_heavy.pty.gz", None, 1),
+    "latin1_log": ("latin1_log.pty.gz", None, 5),
+    "binary": ("binary.pty.gz", None, 4),
+}
+
+# Corpora the proxy must feed to the terminal byte for byte
+PASSTHROUGH_CORPORA = frozenset(("latin1_log", "binary"))
+
+# SGR sequences: the only bytes highlighting may add to the output
+_SGR_PATTERN = re.compile(rb"\x1b\[[0-9;]*m")
+
+MODES = ("line", "text", "stream")
+GLOBAL_RULESET = "global"
+
+
+@dataclass
+class Result:
+    corpus: str
+    ruleset: str
+    mode: str
+    lines: int
+    bytes: int
+    seconds: float
+    lines_per_sec: float
+    mb_per_sec: float
+    p50_us: Optional[float] = None
+    p99_us: Optional[float] = None
+    peak_alloc_kib: Optional[float] = None
+
+
+def _isolate_config() -> None:
+    """Point XDG dirs at a temporary directory so user rules are ignored."""
+    tmp = tempfile.mkdtemp(prefix="zash-bench-")
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(tmp, "config")
+    os.environ["XDG_CACHE_HOME"] = os.path.join(tmp, "cache")
+
+
+def load_corpus(name: str, scale: float = 1.0) -> bytes:
+    filename, _context, repeat = CORPORA[name]
+    path = CORPORA_DIR / filename
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        data = f.read()
+    return data * max(1, int(repeat * scale))
+
+
+def split_lines(text: str) -> List[str]:
+    """Split like the proxy does: per line, without the line ending."""
+    return [line.rstrip("\r\n") for line in text.splitlines(keepends=True)]
+
+
+def _percentile(sorted_values: Sequence[int], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100.0))
+    return sorted_values[index] / 1000.0
+
+
+def _make_result(corpus, ruleset, mode, lines, nbytes, seconds, **extra) -> Result:
+    seconds = max(seconds, 1e-9)
+    return Result(
+        corpus=corpus,
+        ruleset=ruleset,
+        mode=mode,
+        lines=lines,
+        bytes=nbytes,
+        seconds=round(seconds, 6),
+        lines_per_sec=round(lines / seconds, 1),
+        mb_per_sec=round(nbytes / seconds / (1024 * 1024), 3),
+        **extra,
+    )
+
+
+class FakeTerminal:
+    """Minimal stand-in for Vte.Terminal: counts (or keeps) what gets fed."""
+
+    def __init__(self, keep: bool = False):
+        self.fed_bytes = 0
+        self.feeds = 0
+        self.chunks: Optional[List[bytes]] = [] if keep else None
+
+    def feed(self, data: bytes) -> None:
+        self.fed_bytes += len(data)
+        self.feeds += 1
+        if self.chunks is not None:
+            self.chunks.append(bytes(data))
+
+    def connect(self, *_args) -> int:
+        return 0
+
+    def disconnect(self, _handler_id: int) -> None:
+        pass
+
+    def get_mapped(self) -> bool:
+        return True
+
+
+class HighlighterBench:
+    def __init__(self, iterations: int, chunk_size: int, use_worker: bool):
+        from zashterminal.settings.manager import get_settings_manager
+        from zashterminal.terminal.highlighter.output import get_output_highlighter
+
+        self.iterations = iterations
+        self.chunk_size = chunk_size
+        self.highlighter = get_output_highlighter()
+        manager = self.highlighter._manager
+        manager.enabled_for_local = True
+        manager.context_aware_enabled = True
+        get_settings_manager().set(
+            "highlight_worker_enabled", use_worker, save_immediately=False
+        )
+        self._proxy_ids = iter(range(900000, 1000000))
+
+    def rulesets(self) -> List[str]:
+        names = self.highlighter._manager.get_context_names()
+        return [GLOBAL_RULESET] + sorted(n for n in names if n != GLOBAL_RULESET)
+
+    def _set_context(self, proxy_id: int, ruleset: str) -> None:
+        self.highlighter.register_proxy(proxy_id)
+        if ruleset != GLOBAL_RULESET:
+            self.highlighter.set_context(ruleset, proxy_id)
+        # Don't treat the first corpus line as the command echo
+        self.highlighter.should_skip_first_output(proxy_id)
+
+    def bench_line(self, corpus: str, ruleset: str, data: bytes) -> Result:
+        lines = split_lines(data.decode("utf-8", errors="replace"))
+        proxy_id = next(self._proxy_ids)
+        self._set_context(proxy_id, ruleset)
+        highlight_line = self.highlighter.highlight_line
+        clock = time.perf_counter_ns
+
+        best_ns = None
+        best_latencies: List[int] = []
+        for _ in range(self.iterations):
+            latencies = []
+            append = latencies.append
+            start = clock()
+            for line in lines:
+                t0 = clock()
+                highlight_line(line, proxy_id)
+                append(clock() - t0)
+            elapsed = clock() - start
+            if best_ns is None or elapsed < best_ns:
+                best_ns, best_latencies = elapsed, latencies
+
+        # Separate pass: tracemalloc slows everything down
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for line in lines:
+            highlight_line(line, proxy_id)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.highlighter.unregister_proxy(proxy_id)
+        best_latencies.sort()
+        return _make_result(
+            corpus,
+            ruleset,
+            "line",
+            len(lines),
+            len(data),
+            best_ns / 1e9,
+            p50_us=round(_percentile(best_latencies, 50), 2),
+            p99_us=round(_percentile(best_latencies, 99), 2),
+            peak_alloc_kib=round(max(0, peak - baseline) / 1024, 1),
+        )
+
+    def bench_text(self, corpus: str, ruleset: str, data: bytes) -> Result:
+        text = data.decode("utf-8", errors="replace")
+        proxy_id = next(self._proxy_ids)
+        self._set_context(proxy_id, ruleset)
+        chunks = [
+            text[i : i + self.chunk_size] for i in range(0, len(text), self.chunk_size)
+        ]
+
+        best = None
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            for chunk in chunks:
+                self.highlighter.highlight_text(chunk, proxy_id)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        self.highlighter.unregister_proxy(proxy_id)
+        return _make_result(
+            corpus, ruleset, "text", text.count("\n"), len(data), best
+        )
+
+    def bench_stream(self, corpus: str, ruleset: str, data: bytes) -> Result:
+        from gi.repository import GLib
+
+        from zashterminal.terminal._highlighter_impl import HighlightedTerminalProxy
+
+        context = GLib.MainContext.default()
+        chunks = [
+            data[i : i + self.chunk_size] for i in range(0, len(data), self.chunk_size)
+        ]
+
+        best = None
+        for _ in range(self.iterations):
+            sink = FakeTerminal()
+            proxy_id = next(self._proxy_ids)
+            proxy = HighlightedTerminalProxy(sink, "local", proxy_id=proxy_id)
+            proxy._running = True
+            self._set_context(proxy_id, ruleset)
+
+            start = time.perf_counter()
+            for chunk in chunks:
+                proxy._process_data_streaming(chunk, sink)
+                while context.pending():
+                    context.iteration(False)
+            proxy._flush_queue(sink)
+            if proxy._partial_line_buffer:
+                sink.feed(proxy._partial_line_buffer)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+            proxy.stop()
+            self.highlighter.unregister_proxy(proxy_id)
+
+        return _make_result(
+            corpus, ruleset, "stream", data.count(b"\n"), len(data), best
+        )
+
+    def run(self, corpus: str, ruleset: str, mode: str, data: bytes) -> Result:
+        return getattr(self, f"bench_{mode}")(corpus, ruleset, data)
+
+    def replay(self, ruleset: str, chunks: Sequence[bytes]) -> bytes:
+        """Feed chunks through the proxy's stream path; return its output."""
+        from gi.repository import GLib
+
+        from zashterminal.terminal._highlighter_impl import HighlightedTerminalProxy
+
+        context = GLib.MainContext.default()
+        sink = FakeTerminal(keep=True)
+        proxy_id = next(self._proxy_ids)
+        proxy = HighlightedTerminalProxy(sink, "local", proxy_id=proxy_id)
+        proxy._running = True
+        self._set_context(proxy_id, ruleset)
+
+        for chunk in chunks:
+            proxy._process_data_streaming(chunk, sink)
+            while context.pending():
+                context.iteration(False)
+        proxy._flush_queue(sink)
+        if proxy._partial_line_buffer:
+            sink.feed(proxy._partial_line_buffer)
+
+        proxy.stop()
+        self.highlighter.unregister_proxy(proxy_id)
+        return b"".join(sink.chunks)
+
+
+def check_output(data: bytes, output: bytes, exact: bool) -> Optional[str]:
+    """
+    Compare proxy output with its input.
+
+    Highlighting may only add SGR sequences; output without added ones (no
+    rule matched, or the stream was passed through) must equal the input.
+    NUL bytes are ignored: the proxy drops them from text on purpose and
+    terminals ignore them anyway. Returns a description of the first
+    problem, or None.
+    """
+    data = data.replace(b"\x00", b"")
+    output = output.replace(b"\x00", b"")
+    if output == data:
+        return None
+    if exact:
+        return "passthrough output differs from input"
+    if len(_SGR_PATTERN.findall(output)) == len(_SGR_PATTERN.findall(data)):
+        return "output differs from input although nothing was highlighted"
+    stripped_in = _SGR_PATTERN.sub(b"", data)
+    stripped_out = _SGR_PATTERN.sub(b"", output)
+    if stripped_out != stripped_in:
+        offset = next(
+            (i for i, (a, b) in enumerate(zip(stripped_in, stripped_out)) if a != b),
+            min(len(stripped_in), len(stripped_out)),
+        )
+        return f"output text differs from input at byte {offset} (colors stripped)"
+    return None
+
+
+def _split_chunks(data: bytes, rng: random.Random, max_size: int) -> List[bytes]:
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, max_size)
+        chunks.append(data[pos : pos + size])
+        pos += size
+    return chunks
+
+
+# No word ends like a shell prompt ($ # % >): the proxy's prompt detection
+# would rightly treat such a line as interactive
+_FUZZ_WORDS = (
+    "build",
+    "error",
+    "warning",
+    "ok",
+    "done",
+    "failed",
+    "GET",
+    "/usr/lib",
+    "192.168.1.20",
+    "fe80::1",
+    "https://example.org/x",
+    '"quoted"',
+    "42% done",
+    "naïve",
+    "café",
+    "→",
+    "日本語",
+)
+
+
+def generate_fuzz_stream(rng: random.Random) -> Tuple[bytes, bool]:
+    """
+    Generate one fuzz stream.
+
+    Streams carry no escape sequences of their own, so stripping the SGR
+    sequences highlighting added must give back the input exactly.
+
+    Returns:
+        The stream and whether it must pass through unchanged (it contains
+        binary or non-UTF-8 data on every line).
+    """
+    parts: List[bytes] = []
+    binary_only = rng.random() < 0.3
+    for _ in range(rng.randint(1, 40)):
+        kind = rng.random()
+        if binary_only or kind < 0.15:
+            parts.append(bytes(rng.getrandbits(8) for _ in range(rng.randint(1, 300))))
+            continue
+        words = [rng.choice(_FUZZ_WORDS) for _ in range(rng.randint(1, 12))]
+        line = " ".join(words)
+        if kind < 0.3:
+            encoded = line.encode("latin-1", errors="replace") + bytes(
+                [rng.randint(0xC0, 0xFF)]
+            )
+        else:
+            encoded = line.encode()
+        parts.append(encoded + rng.choice((b"\n", b"\r\n", b"\r\n", b"\n")))
+    return b"".join(parts), binary_only
+
+
+def run_fuzz(bench: "HighlighterBench", count: int, seed: int) -> int:
+    """Replay generated streams and check their output; returns failures."""
+    rng = random.Random(seed)
+    rulesets = bench.rulesets()
+    failures = 0
+    for index in range(count):
+        data, exact = generate_fuzz_stream(rng)
+        ruleset = rng.choice(rulesets)
+        chunks = _split_chunks(data, rng, rng.choice((16, 256, 4096)))
+        problem = check_output(data, bench.replay(ruleset, chunks), exact)
+        if problem:
+            failures += 1
+            print(f"fuzz #{index} (seed {seed}, ruleset {ruleset}): {problem}")
+    print(f"Fuzz: {count - failures}/{count} streams OK")
+    return failures
+
+
+def run_verify(
+    bench: "HighlighterBench", corpora: Sequence[str], chunk_size: int
+) -> int:
+    """Replay the corpora and check their output; returns failures."""
+    failures = 0
+    for corpus in corpora:
+        data = load_corpus(corpus)
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        natural = CORPORA[corpus][1]
+        for ruleset in [GLOBAL_RULESET] + ([natural] if natural else []):
+            problem = check_output(
+                data, bench.replay(ruleset, chunks), corpus in PASSTHROUGH_CORPORA
+            )
+            status = problem or "OK"
+            print(f"{corpus:<12} {ruleset:<12} {status}")
+            failures += bool(problem)
+    return failures
+
+
+def record_corpus(name: str, command: Sequence[str]) -> Path:
+    """Run a command on a PTY and store its raw output as a corpus file."""
+    import pty
+
+    chunks: List[bytes] = []
+
+    def read(fd: int) -> bytes:
+        data = os.read(fd, 65536)
+        chunks.append(data)
+        return data
+
+    os.environ.setdefault("TERM", "xterm-256color")
+    pty.spawn(list(command), read)
+
+    path = CORPORA_DIR / f"{name}.pty.gz"
+    with gzip.GzipFile(path, "wb", mtime=0) as f:
+        f.write(b"".join(chunks))
+    return path
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _metadata(args: argparse.Namespace) -> dict:
+    try:
+        import regex
+
+        regex_version = regex.__version__
+    except Exception:
+        regex_version = None
+    return {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "regex": regex_version,
+        "machine": platform.machine(),
+        "iterations": args.iterations,
+        "chunk_size": args.chunk_size,
+        "scale": args.scale,
+        "worker": not args.no_worker,
+    }
+
+
+def print_table(results: List[Result], baseline: Optional[Dict] = None) -> None:
+    header = (
+        f"{'corpus':<12} {'ruleset':<12} {'mode':<6} {'lines':>8} "
+        f"{'lines/s':>11} {'MB/s':>8} {'p50 us':>8} {'p99 us':>8} {'peak KiB':>9}"
+    )
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for r in results:
+        row = (
+            f"{r.corpus:<12} {r.ruleset:<12} {r.mode:<6} {r.lines:>8} "
+            f"{r.lines_per_sec:>11.0f} {r.mb_per_sec:>8.2f} "
+            f"{r.p50_us if r.p50_us is not None else '-':>8} "
+            f"{r.p99_us if r.p99_us is not None else '-':>8} "
+            f"{r.peak_alloc_kib if r.peak_alloc_kib is not None else '-':>9}"
+        )
+        if baseline:
+            base = baseline.get((r.corpus, r.ruleset, r.mode))
+            if base and base["lines_per_sec"]:
+                change = r.lines_per_sec / base["lines_per_sec"] - 1.0
+                row += f" {change:>+8.1%}"
+            else:
+                row += f" {'n/a':>8}"
+        print(row)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=sorted(CORPORA),
+        help="Corpus to replay (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=MODES,
+        help="Code path to measure (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--contexts",
+        choices=("natural", "global", "all"),
+        default="natural",
+        help="Rule sets: global plus the corpus' own context (natural), "
+        "global only, or global plus every context in data/highlights (all)",
+    )
+    parser.add_argument("--iterations", type=int, default=3, help="Best-of runs")
+    parser.add_argument(
+        "--chunk-size", type=int, default=4096, help="Replay chunk size in bytes"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Scale corpus repeat counts"
+    )
+    parser.add_argument(
+        "--no-worker",
+        action="store_true",
+        help="Highlight stream mode on the calling thread only",
+    )
+    parser.add_argument(
+        "--user-config",
+        action="store_true",
+        help="Use the user's highlight rules instead of the bundled ones",
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument(
+        "--compare", type=Path, help="Show lines/s change against a saved run"
+    )
+    parser.add_argument(
+        "--record",
+        metavar="NAME",
+        help="Record the command after '--' into bench_corpora/NAME.pty.gz",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check proxy output against the corpora instead of timing",
+    )
+    parser.add_argument(
+        "--fuzz",
+        type=int,
+        metavar="N",
+        help="Check proxy output for N generated streams instead of timing",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Fuzz random seed")
+    parser.add_argument("command", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.record:
+        if not args.command:
+            parser.error("--record needs a command after '--'")
+        print(f"Recorded {record_corpus(args.record, args.command)}")
+        return 0
+
+    if not args.user_config:
+        _isolate_config()
+    sys.path.insert(0, str(ROOT / "src"))
+
+    bench = HighlighterBench(args.iterations, args.chunk_size, not args.no_worker)
+    corpora = args.corpus or list(CORPORA)
+
+    if args.verify or args.fuzz:
+        failures = 0
+        if args.verify:
+            failures += run_verify(bench, corpora, args.chunk_size)
+        if args.fuzz:
+            failures += run_fuzz(bench, args.fuzz, args.seed)
+        return 1 if failures else 0
+    modes = args.mode or list(MODES)
+    all_rulesets = bench.rulesets()
+
+    results: List[Result] = []
+    for corpus in corpora:
+        data = load_corpus(corpus, args.scale)
+        natural = CORPORA[corpus][1]
+        if args.contexts == "all":
+            rulesets = all_rulesets
+        elif args.contexts == "natural" and natural:
+            rulesets = [GLOBAL_RULESET, natural]
+        else:
+            rulesets = [GLOBAL_RULESET]
+
+        for ruleset in rulesets:
+            for mode in modes:
+                results.append(bench.run(corpus, ruleset, mode, data))
+
+    baseline = None
+    if args.compare:
+        saved = json.loads(args.compare.read_text(encoding="utf-8"))
+        baseline = {
+            (r["corpus"], r["ruleset"], r["mode"]): r for r in saved["results"]
+        }
+        print(f"Baseline: {args.compare} ({saved['meta'].get('revision')})")
+
+    print_table(results, baseline)
+
+    if args.json:
+        payload = {"meta": _metadata(args), "results": [asdict(r) for r in results]}
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
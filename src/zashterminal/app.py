@@ -130,6 +130,10 @@ class CommTerminalApp(Adw.Application):
             # The check is just for logging, not critical for app operation
             GLib.timeout_add(1000, self._log_crypto_status)
 
+            # Resolve common Pygments lexers and formatters on the worker pool
+            # so the first cat or typed command in a new tab does not stall
+            GLib.idle_add(self._warm_up_pygments, priority=GLib.PRIORITY_LOW)
+
             self._initialized = True
             self._update_manager = UpdateManager()
             self.logger.info("All essential subsystems initialized successfully")
@@ -155,6 +159,29 @@ class CommTerminalApp(Adw.Application):
             )
         return False  # Don't repeat idle callback
 
+    def _warm_up_pygments(self) -> bool:
+        """Warm the shared Pygments cache used by cat and input highlighting."""
+        try:
+            settings = self.settings_manager
+            if not (
+                settings.get("cat_colorization_enabled", True)
+                or settings.get("shell_input_highlighting_enabled", False)
+            ):
+                return False
+
+            from .terminal.highlighter.pygments_cache import schedule_warm_up
+
+            schedule_warm_up([
+                (settings.get("cat_dark_theme", "blinds-dark"), False),
+                (settings.get("cat_light_theme", "blinds-light"), True),
+                (settings.get("pygments_theme", "monokai"), False),
+                (settings.get("shell_input_dark_theme", "blinds-dark"), False),
+                (settings.get("shell_input_light_theme", "blinds-light"), True),
+            ])
+        except Exception as e:
+            self.logger.debug(f"Pygments warm-up not scheduled: {e}")
+        return False  # Don't repeat idle callback
+
     def _on_startup(self, app) -> None:
         """Handle application startup."""
         try:
@@ -101,7 +101,9 @@ class AsyncTaskManager:
         """Add a future to the tracking set."""
         with self._futures_lock:
             self._active_futures.add(future)
-            future.add_done_callback(self._remove_future)
+        # Outside the lock: a future that already finished runs the
+        # callback immediately, and _remove_future takes the same lock
+        future.add_done_callback(self._remove_future)
 
     def _remove_future(self, future: Future) -> None:
         """Remove a completed future from the tracking set."""
@@ -0,0 +1,106 @@
+# zashterminal/filemanager/listing_cache.py
+"""
+Cache of directory listings, so revisiting a directory shows it at once.
+
+Entries are keyed by session and path and bounded by the total number of
+entries they hold, least recently used first out. A cached listing is shown
+right away and then revalidated in the background: local directories are
+watched with a Gio.FileMonitor that invalidates their entry, remote ones
+carry the directory mtime they were listed at, to be compared with a fresh
+one. Each monitor holds an inotify watch, so only the most recently used
+local listings keep theirs; older ones fall back to the mtime check. All
+methods must be called from the GTK main thread.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from gi.repository import Gio
+
+from .listing_model import Listing
+
+# Upper bound on the entries of all cached listings together
+MAX_CACHED_ENTRIES = 250000
+
+# Upper bound on the cached listings that keep a directory monitor
+MAX_MONITORED_LISTINGS = 32
+
+
+@dataclass(slots=True)
+class CachedListing:
+    """A directory listing and what is needed to tell whether it is current."""
+
+    listing: Listing
+    # Directory mtime at listing time, None when the backend cannot tell
+    stamp: Optional[str] = None
+    # Watches a local directory; while it is set and valid is True the
+    # listing needs no revalidation
+    monitor: Optional[Gio.FileMonitor] = None
+    valid: bool = True
+
+
+class DirectoryListingCache:
+    """LRU cache of directory listings per session."""
+
+    def __init__(
+        self,
+        max_entries: int = MAX_CACHED_ENTRIES,
+        max_monitored: int = MAX_MONITORED_LISTINGS,
+    ):
+        self._max_entries = max_entries
+        self._max_monitored = max_monitored
+        self._entries: "OrderedDict[Tuple[str, str], CachedListing]" = OrderedDict()
+        self._total_entries = 0
+        # Keys of the entries holding a monitor, least recently used first
+        self._monitored: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+
+    def get(self, session_key: str, path: str) -> Optional[CachedListing]:
+        """Return the listing of a directory, marking it recently used."""
+        key = (session_key, path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if key in self._monitored:
+                self._monitored.move_to_end(key)
+        return entry
+
+    def put(self, session_key: str, path: str, entry: CachedListing) -> None:
+        """Store a listing, evicting the least recently used ones over the bound."""
+        key = (session_key, path)
+        self._drop(key)
+        self._entries[key] = entry
+        self._total_entries += len(entry.listing)
+        if entry.monitor is not None:
+            self._monitored[key] = None
+            while len(self._monitored) > self._max_monitored:
+                self._release_monitor(next(iter(self._monitored)))
+        # The newest listing stays even if it alone exceeds the bound
+        while self._total_entries > self._max_entries and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, session_key: str, path: str) -> None:
+        """Mark a listing as needing revalidation before it is trusted."""
+        entry = self._entries.get((session_key, path))
+        if entry is not None:
+            entry.valid = False
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._drop(key)
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_entries -= len(entry.listing)
+        self._monitored.pop(key, None)
+        if entry.monitor is not None:
+            entry.monitor.cancel()
+
+    def _release_monitor(self, key: Tuple[str, str]) -> None:
+        """Cancel the monitor of an entry; it is then revalidated by stamp."""
+        del self._monitored[key]
+        entry = self._entries[key]
+        entry.monitor.cancel()
+        entry.monitor = None
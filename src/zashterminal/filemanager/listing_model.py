@@ -0,0 +1,495 @@
+# zashterminal/filemanager/listing_model.py
+"""
+Columnar directory listings and the list model the file manager shows them in.
+
+A FileItem per entry costs a GObject with its own Python attributes, which
+makes a directory of a few hundred thousand entries take seconds and
+hundreds of MB before anything is drawn. A Listing keeps the entries
+column by column instead: names in one string buffer with an offsets
+array, sizes and mtimes in typed arrays, and permissions, owners and groups
+as indices into tables of their few distinct values. ListingModel exposes a
+Listing as a Gio.ListModel, does the filtering and sorting over those
+columns, and creates FileItem rows only when the view asks for them, which
+it does for the rows on screen. A listing that is still arriving is shown
+in batches, appended unsorted until the complete listing replaces them.
+"""
+
+import weakref
+from array import array
+from datetime import datetime
+from itertools import accumulate, compress, repeat
+from typing import Dict, Iterable, List, Optional
+
+from gi.repository import Gio, GObject
+
+from .models import FileItem
+
+# Separates names in the name buffers; no file name can contain it
+_NAME_SEPARATOR = "\0"
+# Flags per entry
+_DIRECTORY_LIKE = 1
+_PARENT = 2
+# Sort group of each flags value: the parent entry, directories, files
+_SORT_GROUPS = bytes(
+    0 if flags & _PARENT else 1 if flags & _DIRECTORY_LIKE else 2
+    for flags in range(256)
+)
+# Fields per record of a FIND_LISTING_FORMAT listing
+_FIND_LISTING_FIELDS = 8
+
+
+class _StringTable:
+    """Interns the few distinct values of a column and hands out indices."""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id_of(self, value: str) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def ids_of(self, values: List[str]) -> List[int]:
+        """id_of() for a whole column, with the lookups done in C."""
+        for value in dict.fromkeys(values):
+            self.id_of(value)
+        return list(map(self._ids.__getitem__, values))
+
+
+class ListingBuilder:
+    """Collects directory entries into a Listing."""
+
+    def __init__(self, base_path: str = ""):
+        """
+        Args:
+            base_path: Directory listed; relative link targets are made
+                absolute against it.
+        """
+        self._base_path = base_path.rstrip("/") if base_path else None
+        self._names: List[str] = []
+        self._sizes = array("q")
+        self._mtimes = array("d")
+        self._perm_ids = array("I")
+        self._owner_ids = array("I")
+        self._group_ids = array("I")
+        self._flags = bytearray()
+        self._link_targets: Dict[int, str] = {}
+        self._perms = _StringTable()
+        self._principals = _StringTable()
+        # First entry not yet handed out by take_batch()
+        self._batch_start = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _absolute_target(self, link_target: str) -> str:
+        if self._base_path is not None and not link_target.startswith("/"):
+            return f"{self._base_path}/{link_target}"
+        return link_target
+
+    def add(
+        self,
+        name: str,
+        perms: str,
+        size: int,
+        mtime: float,
+        owner: str,
+        group: str,
+        link_target: str = "",
+    ) -> None:
+        """Add one entry; a link to a directory has a target ending in a slash."""
+        flags = 0
+        if perms.startswith("d") or (
+            perms.startswith("l") and link_target.endswith("/")
+        ):
+            flags |= _DIRECTORY_LIKE
+        if name == "..":
+            flags |= _PARENT
+        if link_target:
+            self._link_targets[len(self._names)] = self._absolute_target(link_target)
+        self._names.append(name)
+        self._sizes.append(size)
+        self._mtimes.append(mtime)
+        self._perm_ids.append(self._perms.id_of(perms))
+        self._owner_ids.append(self._principals.id_of(owner))
+        self._group_ids.append(self._principals.id_of(group))
+        self._flags.append(flags)
+
+    def add_item(self, item: FileItem) -> None:
+        """Add an entry parsed as a FileItem (ls output, search results)."""
+        self.add(
+            item.name,
+            item.permissions,
+            item.size,
+            item.date.timestamp(),
+            item.owner,
+            item.group,
+            item._link_target or "",
+        )
+
+    def add_find_output(self, output: str, include_parent: bool = True) -> None:
+        """Add the records of a listing printed with FIND_LISTING_FORMAT.
+
+        The records need no heuristics: fields are NUL-separated and the
+        mtime is an epoch, so odd names and locales parse like any other.
+        They are added a column at a time, never as objects per entry.
+        """
+        fields = output.split("\0")
+        del fields[len(fields) - len(fields) % _FIND_LISTING_FIELDS :]
+        perms, sizes, mtimes, owners, groups, target_types, targets, names = (
+            fields[column::_FIND_LISTING_FIELDS]
+            for column in range(_FIND_LISTING_FIELDS)
+        )
+        del fields
+        # find lists the parent entry first
+        has_parent = bool(names) and names[0] == ".."
+        if has_parent and not include_parent:
+            for column in (perms, sizes, mtimes, owners, groups, target_types):
+                del column[0]
+            del targets[0], names[0]
+            has_parent = False
+
+        first_row = len(self._names)
+        self._names.extend(names)
+        try:
+            self._sizes.fromlist(list(map(int, sizes)))
+        except ValueError:
+            self._sizes.fromlist([int(size) if size.isdigit() else 0 for size in sizes])
+        try:
+            self._mtimes.fromlist(list(map(float, mtimes)))
+        except ValueError:
+            self._mtimes.fromlist([_to_float(mtime) for mtime in mtimes])
+        perm_ids = self._perms.ids_of(perms)
+        self._perm_ids.fromlist(perm_ids)
+        self._owner_ids.fromlist(self._principals.ids_of(owners))
+        self._group_ids.fromlist(self._principals.ids_of(groups))
+
+        directory_perms = bytes(
+            _DIRECTORY_LIKE if value.startswith("d") else 0
+            for value in self._perms.values
+        )
+        flags = bytearray(map(directory_perms.__getitem__, perm_ids))
+        if has_parent:
+            flags[0] |= _PARENT
+        # Only links have a target
+        for index in compress(range(len(targets)), targets):
+            target = targets[index]
+            # Match ls --classify, which marks links to directories this way
+            if target_types[index] == "d":
+                flags[index] |= _DIRECTORY_LIKE
+                target += "/"
+            self._link_targets[first_row + index] = self._absolute_target(target)
+        self._flags.extend(flags)
+
+    def take_batch(self) -> "Listing":
+        """Listing of the entries added since the last call, to show them early."""
+        start = self._batch_start
+        self._batch_start = len(self._names)
+        link_targets = {}
+        # Rows were added in increasing order
+        for row in reversed(self._link_targets):
+            if row < start:
+                break
+            link_targets[row - start] = self._link_targets[row]
+        return Listing(
+            self._names[start:],
+            self._sizes[start:],
+            self._mtimes[start:],
+            self._perm_ids[start:],
+            self._owner_ids[start:],
+            self._group_ids[start:],
+            bytes(self._flags[start:]),
+            link_targets,
+            self._perms.values,
+            self._principals.values,
+        )
+
+    def build(self) -> "Listing":
+        return Listing(
+            self._names,
+            self._sizes,
+            self._mtimes,
+            self._perm_ids,
+            self._owner_ids,
+            self._group_ids,
+            bytes(self._flags),
+            self._link_targets,
+            self._perms.values,
+            self._principals.values,
+        )
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+class Listing:
+    """An immutable directory listing stored column by column."""
+
+    __slots__ = (
+        "_names",
+        "_name_offsets",
+        "_folded",
+        "_sizes",
+        "_mtimes",
+        "_perm_ids",
+        "_owner_ids",
+        "_group_ids",
+        "_flags",
+        "_link_targets",
+        "_perm_values",
+        "_principal_values",
+    )
+
+    def __init__(
+        self,
+        names: List[str],
+        sizes: array,
+        mtimes: array,
+        perm_ids: array,
+        owner_ids: array,
+        group_ids: array,
+        flags: bytes,
+        link_targets: Dict[int, str],
+        perm_values: List[str],
+        principal_values: List[str],
+    ):
+        # Every name is followed by a separator; offsets[i] is where name i
+        # starts, so name i ends one before offsets[i + 1]
+        self._names = _NAME_SEPARATOR.join(names) + _NAME_SEPARATOR
+        self._name_offsets = array(
+            "L", accumulate(map((1).__add__, map(len, names)), initial=0)
+        )
+        # Only ever split, so lower() changing the length of a name is fine
+        self._folded = self._names.lower()
+        self._sizes = sizes
+        self._mtimes = mtimes
+        self._perm_ids = perm_ids
+        self._owner_ids = owner_ids
+        self._group_ids = group_ids
+        self._flags = flags
+        self._link_targets = link_targets
+        self._perm_values = perm_values
+        self._principal_values = principal_values
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def name(self, row: int) -> str:
+        offsets = self._name_offsets
+        return self._names[offsets[row] : offsets[row + 1] - 1]
+
+    def item(self, row: int) -> FileItem:
+        """Materialize the FileItem of an entry."""
+        try:
+            date = datetime.fromtimestamp(self._mtimes[row])
+        except (ValueError, OverflowError, OSError):
+            date = datetime.now()
+        perms = self._perm_values[self._perm_ids[row]]
+        return FileItem(
+            name=self.name(row),
+            perms=perms,
+            size=self._sizes[row],
+            date=date,
+            owner=self._principal_values[self._owner_ids[row]],
+            group=self._principal_values[self._group_ids[row]],
+            is_link=perms.startswith("l"),
+            link_target=self._link_targets.get(row, ""),
+        )
+
+    def filter_rows(
+        self, search_term: str, show_hidden: bool, match_all: bool
+    ) -> List[int]:
+        """
+        Rows to show, in listing order.
+
+        Args:
+            search_term: Lowercase text names must contain; when set, the
+                parent entry is hidden.
+            show_hidden: Whether to show names starting with a dot.
+            match_all: Skip the search term check (entries are results of a
+                recursive search for it) and apply the dot rule to the last
+                path component of the names.
+        """
+        flags = self._flags
+        rows = range(len(self))
+        if search_term and not match_all:
+            folded = self._folded.split(_NAME_SEPARATOR)
+            rows = [row for row in rows if search_term in folded[row]]
+        if search_term:
+            rows = [row for row in rows if not flags[row] & _PARENT]
+        if show_hidden:
+            return list(rows)
+
+        names = self._names.split(_NAME_SEPARATOR)
+        if search_term and match_all:
+            return [
+                row
+                for row in rows
+                if not names[row].rsplit("/", 1)[-1].startswith(".")
+            ]
+        return [
+            row
+            for row in rows
+            if flags[row] & _PARENT or not names[row].startswith(".")
+        ]
+
+    def sort_rows(self, rows: Iterable[int], key: str, descending: bool) -> array:
+        """
+        Order rows like the file manager always has: the parent entry,
+        then directories, then files, each by the key column and then by
+        name. Descending inverts the whole order, as the view's sorter did.
+
+        Stable sorts from the last criterion to the first, each keyed by a
+        sequence lookup, keep the comparisons out of Python code.
+        """
+        order = sorted(rows, key=self._folded.split(_NAME_SEPARATOR).__getitem__)
+        if key == "size":
+            order.sort(key=self._sizes.__getitem__)
+        elif key == "date":
+            order.sort(key=self._mtimes.__getitem__)
+        elif key in ("permissions", "owner", "group"):
+            if key == "permissions":
+                ids, values = self._perm_ids, self._perm_values
+            else:
+                ids = self._owner_ids if key == "owner" else self._group_ids
+                values = self._principal_values
+            # Sort the ids by the rank of the value they stand for
+            rank = [0] * len(values)
+            for position, index in enumerate(
+                sorted(range(len(values)), key=values.__getitem__)
+            ):
+                rank[index] = position
+            ranks = [rank[index] for index in ids]
+            order.sort(key=ranks.__getitem__)
+        order.sort(key=self._flags.translate(_SORT_GROUPS).__getitem__)
+        if descending:
+            order.reverse()
+        return array("L", order)
+
+
+_EMPTY_LISTING = ListingBuilder().build()
+
+
+class ListingModel(GObject.Object, Gio.ListModel):
+    """
+    Gio.ListModel of the filtered and sorted entries of a Listing.
+
+    Only the FileItems of rows the view asks for are created, and each is
+    kept only while something else references it. Batches added with
+    append_listing() follow the rows of the listing, filtered but unsorted.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._listing = _EMPTY_LISTING
+        self._rows = array("L")
+        self._sort_key = "name"
+        self._descending = False
+        self._search_term = ""
+        self._show_hidden = False
+        self._match_all = False
+        # Streamed batches, and the batch and row of each position after
+        # the listing's own rows
+        self._batches: List[Listing] = []
+        self._batch_ids = array("L")
+        self._batch_rows = array("L")
+        self._items: "weakref.WeakValueDictionary[object, FileItem]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    @property
+    def listing(self) -> Listing:
+        return self._listing
+
+    def do_get_item_type(self):
+        return FileItem.__gtype__
+
+    def do_get_n_items(self) -> int:
+        return len(self._rows) + len(self._batch_rows)
+
+    def do_get_item(self, position: int) -> Optional[FileItem]:
+        if position < len(self._rows):
+            listing = self._listing
+            key = row = self._rows[position]
+        else:
+            position -= len(self._rows)
+            if position >= len(self._batch_rows):
+                return None
+            batch = self._batch_ids[position]
+            row = self._batch_rows[position]
+            listing = self._batches[batch]
+            key = (batch, row)
+        item = self._items.get(key)
+        if item is None:
+            item = listing.item(row)
+            self._items[key] = item
+        return item
+
+    def set_listing(self, listing: Listing) -> None:
+        """Show a listing, dropping any appended batches."""
+        self._listing = listing
+        self._batches = []
+        self._items = weakref.WeakValueDictionary()
+        self._update()
+
+    def append_listing(self, batch: Listing) -> None:
+        """
+        Show the entries of a batch after the current rows, in arrival
+        order. Used while a listing streams in; set_listing() with the
+        complete listing then sorts all of it.
+        """
+        position = self.do_get_n_items()
+        added = self._add_batch_rows(len(self._batches), batch)
+        self._batches.append(batch)
+        if added:
+            self.items_changed(position, 0, added)
+
+    def _add_batch_rows(self, batch_id: int, batch: Listing) -> int:
+        rows = batch.filter_rows(self._search_term, self._show_hidden, self._match_all)
+        self._batch_ids.extend(repeat(batch_id, len(rows)))
+        self._batch_rows.fromlist(rows)
+        return len(rows)
+
+    def clear(self) -> None:
+        self.set_listing(_EMPTY_LISTING)
+
+    def set_sort(self, key: str, descending: bool) -> None:
+        if (key, descending) == (self._sort_key, self._descending):
+            return
+        self._sort_key = key
+        self._descending = descending
+        self._update()
+
+    def set_filter(self, search_term: str, show_hidden: bool, match_all: bool) -> None:
+        """See Listing.filter_rows()."""
+        if (search_term, show_hidden, match_all) == (
+            self._search_term,
+            self._show_hidden,
+            self._match_all,
+        ):
+            return
+        self._search_term = search_term
+        self._show_hidden = show_hidden
+        self._match_all = match_all
+        self._update()
+
+    def _update(self) -> None:
+        rows = self._listing.filter_rows(
+            self._search_term, self._show_hidden, self._match_all
+        )
+        old_count = self.do_get_n_items()
+        self._rows = self._listing.sort_rows(rows, self._sort_key, self._descending)
+        self._batch_ids = array("L")
+        self._batch_rows = array("L")
+        for batch_id, batch in enumerate(self._batches):
+            self._add_batch_rows(batch_id, batch)
+        self.items_changed(0, old_count, self.do_get_n_items())
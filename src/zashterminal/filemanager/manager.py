@@ -9,6 +9,7 @@ import shlex
 import subprocess
 import tempfile
 import threading
+import time
 import weakref
 from functools import partial
 from pathlib import Path, PurePosixPath
@@ -26,6 +27,8 @@ from ..utils.logger import get_logger
 from ..utils.security import InputSanitizer, ensure_secure_directory_permissions
 from ..utils.tooltip_helper import get_tooltip_helper
 from ..utils.translation_utils import _
+from .listing_cache import CachedListing, DirectoryListingCache
+from .listing_model import Listing, ListingBuilder, ListingModel
 from .models import FileItem
 from .operations import FileOperations
 from .transfer_dialog import TransferManagerDialog
@@ -36,6 +39,8 @@ from .transfer_manager import TransferManager, TransferType
 # Classes: .transfer-progress-bar, .search-entry-no-icon
 
 MAX_RECURSIVE_RESULTS = 1000
+# Shortest time between batches of a listing shown while it streams in
+LISTING_BATCH_INTERVAL_S = 0.1
 
 
 class FileManager(GObject.Object):
@@ -98,6 +103,9 @@ class FileManager(GObject.Object):
             ""  # Track last successfully listed path for fallback
         )
         self.file_monitors = {}
+        self._listing_cache = DirectoryListingCache()
+        # Bumped by every listing started; older listings are discarded
+        self._listing_generation = 0
         self.edited_file_metadata = {}
         self._is_rebinding = False  # Flag to prevent race conditions during rebind
         self._rsync_status: Dict[str, bool] = {}
@@ -419,6 +427,9 @@ class FileManager(GObject.Object):
                     monitor.cancel()
             self.file_monitors.clear()
 
+        if hasattr(self, "_listing_cache"):
+            self._listing_cache.clear()
+
         # Clear edited file metadata
         if hasattr(self, "edited_file_metadata"):
             self.edited_file_metadata.clear()
@@ -430,14 +441,10 @@ class FileManager(GObject.Object):
         # Task 2: Clear model wrappers in correct order
         if hasattr(self, "selection_model"):
             self.selection_model = None
-        if hasattr(self, "sorted_store"):
-            self.sorted_store = None
-        if hasattr(self, "filtered_store"):
-            self.filtered_store = None
 
         # Task 2: Clear data store last
         if hasattr(self, "store") and self.store:
-            self.store.remove_all()
+            self.store.clear()
             self.store = None
 
         # Clear scrolled window
@@ -567,8 +574,8 @@ class FileManager(GObject.Object):
         # Also add background to scrolled window to prevent transparency during load
         self.scrolled_window.add_css_class("background")
 
-        self.store = Gio.ListStore.new(FileItem)
-        self.filtered_store = Gtk.FilterListModel(model=self.store)
+        # Filters and sorts itself, see ListingModel
+        self.store = ListingModel()
 
         self.column_view = self._create_detailed_column_view()
         self.scrolled_window.set_child(self.column_view)
@@ -591,7 +598,9 @@ class FileManager(GObject.Object):
         self.action_bar = Gtk.ActionBar()
 
         refresh_button = icon_button("view-refresh-symbolic")
-        refresh_button.connect("clicked", lambda _: self.refresh(source="filemanager"))
+        refresh_button.connect(
+            "clicked", lambda _: self.refresh(source="filemanager", force=True)
+        )
         self.tooltip_helper.add_tooltip(refresh_button, _("Refresh"))
         self.action_bar.pack_start(refresh_button)
 
@@ -777,94 +786,28 @@ class FileManager(GObject.Object):
                 self.refresh(path_to_navigate, source="filemanager")
 
     def _setup_filtering_and_sorting(self):
-        self.combined_filter = Gtk.CustomFilter()
-        self.combined_filter.set_filter_func(self._filter_files)
-        self.filtered_store.set_filter(self.combined_filter)
+        self._apply_filter()
 
-    def _filter_files(self, file_item):
+    def _apply_filter(self):
+        """Filter the listing by the search text and the hidden files toggle."""
         search_text = getattr(self, "search_entry", None)
         search_term = search_text.get_text().lower().strip() if search_text else ""
-
-        if search_term:
-            if file_item.name == "..":
-                return False
-            show_hidden = self.hidden_files_toggle.get_active()
-            if self.recursive_search_enabled and self._showing_recursive_results:
-                name_to_check = file_item.name.split("/")[-1]
-                if not show_hidden and name_to_check.startswith("."):
-                    return False
-                return True
-            # For non-recursive search, check both hidden status and search term
-            if not show_hidden and file_item.name.startswith("."):
-                return False
-            return search_term in file_item.name.lower()
-
-        if file_item.name == "..":
-            return True
-
-        show_hidden = self.hidden_files_toggle.get_active()
-        if not show_hidden and file_item.name.startswith("."):
-            return False
-
-        return True
-
-    def _dolphin_sort_priority(
-        self, file_item_a, file_item_b, secondary_sort_func=None
-    ):
-        if file_item_a.name == "..":
-            return -1
-        if file_item_b.name == "..":
-            return 1
-
-        def get_type(item):
-            return 0 if item.is_directory_like else 1
-
-        a_type = get_type(file_item_a)
-        b_type = get_type(file_item_b)
-
-        if a_type != b_type:
-            return a_type - b_type
-
-        if secondary_sort_func:
-            return secondary_sort_func(file_item_a, file_item_b)
-
-        name_a = file_item_a.name.lower()
-        name_b = file_item_b.name.lower()
-        return (name_a > name_b) - (name_a < name_b)
-
-    def _sort_by_name(self, a, b, *_):
-        return self._dolphin_sort_priority(a, b)
-
-    def _sort_by_permissions(self, a, b, *_):
-        return self._dolphin_sort_priority(
-            a,
-            b,
-            lambda x, y: (x.permissions > y.permissions)
-            - (x.permissions < y.permissions),
-        )
-
-    def _sort_by_owner(self, a, b, *_):
-        return self._dolphin_sort_priority(
-            a, b, lambda x, y: (x.owner > y.owner) - (x.owner < y.owner)
+        self.store.set_filter(
+            search_term,
+            self.hidden_files_toggle.get_active(),
+            # Recursive results already match the search term
+            self.recursive_search_enabled and self._showing_recursive_results,
         )
 
-    def _sort_by_group(self, a, b, *_):
-        return self._dolphin_sort_priority(
-            a, b, lambda x, y: (x.group > y.group) - (x.group < y.group)
-        )
-
-    def _sort_by_size(self, a, b, *_):
-        return self._dolphin_sort_priority(
-            a, b, lambda x, y: (x.size > y.size) - (x.size < y.size)
-        )
-
-    def _sort_by_date(self, a, b, *_):
-        return self._dolphin_sort_priority(
-            a, b, lambda x, y: (x.date > y.date) - (x.date < y.date)
-        )
+    def _on_sort_changed(self, sorter, _change):
+        """Sort the listing by the column the user picked in the header."""
+        column = sorter.get_primary_sort_column()
+        key = self._sort_keys.get(column.get_sorter()) if column else None
+        descending = sorter.get_primary_sort_order() == Gtk.SortType.DESCENDING
+        self.store.set_sort(key or "name", descending)
 
     def _on_hidden_toggle(self, _toggle_button):
-        self.combined_filter.changed(Gtk.FilterChange.DIFFERENT)
+        self._apply_filter()
 
     def _on_recursive_switch_toggled(self, switch, _param):
         self._on_recursive_toggle(switch)
@@ -892,13 +835,13 @@ class FileManager(GObject.Object):
         if self.recursive_search_enabled:
             # Don't auto-start search when toggling recursive mode
             self._showing_recursive_results = False
-            self.combined_filter.changed(Gtk.FilterChange.DIFFERENT)
+            self._apply_filter()
         else:
             if self._showing_recursive_results:
                 self._showing_recursive_results = False
                 self.refresh(source="filemanager", clear_search=False)
             else:
-                self.combined_filter.changed(Gtk.FilterChange.DIFFERENT)
+                self._apply_filter()
 
     def _on_recursive_search_button_clicked(self, button):
         """Handle click on the recursive search button."""
@@ -950,7 +893,7 @@ class FileManager(GObject.Object):
             if self._showing_recursive_results:
                 self._showing_recursive_results = False
                 self.refresh(source="filemanager", clear_search=False)
-        self.combined_filter.changed(Gtk.FilterChange.DIFFERENT)
+        self._apply_filter()
         if hasattr(self, "column_view") and self.column_view:
             if self.selection_model and self.selection_model.get_n_items() > 0:
                 self.selection_model.unselect_all()
@@ -960,6 +903,8 @@ class FileManager(GObject.Object):
             return
 
         base_path = self.current_path or "/"
+        # Results replace the listing; one still arriving must not append to them
+        self._listing_generation += 1
         self._recursive_search_generation += 1
         generation = self._recursive_search_generation
         self._recursive_search_in_progress = True
@@ -1263,8 +1208,8 @@ class FileManager(GObject.Object):
         if error_message:
             self.logger.warning(f"Recursive search warning: {error_message}")
 
-        self.store.splice(0, self.store.get_n_items(), file_items)
-        self.combined_filter.changed(Gtk.FilterChange.DIFFERENT)
+        self._set_store_listing(file_items)
+        self._apply_filter()
 
         if (
             self.selection_model
@@ -1355,7 +1300,7 @@ class FileManager(GObject.Object):
         size = selection.get_size()
         for i in range(size):
             position = selection.get_nth(i)
-            if item := self.sorted_store.get_item(position):
+            if item := self.store.get_item(position):
                 items.append(item)
         return items
 
@@ -1365,12 +1310,22 @@ class FileManager(GObject.Object):
         col_view.set_show_column_separators(True)
         col_view.set_show_row_separators(True)
 
-        self.name_sorter = Gtk.CustomSorter.new(self._sort_by_name, None)
-        self.size_sorter = Gtk.CustomSorter.new(self._sort_by_size, None)
-        self.date_sorter = Gtk.CustomSorter.new(self._sort_by_date, None)
-        self.perms_sorter = Gtk.CustomSorter.new(self._sort_by_permissions, None)
-        self.owner_sorter = Gtk.CustomSorter.new(self._sort_by_owner, None)
-        self.group_sorter = Gtk.CustomSorter.new(self._sort_by_group, None)
+        # The column sorters only make the headers clickable and tell which
+        # column was picked; the store sorts itself (see _on_sort_changed)
+        self.name_sorter = Gtk.CustomSorter()
+        self.size_sorter = Gtk.CustomSorter()
+        self.date_sorter = Gtk.CustomSorter()
+        self.perms_sorter = Gtk.CustomSorter()
+        self.owner_sorter = Gtk.CustomSorter()
+        self.group_sorter = Gtk.CustomSorter()
+        self._sort_keys = {
+            self.name_sorter: "name",
+            self.size_sorter: "size",
+            self.date_sorter: "date",
+            self.perms_sorter: "permissions",
+            self.owner_sorter: "owner",
+            self.group_sorter: "group",
+        }
 
         col_view.append_column(
             self._create_column(
@@ -1419,11 +1374,8 @@ class FileManager(GObject.Object):
             )
         )
 
-        view_sorter = col_view.get_sorter()
-        self.sorted_store = Gtk.SortListModel(
-            model=self.filtered_store, sorter=view_sorter
-        )
-        self.selection_model = Gtk.MultiSelection(model=self.sorted_store)
+        col_view.get_sorter().connect("changed", self._on_sort_changed)
+        self.selection_model = Gtk.MultiSelection(model=self.store)
         col_view.set_model(self.selection_model)
         col_view.sort_by_column(
             col_view.get_columns().get_item(0), Gtk.SortType.ASCENDING
@@ -1588,7 +1540,9 @@ class FileManager(GObject.Object):
 
         # For non-cd commands, success is confirmed by the refresh completing
         if command_type != "cd":
-            GLib.timeout_add(15, lambda: self.refresh(source="filemanager"))
+            GLib.timeout_add(
+                15, lambda: self.refresh(source="filemanager", force=True)
+            )
 
     def _on_row_activated(self, col_view, position):
         item: FileItem = col_view.get_model().get_item(position)
@@ -1636,14 +1590,48 @@ class FileManager(GObject.Object):
                 self.bound_terminal.grab_focus()
 
     def refresh(
-        self, path: str = None, source: str = "filemanager", clear_search: bool = True
+        self,
+        path: str = None,
+        source: str = "filemanager",
+        clear_search: bool = True,
+        force: bool = False,
     ):
+        """
+        List the current directory, or path after switching to it.
+
+        A cached listing of the directory is shown at once and revalidated
+        in the background. Use force after changes the cache cannot notice,
+        such as a command run in the terminal.
+        """
         if hasattr(self, "search_entry") and clear_search:
             self.search_entry.set_text("")
         if path:
             self.current_path = path
         self._update_breadcrumb()
-        self.store.remove_all()
+        self._listing_generation += 1
+        generation = self._listing_generation
+
+        cached = None
+        if not force:
+            cached = self._listing_cache.get(
+                self._get_current_session_key(), self.current_path
+            )
+        if cached is not None:
+            self._set_store_items(
+                cached.listing, self.current_path, source, cache=False
+            )
+            # A watched local directory is current until its monitor fires
+            if cached.monitor is None or not cached.valid:
+                AsyncTaskManager.get().submit_io(
+                    self._revalidate_listing_thread,
+                    self.current_path,
+                    cached.stamp,
+                    source,
+                    generation,
+                )
+            return
+
+        self.store.clear()
 
         if hasattr(self, "search_entry"):
             self.search_entry.set_sensitive(False)
@@ -1651,13 +1639,61 @@ class FileManager(GObject.Object):
 
         # Use global AsyncTaskManager for I/O-bound file listing
         AsyncTaskManager.get().submit_io(
-            self._list_files_thread, self.current_path, source
+            self._list_files_thread, self.current_path, generation, source
+        )
+
+    def _get_listing_path(self, requested_path: str) -> str:
+        """Path to pass to the listing commands for a directory."""
+        path_for_ls = requested_path
+        # Some remote sessions may provide literal $HOME paths.
+        # Normalize to relative path to avoid literal "$HOME" lookup failures.
+        if self._is_remote_session() and path_for_ls.startswith("$HOME"):
+            suffix = path_for_ls[len("$HOME") :]
+            path_for_ls = f".{suffix}" if suffix else "."
+        if not path_for_ls.endswith("/"):
+            path_for_ls += "/"
+        return path_for_ls
+
+    def _revalidate_listing_thread(
+        self, requested_path: str, stamp: Optional[str], source: str, generation: int
+    ):
+        """Re-list a directory shown from the cache unless its stamp is unchanged."""
+        if self._is_destroyed:
+            return
+        operations = self.operations
+        if stamp is not None and operations:
+            current_stamp = operations.get_directory_stamp(
+                self._get_listing_path(requested_path), timeout=8
+            )
+            if current_stamp == stamp:
+                return
+        self._list_files_thread(
+            requested_path, generation, source, revalidating=True
+        )
+
+    def _is_listing_stale(self, requested_path: str, generation: int) -> bool:
+        """Whether a listing was superseded by another one or a folder change."""
+        return (
+            self._is_destroyed
+            or generation != self._listing_generation
+            or requested_path != self.current_path
         )
 
-    def _list_files_thread(self, requested_path: str, source: str = "filemanager"):
+    def _list_files_thread(
+        self,
+        requested_path: str,
+        generation: int,
+        source: str = "filemanager",
+        revalidating: bool = False,
+    ):
         """Task 1: UI Batching - Process files in batches to avoid UI freezing.
 
-        Uses a short timeout to prevent UI freeze when SSH connection is lost.
+        Entries are parsed as the listing arrives and shown in batches, then
+        replaced by the complete, sorted listing. A listing superseded by a
+        newer one stops being parsed. Uses a short timeout to prevent UI
+        freeze when SSH connection is lost. When revalidating a listing
+        shown from the cache, nothing is shown before the listing is
+        complete, and a connection error keeps the cached one on screen.
         """
         try:
             # Check for destruction/invalid state before any operations
@@ -1674,54 +1710,60 @@ class FileManager(GObject.Object):
                     [],
                     "Operations not initialized",
                     source,
+                    generation,
                 )
                 return
 
-            path_for_ls = requested_path
-            # Some remote sessions may provide literal $HOME paths.
-            # Normalize to relative path to avoid literal "$HOME" lookup failures.
-            if self._is_remote_session() and path_for_ls.startswith("$HOME"):
-                suffix = path_for_ls[len("$HOME") :]
-                path_for_ls = f".{suffix}" if suffix else "."
-            if not path_for_ls.endswith("/"):
-                path_for_ls += "/"
+            path_for_ls = self._get_listing_path(requested_path)
 
-            command = ["ls", "-la", "--classify", "--time-style=long-iso", path_for_ls]
-            # Use shorter timeout (8s) for file listing to avoid long UI freezes
-            success, output = operations.execute_command_on_session(command, timeout=8)
+            # Entries go into columns without a FileItem each; the store
+            # sorts them and creates items only for the rows on screen
+            builder = ListingBuilder(requested_path)
+            include_parent = requested_path != "/"
+            last_batch = 0.0
+            # GNU ls includes a leading "total N" header; eza does not.
+            first_lines = True
 
-            # Fallback for environments where --time-style is unsupported.
-            if (
-                not success
-                and "unknown argument --time-style" in output.lower()
-            ):
-                fallback_command = ["ls", "-la", "--classify", path_for_ls]
-                success, output = operations.execute_command_on_session(
-                    fallback_command, timeout=8
-                )
+            def add_output(output: str, listing_format: str) -> bool:
+                nonlocal last_batch, first_lines
+                # Safety check to stop processing if user switched folders
+                if self._is_listing_stale(requested_path, generation):
+                    return False
+                if listing_format == "find":
+                    builder.add_find_output(output, include_parent)
+                else:
+                    lines = output.split("\n")
+                    if first_lines and lines[0].startswith("total "):
+                        del lines[0]
+                    first_lines = False
+                    for line in lines:
+                        file_item = FileItem.from_ls_line(line) if line else None
+                        if not file_item or file_item.name == ".":
+                            continue
+                        if file_item.name == ".." and not include_parent:
+                            continue
+                        builder.add_item(file_item)
+
+                now = time.monotonic()
+                if not revalidating and now - last_batch >= LISTING_BATCH_INTERVAL_S:
+                    last_batch = now
+                    batch = builder.take_batch()
+                    if len(batch):
+                        GLib.idle_add(
+                            self._append_store_batch,
+                            batch,
+                            len(builder),
+                            requested_path,
+                            generation,
+                        )
+                return True
 
-            # Fallback for systems where ls is backed by eza or incompatible implementation.
-            # Use explicit eza flags that produce stable, parseable long output.
-            if not success:
-                eza_command = [
-                    "eza",
-                    "-la",
-                    "--long",
-                    "--classify=always",
-                    "--no-quotes",
-                    "--color=never",
-                    "--icons=never",
-                    "--time-style=long-iso",
-                    "--bytes",
-                    "--group",
-                    "--links",
-                    path_for_ls,
-                ]
-                eza_success, eza_output = operations.execute_command_on_session(
-                    eza_command, timeout=8
-                )
-                if eza_success:
-                    success, output = eza_success, eza_output
+            # Use shorter timeout (8s) for file listing to avoid long UI freezes
+            success, output, listing_format, stamp = operations.list_directory(
+                path_for_ls, timeout=8, on_output=add_output
+            )
+            if self._is_listing_stale(requested_path, generation):
+                return
 
             if not success:
                 # Check if this is a connection timeout
@@ -1739,6 +1781,8 @@ class FileManager(GObject.Object):
                     self.logger.warning(
                         f"Connection issue while listing '{requested_path}': {output}"
                     )
+                    if revalidating:
+                        return
                     error_msg = _(
                         "Connection lost. Please check your network connection."
                     )
@@ -1771,66 +1815,69 @@ class FileManager(GObject.Object):
                     [],
                     error_msg,
                     source,
+                    generation,
                 )
                 return
 
-            lines = output.strip().split("\n")
-            # GNU ls includes a leading "total N" header; eza does not.
-            if lines and lines[0].startswith("total "):
-                lines = lines[1:]
-            directories = []
-            files = []
-            parent_item = None
-
-            # Parse all files in one pass, separating directories from files
-            for line in lines:
-                # Safety check to stop processing if user switched folders
-                if self._is_destroyed or requested_path != self.current_path:
-                    return
-
-                file_item = FileItem.from_ls_line(line)
-                if file_item:
-                    if file_item.name == "..":
-                        parent_item = file_item
-                    elif file_item.name not in [".", ".."]:
-                        if file_item.is_link and file_item._link_target:
-                            if not file_item._link_target.startswith("/"):
-                                file_item._link_target = f"{requested_path.rstrip('/')}/{file_item._link_target}"
-                        # Separate directories from files
-                        if file_item.is_directory_like:
-                            directories.append(file_item)
-                        else:
-                            files.append(file_item)
-
-            # Sort directories and files alphabetically (case-insensitive)
-            directories.sort(key=lambda x: x.name.lower())
-            files.sort(key=lambda x: x.name.lower())
-
-            # Build the complete sorted list: parent -> directories -> files
-            all_items = []
-            if requested_path != "/" and parent_item:
-                all_items.append(parent_item)
-            all_items.extend(directories)
-            all_items.extend(files)
-
-            # Add all items in a single operation for better performance
-            # GTK4's ColumnView uses virtual scrolling, so only visible items render
-            GLib.idle_add(self._set_store_items, all_items, requested_path, source)
+            # The final sort pass puts the streamed batches in order
+            listing = builder.build()
+            GLib.idle_add(
+                partial(
+                    self._set_store_items,
+                    listing,
+                    requested_path,
+                    source,
+                    stamp,
+                    generation=generation,
+                )
+            )
 
         except Exception as e:
             self.logger.error(f"Error in background file listing: {e}")
             GLib.idle_add(
-                self._update_store_with_files, requested_path, [], str(e), source
+                self._update_store_with_files,
+                requested_path,
+                [],
+                str(e),
+                source,
+                generation,
             )
 
-    def _set_store_items(self, items, requested_path, source):
-        """Set all store items in a single operation for optimal performance.
+    def _append_store_batch(
+        self, batch: Listing, seen: int, requested_path: str, generation: int
+    ):
+        """Show a batch of a listing that is still arriving."""
+        if self._is_listing_stale(requested_path, generation):
+            return False
+        if self.store is not None:
+            # The first batch replaces whatever was shown before
+            if seen == len(batch):
+                self.store.clear()
+            self.store.append_listing(batch)
+        self._update_search_placeholder(
+            _("Loading... {count} entries").format(count=seen)
+        )
+        return False
+
+    def _set_store_items(
+        self,
+        listing: Listing,
+        requested_path,
+        source,
+        stamp=None,
+        cache: bool = True,
+        generation: Optional[int] = None,
+    ):
+        """Show a directory listing in a single operation.
 
-        GTK4's ColumnView uses virtual scrolling (only visible rows are rendered),
-        so adding all items at once is more efficient than batching.
+        GTK4's ColumnView uses virtual scrolling (only visible rows are
+        rendered), and the store only creates items for those rows. A fresh
+        listing is also cached, with the directory stamp it was taken at.
         """
         if self._is_destroyed:
             return False
+        if generation is not None and generation != self._listing_generation:
+            return False
 
         # Verify we're still on the same path
         if requested_path != self.current_path:
@@ -1840,8 +1887,9 @@ class FileManager(GObject.Object):
             return False
 
         if self.store is not None:
-            # Single splice replaces all items - more efficient than multiple operations
-            self.store.splice(0, self.store.get_n_items(), items)
+            self.store.set_listing(listing)
+        if cache:
+            self._cache_listing(requested_path, listing, stamp)
 
         # Track this as the last successfully listed path (for permission denied fallback)
         self._last_successful_path = requested_path
@@ -1851,16 +1899,45 @@ class FileManager(GObject.Object):
         self._restore_search_entry(source)
         return False
 
+    def _cache_listing(
+        self, path: str, listing: Listing, stamp: Optional[str]
+    ) -> None:
+        """Cache a listing; local directories are watched to invalidate it."""
+        session_key = self._get_current_session_key()
+        monitor = None
+        if not self._is_remote_session():
+            try:
+                monitor = Gio.File.new_for_path(path).monitor_directory(
+                    Gio.FileMonitorFlags.NONE, None
+                )
+            except GLib.Error as e:
+                self.logger.debug(f"Cannot watch '{path}' for changes: {e}")
+            else:
+                monitor.connect(
+                    "changed", self._on_cached_directory_changed, session_key, path
+                )
+        self._listing_cache.put(
+            session_key, path, CachedListing(listing, stamp, monitor)
+        )
+
+    def _on_cached_directory_changed(
+        self, _monitor, _file, _other_file, _event_type, session_key, path
+    ):
+        self._listing_cache.invalidate(session_key, path)
+
     def _update_store_with_files(
         self,
         requested_path: str,
         file_items,
         error_message,
         source: str = "filemanager",
+        generation: Optional[int] = None,
     ):
         # Skip if destroyed
         if self._is_destroyed:
             return False
+        if generation is not None and generation != self._listing_generation:
+            return False
 
         if requested_path != self.current_path:
             self.logger.info(
@@ -1872,7 +1949,7 @@ class FileManager(GObject.Object):
             self.logger.error(f"Error listing files: {error_message}")
 
         if self.store is not None:
-            self.store.splice(0, self.store.get_n_items(), file_items)
+            self._set_store_listing(file_items)
         self._showing_recursive_results = False
         self._recursive_search_in_progress = False
 
@@ -1886,6 +1963,13 @@ class FileManager(GObject.Object):
         self._restore_search_entry(source)
         return False
 
+    def _set_store_listing(self, file_items: List[FileItem]) -> None:
+        """Show a list of already created items, such as search results."""
+        builder = ListingBuilder()
+        for file_item in file_items:
+            builder.add_item(file_item)
+        self.store.set_listing(builder.build())
+
     def _fallback_to_accessible_path(self, fallback_path: str, source: str):
         """Navigate to an accessible fallback path when permission denied on current path."""
         if self._is_destroyed:
@@ -1893,8 +1977,11 @@ class FileManager(GObject.Object):
         self.logger.info(f"Switching file manager to accessible path: {fallback_path}")
         self.current_path = fallback_path
         self._update_breadcrumb()
+        self._listing_generation += 1
         # Re-list the fallback directory using global AsyncTaskManager
-        AsyncTaskManager.get().submit_io(self._list_files_thread, fallback_path, source)
+        AsyncTaskManager.get().submit_io(
+            self._list_files_thread, fallback_path, self._listing_generation, source
+        )
         return False
 
     def _update_search_placeholder(self, override: Optional[str] = None) -> None:
@@ -1915,12 +2002,8 @@ class FileManager(GObject.Object):
             self.search_entry.set_sensitive(True)
             self._update_search_placeholder()
 
-        if hasattr(self, "combined_filter"):
-            self.combined_filter.changed(Gtk.FilterChange.DIFFERENT)
-        if hasattr(self, "sorted_store"):
-            sorter = self.sorted_store.get_sorter()
-            if sorter:
-                sorter.changed(Gtk.SorterChange.DIFFERENT)
+        if hasattr(self, "hidden_files_toggle"):
+            self._apply_filter()
         if hasattr(self, "column_view") and self.column_view:
             if self.selection_model and self.selection_model.get_n_items() > 0:
                 self.selection_model.unselect_all()
@@ -2109,7 +2192,7 @@ class FileManager(GObject.Object):
                 delta = -1 if keyval == Gdk.KEY_Up else 1
                 new_pos = current_pos + delta
 
-            if 0 <= new_pos < self.sorted_store.get_n_items():
+            if 0 <= new_pos < self.store.get_n_items():
                 self.selection_model.select_item(new_pos, True)
                 self.column_view.scroll_to(
                     new_pos, None, Gtk.ListScrollFlags.NONE, None
@@ -2568,7 +2651,7 @@ class FileManager(GObject.Object):
                             self.logger.info(
                                 "Download to current local directory completed. Refreshing view."
                             )
-                            self.refresh(source="filemanager")
+                            self.refresh(source="filemanager", force=True)
 
                 # Prepare download in background to get sizes and check space
                 def prepare_downloads():
@@ -2766,7 +2849,7 @@ class FileManager(GObject.Object):
             "Uploading",
             self._background_upload_worker,
             on_success_callback=lambda _, __: GLib.idle_add(
-                lambda: self.refresh(source="filemanager")
+                lambda: self.refresh(source="filemanager", force=True)
             ),
         )
 
@@ -7,6 +7,11 @@ from datetime import datetime
 
 from gi.repository import Gio, GObject
 
+# GNU find -printf format of a structured listing: permissions, size, mtime,
+# owner, group, target type, link target and name, each ended by a NUL so
+# names can hold any character
+FIND_LISTING_FORMAT = "%M\\0%s\\0%T@\\0%u\\0%g\\0%Y\\0%l\\0%f\\0"
+
 
 class FileItem(GObject.GObject):
     """Data model for an item in the file manager.
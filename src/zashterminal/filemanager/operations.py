@@ -7,13 +7,58 @@ import subprocess
 import tempfile
 import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from gi.repository import GLib
 
 from ..sessions.models import SessionItem
 from ..utils.logger import get_logger
 from ..utils.translation_utils import _
+from .models import FIND_LISTING_FORMAT
+
+# Directory listing backends, best first: "find" prints NUL-separated
+# records (GNU find -printf), the others a long listing parsed line by line.
+# The probe runs once per session and prints the first one that works.
+_LISTING_PROBE_SCRIPT = (
+    'if find / -maxdepth 0 -printf "" >/dev/null 2>&1; then echo find; '
+    "elif ls -la --classify --time-style=long-iso / >/dev/null 2>&1; "
+    "then echo ls-iso; "
+    "elif command -v eza >/dev/null 2>&1; then echo eza; "
+    "else echo ls; fi"
+)
+# Fields per record of a FIND_LISTING_FORMAT listing
+_FIND_LISTING_FIELDS = FIND_LISTING_FORMAT.count("\\0")
+# Most bytes read from a streaming local command at once
+_STREAM_CHUNK_SIZE = 65536
+# Directory mtime, used to tell whether a cached listing is still current
+_DIRECTORY_STAMP_FORMAT = "%T@"
+# $1 is the directory with a trailing slash, $2 the -printf format. The
+# directory's own stamp is printed first, taken before the entries are read
+# so a change while listing shows up as a stale stamp; then the parent
+# entry, as with ls -a.
+_FIND_LISTING_SCRIPT = (
+    f'find "$1" -maxdepth 0 -printf "{_DIRECTORY_STAMP_FORMAT}\\0" || exit 1; '
+    'find "$1.." -maxdepth 0 -printf "$2" 2>/dev/null; '
+    'exec find "$1" -mindepth 1 -maxdepth 1 -printf "$2"'
+)
+_LISTING_COMMANDS = {
+    "ls-iso": ["ls", "-la", "--classify", "--time-style=long-iso"],
+    "ls": ["ls", "-la", "--classify"],
+    # Explicit eza flags that produce stable, parseable long output
+    "eza": [
+        "eza",
+        "-la",
+        "--long",
+        "--classify=always",
+        "--no-quotes",
+        "--color=never",
+        "--icons=never",
+        "--time-style=long-iso",
+        "--bytes",
+        "--group",
+        "--links",
+    ],
+}
 
 # Pre-compiled pattern for rsync progress parsing
 _PROGRESS_PERCENT_PATTERN = re.compile(r"(\d+)%")
@@ -71,6 +116,47 @@ class OperationCancelledError(Exception):
     """Custom exception to indicate that an operation was cancelled by the user."""
 
 
+class _ListingStream:
+    """Cuts streamed listing output into complete records and decodes them."""
+
+    def __init__(
+        self, listing_format: str, on_output: Callable[[str, str], bool]
+    ):
+        self.stamp: Optional[str] = None
+        self._format = listing_format
+        self._on_output = on_output
+        self._pending = b""
+        # A find listing starts with the directory stamp
+        self._awaiting_stamp = listing_format == "find"
+
+    def feed(self, chunk: bytes) -> bool:
+        data = self._pending + chunk
+        if self._awaiting_stamp:
+            stamp, separator, rest = data.partition(b"\0")
+            if not separator:
+                self._pending = data
+                return True
+            self.stamp = stamp.decode("utf-8", "replace")
+            self._awaiting_stamp = False
+            data = rest
+        if self._format == "find":
+            fields = data.count(b"\0")
+            fields -= fields % _FIND_LISTING_FIELDS
+            end = len(data) - len(data.split(b"\0", fields)[-1]) if fields else 0
+        else:
+            end = data.rfind(b"\n") + 1
+        self._pending = data[end:]
+        if not end:
+            return True
+        return self._on_output(data[:end].decode("utf-8", "replace"), self._format)
+
+    def finish(self) -> None:
+        """Pass on a last line without a newline; partial records are dropped."""
+        if self._format != "find" and self._pending:
+            self._on_output(self._pending.decode("utf-8", "replace"), self._format)
+        self._pending = b""
+
+
 
 class FileOperations:
     def __init__(self, session_item: SessionItem):
@@ -78,6 +164,7 @@ class FileOperations:
         self.logger = get_logger("zashterminal.filemanager.operations")
         self._command_cache: Dict[str, Dict[str, bool]] = {}
         self._remote_home_cache: Dict[str, str] = {}
+        self._listing_backend_cache: Dict[str, str] = {}
         self._active_processes = {}
         self._lock = threading.Lock()
 
@@ -203,6 +290,7 @@ class FileOperations:
         command: List[str],
         session_override: Optional[SessionItem] = None,
         timeout: int = 10,
+        on_output: Optional[Callable[[bytes], bool]] = None,
     ) -> Tuple[bool, str]:
         """
         Executes a command either locally or remotely via the centralized spawner.
@@ -211,6 +299,9 @@ class FileOperations:
             command: The command to execute as a list of strings.
             session_override: Optional session to use instead of the default.
             timeout: Maximum time to wait for command completion (default 10s for file manager ops).
+            on_output: Stream stdout to this callable as it is read instead
+                of returning it. The timeout then counts time without output,
+                and returning False stops reading.
 
         Returns:
             Tuple of (success: bool, output: str)
@@ -220,6 +311,8 @@ class FileOperations:
             return False, _("No session context for file operation.")
 
         try:
+            if session_to_use.is_local() and on_output is not None:
+                return self._stream_local_command(command, timeout, on_output)
             if session_to_use.is_local():
                 result = subprocess.run(
                     command,
@@ -239,7 +332,7 @@ class FileOperations:
                 spawner = get_spawner()
                 # Use shorter timeout for file manager operations to avoid UI freeze
                 return spawner.execute_remote_command_sync(
-                    session_to_use, command, timeout=timeout
+                    session_to_use, command, timeout=timeout, on_output=on_output
                 )
         except subprocess.TimeoutExpired:
             self.logger.error(
@@ -253,6 +346,167 @@ class FileOperations:
         # This case should not be reached if session is always local or ssh
         return False, _("Unsupported session type for command execution.")
 
+    def _stream_local_command(
+        self,
+        command: List[str],
+        timeout: int,
+        on_output: Callable[[bytes], bool],
+    ) -> Tuple[bool, str]:
+        """
+        Run a local command, passing its stdout to on_output as it is read.
+
+        The process is killed after timeout seconds without output, or when
+        on_output returns False.
+        """
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=set_pdeathsig_kill,
+        )
+        stderr_output: List[bytes] = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_output.append(process.stderr.read()), daemon=True
+        )
+        stderr_thread.start()
+        timed_out = threading.Event()
+
+        def on_silence():
+            timed_out.set()
+            process.kill()
+
+        try:
+            while True:
+                timer = threading.Timer(timeout, on_silence)
+                timer.daemon = True
+                timer.start()
+                try:
+                    chunk = process.stdout.read1(_STREAM_CHUNK_SIZE)
+                finally:
+                    timer.cancel()
+                if not chunk:
+                    break
+                if on_output(chunk) is False:
+                    process.kill()
+                    break
+        finally:
+            process.stdout.close()
+            process.wait()
+            stderr_thread.join()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, timeout)
+        if process.returncode != 0:
+            return False, b"".join(stderr_output).decode("utf-8", "replace")
+        return True, ""
+
+    def _get_listing_backend(
+        self, session: SessionItem, timeout: int
+    ) -> Tuple[Optional[str], str]:
+        """Probe once per session which listing backend works and cache it."""
+        session_key = self._get_session_key(session)
+        backend = self._listing_backend_cache.get(session_key)
+        if backend:
+            return backend, ""
+
+        success, output = self.execute_command_on_session(
+            ["sh", "-c", _LISTING_PROBE_SCRIPT],
+            session_override=session,
+            timeout=timeout,
+        )
+        backend = output.strip()
+        if not success or backend not in ("find", *_LISTING_COMMANDS):
+            return None, output
+        self.logger.debug(f"Directory listing backend for {session_key}: {backend}")
+        self._listing_backend_cache[session_key] = backend
+        return backend, ""
+
+    def list_directory(
+        self,
+        path: str,
+        session_override: Optional[SessionItem] = None,
+        timeout: int = 8,
+        on_output: Optional[Callable[[str, str], bool]] = None,
+    ) -> Tuple[bool, str, str, Optional[str]]:
+        """
+        Lists a directory, including its parent entry, in one command.
+
+        Args:
+            path: Directory to list, ending with a slash.
+            session_override: Optional session to use instead of the default.
+            timeout: Maximum time to wait for each command.
+            on_output: Stream the listing as it arrives: called with the
+                complete records (or lines) received so far and the format,
+                from whichever thread reads the output; returning False
+                stops the listing. The returned output is then empty.
+
+        Returns:
+            Tuple of (success, output, format, stamp), where format is
+            "find" for records to add with ListingBuilder.add_find_output and
+            "ls" for a long listing to parse with FileItem.from_ls_line, and
+            stamp is what get_directory_stamp() returned before the listing,
+            or None if the backend cannot provide it.
+        """
+        session = session_override if session_override else self.session_item
+        if not session:
+            return False, _("No session context for file operation."), "", None
+
+        backend, error = self._get_listing_backend(session, timeout)
+        if backend is None:
+            return False, error, "", None
+
+        if backend == "find":
+            command = [
+                "sh", "-c", _FIND_LISTING_SCRIPT, "sh", path, FIND_LISTING_FORMAT
+            ]
+            listing_format = "find"
+        else:
+            command = _LISTING_COMMANDS[backend] + [path]
+            listing_format = "ls"
+        if on_output is not None:
+            stream = _ListingStream(listing_format, on_output)
+            success, output = self.execute_command_on_session(
+                command,
+                session_override=session,
+                timeout=timeout,
+                on_output=stream.feed,
+            )
+            if success:
+                stream.finish()
+            return success, output, listing_format, stream.stamp
+
+        success, output = self.execute_command_on_session(
+            command, session_override=session, timeout=timeout
+        )
+        stamp = None
+        if success and listing_format == "find":
+            stamp, _sep, output = output.partition("\0")
+        return success, output, listing_format, stamp
+
+    def get_directory_stamp(
+        self,
+        path: str,
+        session_override: Optional[SessionItem] = None,
+        timeout: int = 8,
+    ) -> Optional[str]:
+        """
+        Returns the modification time of a directory as list_directory()
+        reports it, or None if it cannot be read or the listing backend
+        provides no stamp to compare it with.
+        """
+        session = session_override if session_override else self.session_item
+        if not session:
+            return None
+        backend = self._listing_backend_cache.get(self._get_session_key(session))
+        if backend != "find":
+            return None
+        success, output = self.execute_command_on_session(
+            ["find", path, "-maxdepth", "0", "-printf", _DIRECTORY_STAMP_FORMAT],
+            session_override=session,
+            timeout=timeout,
+        )
+        return output if success and output else None
+
     def get_remote_file_timestamp(self, remote_path: str) -> Optional[int]:
         """Gets the modification timestamp of a remote file."""
         if self.session_item and self.session_item.is_ssh():
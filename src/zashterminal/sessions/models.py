@@ -119,6 +119,7 @@ class SessionItem(BaseModel):
         command_specific_highlighting: Optional[bool] = None,
         cat_colorization: Optional[bool] = None,
         shell_input_highlighting: Optional[bool] = None,
+        defer_hidden_highlighting: Optional[bool] = None,
     ):
         super().__init__()
         self.logger = get_logger("zashterminal.sessions.model")
@@ -166,6 +167,7 @@ class SessionItem(BaseModel):
         self._command_specific_highlighting: Optional[bool] = command_specific_highlighting
         self._cat_colorization: Optional[bool] = cat_colorization
         self._shell_input_highlighting: Optional[bool] = shell_input_highlighting
+        self._defer_hidden_highlighting: Optional[bool] = defer_hidden_highlighting
 
     @property
     def children(self) -> Optional[Gio.ListStore]:
@@ -516,6 +518,25 @@ class SessionItem(BaseModel):
             self._shell_input_highlighting = value
             self._mark_modified()
 
+    @property
+    def defer_hidden_highlighting(self) -> Optional[bool]:
+        """Per-session override for skipping output highlighting while the tab is hidden.
+
+        None means automatic (inherit the global preference).
+        """
+
+        return self._defer_hidden_highlighting
+
+    @defer_hidden_highlighting.setter
+    def defer_hidden_highlighting(self, value: Optional[bool]):
+        if value is not None and not isinstance(value, bool):
+            raise SessionValidationError(
+                self.name, ["Invalid defer_hidden_highlighting value"]
+            )
+        if self._defer_hidden_highlighting != value:
+            self._defer_hidden_highlighting = value
+            self._mark_modified()
+
     def get_validation_errors(self) -> List[str]:
         """Returns a list of validation error messages."""
         errors = []
@@ -584,6 +605,7 @@ class SessionItem(BaseModel):
             "command_specific_highlighting": self.command_specific_highlighting,
             "cat_colorization": self.cat_colorization,
             "shell_input_highlighting": self.shell_input_highlighting,
+            "defer_hidden_highlighting": self.defer_hidden_highlighting,
 
             "created_at": self._created_at,
             "modified_at": self._modified_at,
@@ -619,6 +641,7 @@ class SessionItem(BaseModel):
             ),
             cat_colorization=data.get("cat_colorization", None),
             shell_input_highlighting=data.get("shell_input_highlighting", None),
+            defer_hidden_highlighting=data.get("defer_hidden_highlighting", None),
         )
         # __init__ sets default metadata; overwrite with loaded data
         session._auth_value = data.get("auth_value", "")
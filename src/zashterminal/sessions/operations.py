@@ -138,6 +138,9 @@ class SessionOperations:
             original_session.shell_input_highlighting = (
                 updated_session.shell_input_highlighting
             )
+            original_session.defer_hidden_highlighting = (
+                updated_session.defer_hidden_highlighting
+            )
 
             if not self._save_changes():
                 # Rollback changes on failure by recreating the item from original data
@@ -291,6 +291,9 @@ class DefaultSettings:
             "cat_light_theme": "blinds-light",
             # Legacy setting - now only used if mode is "manual"
             "pygments_theme": "monokai",
+            # Cat colorization budget in MB/s: output arriving faster than this
+            # (after a two-second burst) is shown uncolored until the prompt
+            "cat_highlight_budget_mbps": 2.0,
             # Shell Input Syntax Highlighting (experimental)
             # When enabled, applies Pygments syntax highlighting to shell commands as you type
             "shell_input_highlighting_enabled": False,
@@ -302,6 +305,27 @@ class DefaultSettings:
             "shell_input_light_theme": "blinds-light",
             # Legacy setting kept for backwards compatibility - now only used if mode is "manual"
             "shell_input_pygments_theme": "monokai",
+            # Output highlighting worker: chunks of at least this many bytes are
+            # highlighted on a background thread instead of the GTK main loop
+            "highlight_worker_enabled": True,
+            "highlight_worker_min_bytes": 4096,
+            # Fraction of one CPU core output highlighting may use; faster
+            # streams are shown raw until they calm down
+            "highlight_cpu_budget": 0.35,
+            # Feed output of hidden tabs raw instead of highlighting it
+            # (overridable per session)
+            "highlight_defer_hidden_tabs": True,
+            # Record per-rule hit counts and match time (shown in the
+            # highlight dialog); adds overhead, so off by default
+            "highlight_rule_profiling": False,
+            # Per-tab highlighting telemetry (bytes, fallbacks, latency), shown
+            # in the telemetry dialog and logged every N seconds (0 = never)
+            "highlight_telemetry_enabled": False,
+            "highlight_telemetry_log_interval": 0,
+            # A highlight rule taking longer than this on one line is abandoned;
+            # rules that time out this many times are disabled automatically
+            "highlight_match_timeout_ms": 50,
+            "highlight_rule_timeout_strikes": 3,
             # Icon Theme Strategy: "zashterminal" (bundled) or "system"
             # Using Zashterminal Icons by default speeds up GTK4 startup
             "icon_theme_strategy": "zashterminal",
@@ -0,0 +1,248 @@
+# zashterminal/settings/highlight_bundle.py
+"""
+On-disk cache of parsed and pre-analyzed highlight rules.
+
+Loading highlights means parsing every JSON file in data/highlights/ and the
+user highlights directory, and the output highlighter then analyzes every
+pattern (literal keywords, required literals, backtracking risks) before
+compiling it. The bundle keeps the results of that work in a single JSON
+file under the user cache directory:
+
+- Parsed contexts (system merged with user overrides) and the trigger map,
+  valid as long as no highlight file was added, removed or modified.
+- Per-pattern analysis, known-valid patterns and resolved ANSI colors,
+  valid for the app version that produced them.
+
+Stale or unreadable bundles are ignored and rebuilt.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.security import ensure_secure_file_permissions
+from .config import APP_VERSION
+
+# Bump when the bundle layout or the pattern analysis changes
+BUNDLE_FORMAT = 1
+
+BUNDLE_FILE_NAME = "highlight_rules.bundle.json"
+
+
+@dataclass(slots=True)
+class PatternInfo:
+    """
+    Cached analysis of one rule pattern.
+
+    Attributes:
+        literal_keywords: Keywords if the pattern is a plain word-boundary
+            alternation (matched without regex), else None.
+        required_literals: Literals one of which every match contains, or
+            None if none could be extracted.
+        risks: Catastrophic-backtracking risks found by static analysis.
+    """
+
+    literal_keywords: Optional[Tuple[str, ...]]
+    required_literals: Optional[Tuple[str, ...]]
+    risks: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "keywords": self.literal_keywords,
+            "required": self.required_literals,
+            "risks": self.risks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PatternInfo":
+        keywords = data.get("keywords")
+        required = data.get("required")
+        return cls(
+            literal_keywords=tuple(keywords) if keywords else None,
+            required_literals=tuple(required) if required else None,
+            risks=tuple(data.get("risks", ())),
+        )
+
+
+def compute_sources_fingerprint(directories: Iterable[Optional[Path]]) -> str:
+    """
+    Fingerprint the highlight JSON files in the given directories.
+
+    Uses file names, sizes and modification times, so any added, removed
+    or edited file changes the result without reading file contents.
+    """
+    digest = hashlib.sha1()
+    for directory in directories:
+        digest.update(str(directory).encode("utf-8", "surrogateescape"))
+        if directory is None:
+            continue
+        try:
+            entries = sorted(
+                (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in os.scandir(directory)
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+        except OSError:
+            entries = []
+        for name, size, mtime_ns in entries:
+            digest.update(f"{name}\0{size}\0{mtime_ns}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+class HighlightRuleBundle:
+    """
+    Cached highlight contexts plus per-pattern analysis.
+
+    Thread-safe: the highlighter may record pattern analysis from a
+    background warm-up thread while the UI thread reads contexts.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.logger = get_logger("zashterminal.settings.highlight_bundle")
+        self._path = cache_dir / BUNDLE_FILE_NAME
+        self._lock = threading.Lock()
+        self._version_key = f"{APP_VERSION}:{BUNDLE_FORMAT}"
+        self._sources_key = ""
+        self._contexts: Optional[Dict[str, Dict[str, Any]]] = None
+        self._trigger_map: Optional[Dict[str, str]] = None
+        self._patterns: Dict[str, PatternInfo] = {}
+        self._ansi_colors: Dict[str, str] = {}
+        self._valid_patterns: Set[str] = set()
+        self._loaded = False
+        self._dirty = False
+
+    def load(self, sources_key: str) -> bool:
+        """
+        Read the bundle file (once) and check it against the sources.
+
+        Pattern analysis is kept whenever the app version matches; cached
+        contexts only when they were built from the same highlight files.
+
+        Args:
+            sources_key: Result of compute_sources_fingerprint().
+
+        Returns:
+            True if cached contexts are available for these sources.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                self._read_file()
+            if self._sources_key != sources_key:
+                self._sources_key = sources_key
+                self._contexts = None
+                self._trigger_map = None
+            return self._contexts is not None
+
+    def _read_file(self) -> None:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable highlight bundle: {e}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self._version_key:
+            self.logger.debug("Highlight bundle is from another version; rebuilding")
+            return
+
+        try:
+            self._patterns = {
+                pattern: PatternInfo.from_dict(info)
+                for pattern, info in data.get("patterns", {}).items()
+            }
+            self._ansi_colors = dict(data.get("ansi_colors", {}))
+            self._valid_patterns = set(data.get("valid_patterns", ()))
+            if data.get("contexts") is not None:
+                self._sources_key = data.get("sources", "")
+                self._contexts = data["contexts"]
+                self._trigger_map = dict(data.get("trigger_map", {}))
+        except Exception as e:
+            self.logger.warning(f"Ignoring malformed highlight bundle: {e}")
+            self._patterns = {}
+            self._ansi_colors = {}
+            self._valid_patterns = set()
+            self._contexts = None
+            self._trigger_map = None
+
+    def get_contexts(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return cached contexts as serialized dicts, keyed by context name."""
+        with self._lock:
+            return self._contexts
+
+    def get_trigger_map(self) -> Optional[Dict[str, str]]:
+        with self._lock:
+            return dict(self._trigger_map) if self._trigger_map is not None else None
+
+    def set_contexts(
+        self, contexts: Dict[str, Dict[str, Any]], trigger_map: Dict[str, str]
+    ) -> None:
+        """Store freshly parsed contexts (serialized) and their trigger map."""
+        with self._lock:
+            self._contexts = contexts
+            self._trigger_map = dict(trigger_map)
+            self._dirty = True
+
+    def get_pattern_info(self, pattern: str) -> Optional[PatternInfo]:
+        return self._patterns.get(pattern)
+
+    def set_pattern_info(self, pattern: str, info: PatternInfo) -> None:
+        with self._lock:
+            self._patterns[pattern] = info
+            self._dirty = True
+
+    def is_known_valid(self, pattern: str) -> bool:
+        """Whether the pattern was already checked to compile."""
+        return pattern in self._valid_patterns
+
+    def add_valid_pattern(self, pattern: str) -> None:
+        with self._lock:
+            self._valid_patterns.add(pattern)
+            self._dirty = True
+
+    def get_ansi_color(self, color_name: str) -> Optional[str]:
+        return self._ansi_colors.get(color_name)
+
+    def set_ansi_color(self, color_name: str, ansi: str) -> None:
+        with self._lock:
+            self._ansi_colors[color_name] = ansi
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the bundle if anything changed since it was loaded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": self._version_key,
+                "sources": self._sources_key,
+                "contexts": self._contexts,
+                "trigger_map": self._trigger_map,
+                "patterns": {
+                    pattern: info.to_dict() for pattern, info in self._patterns.items()
+                },
+                "ansi_colors": self._ansi_colors,
+                "valid_patterns": sorted(self._valid_patterns),
+            }
+            self._dirty = False
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self._path.with_suffix(".tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            temp_file.replace(self._path)
+            try:
+                ensure_secure_file_permissions(str(self._path))
+            except Exception as e:
+                self.logger.warning(f"Failed to set secure permissions: {e}")
+            self.logger.debug(f"Saved highlight bundle ({len(data['patterns'])} patterns)")
+        except Exception as e:
+            self.logger.warning(f"Failed to save highlight bundle: {e}")
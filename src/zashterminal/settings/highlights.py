@@ -33,8 +33,10 @@ gi.require_version("GObject", "2.0")
 from gi.repository import GObject
 
 from ..utils.logger import get_logger, log_error_with_context
+from ..utils.regex_safety import find_backtracking_risks
 from ..utils.security import ensure_secure_file_permissions
 from .config import ColorSchemeMap, ColorSchemes, get_config_paths
+from .highlight_bundle import HighlightRuleBundle, compute_sources_fingerprint
 
 # Mapping of logical color names to ANSI color indices (0-15)
 # Standard ANSI: 0-7, Bright: 8-15
@@ -268,13 +270,18 @@ class HighlightManager(GObject.GObject):
     If a user has a custom JSON for a context, it completely overrides the system one.
 
     Signals:
-        rules-changed: Emitted when rules are added, removed, or modified.
+        rules-changed: Emitted when rules are added, removed, or modified,
+            or when which rules apply changes (enabled flags, context
+            awareness).
         context-changed: Emitted when the active context changes.
+        rule-auto-disabled: Emitted with (rule name, context name) when a
+            rule was disabled because its pattern kept timing out.
     """
 
     __gsignals__ = {
         "rules-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
         "context-changed": (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        "rule-auto-disabled": (GObject.SignalFlags.RUN_FIRST, None, (str, str)),
     }
 
     def __init__(self, config_path: Optional[Path] = None, settings_manager=None):
@@ -300,6 +307,14 @@ class HighlightManager(GObject.GObject):
         self._pattern_dirty = True
         self._lock = threading.RLock()
 
+        # Rule versions, so compiled rule sets can be invalidated per context:
+        # the epoch changes when the whole configuration is reloaded, the
+        # global version on global rule edits, a context's version on edits
+        # of that context
+        self._rules_epoch = 0
+        self._global_rules_version = 0
+        self._context_versions: Dict[str, int] = {}
+
         # Trigger to context mapping (built from loaded contexts)
         self._trigger_map: Dict[str, str] = {}
 
@@ -307,6 +322,9 @@ class HighlightManager(GObject.GObject):
         self._color_cache: Dict[str, Dict[str, str]] = {}
         self._current_theme_name: str = ""
 
+        # Parsed contexts and pattern analysis cached across launches
+        self._bundle = HighlightRuleBundle(self._config_paths.CACHE_DIR)
+
         # Load configuration
         self._load_layered_config()
         self.logger.info("HighlightManager initialized with layered config")
@@ -336,14 +354,17 @@ class HighlightManager(GObject.GObject):
                 # 1. Load user settings (enabled flags, disabled rule names)
                 self._load_user_settings()
 
-                # 2. Load system highlight rules (read-only base)
-                system_contexts = self._load_system_highlights()
-
-                # 3. Load user highlight rules (overrides)
-                user_contexts = self._load_user_highlights()
-
-                # 4. Merge: user overrides system
-                merged_contexts = {**system_contexts, **user_contexts}
+                # 2-4. Load system rules merged with user overrides, from the
+                # bundle if no highlight file changed since it was written
+                merged_contexts = self._load_cached_contexts()
+                from_bundle = merged_contexts is not None
+                if not from_bundle:
+                    system_contexts = self._load_system_highlights()
+                    user_contexts = self._load_user_highlights()
+                    merged_contexts = {**system_contexts, **user_contexts}
+                    serialized = {
+                        name: ctx.to_dict() for name, ctx in merged_contexts.items()
+                    }
                 self._config.contexts = merged_contexts
 
                 # 5. Load global rules from system "global.json"
@@ -366,12 +387,22 @@ class HighlightManager(GObject.GObject):
                             self._config.contexts[ctx_name].enabled = False
 
                 # 7. Build trigger map
-                self._build_trigger_map()
+                trigger_map = self._bundle.get_trigger_map() if from_bundle else None
+                if trigger_map is not None:
+                    self._trigger_map = trigger_map
+                else:
+                    self._build_trigger_map()
+
+                if not from_bundle:
+                    self._bundle.set_contexts(serialized, self._trigger_map)
+                    self._bundle.save()
 
                 self._pattern_dirty = True
+                self._rules_epoch += 1
                 self.logger.info(
                     f"Loaded {len(self._config.contexts)} contexts, "
                     f"{len(self._config.global_rules)} global rules"
+                    f"{' (cached)' if from_bundle else ''}"
                 )
 
             except Exception as e:
@@ -397,6 +428,26 @@ class HighlightManager(GObject.GObject):
         except Exception as e:
             self.logger.warning(f"Failed to load user settings: {e}")
 
+    def _load_cached_contexts(self) -> Optional[Dict[str, HighlightContext]]:
+        """Return contexts from the rule bundle, or None if it is stale."""
+        try:
+            sources_key = compute_sources_fingerprint(
+                (self._get_system_highlights_path(), self._user_highlights_dir)
+            )
+            if not self._bundle.load(sources_key):
+                return None
+            return {
+                name: HighlightContext.from_dict(data)
+                for name, data in self._bundle.get_contexts().items()
+            }
+        except Exception as e:
+            self.logger.warning(f"Failed to load cached highlight contexts: {e}")
+            return None
+
+    def get_rule_bundle(self) -> HighlightRuleBundle:
+        """Return the on-disk cache of contexts and pattern analysis."""
+        return self._bundle
+
     def _load_system_highlights(self) -> Dict[str, HighlightContext]:
         """Load highlight rules from system package data."""
         contexts = {}
@@ -471,6 +522,7 @@ class HighlightManager(GObject.GObject):
             contexts={},
         )
         self._pattern_dirty = True
+        self._rules_epoch += 1
 
     def save_config(self) -> None:
         """Save user settings and any user-modified contexts."""
@@ -547,6 +599,7 @@ class HighlightManager(GObject.GObject):
                 self._config.contexts[context.command_name] = context
                 self._build_trigger_map()
                 self._pattern_dirty = True
+                self._bump_context_version(context.command_name)
 
                 self.logger.info(f"Saved user context: {context.command_name}")
 
@@ -853,7 +906,10 @@ class HighlightManager(GObject.GObject):
     def enabled_for_local(self, value: bool) -> None:
         """Set whether highlighting is enabled for local terminals."""
         with self._lock:
+            if self._config.enabled_for_local == value:
+                return
             self._config.enabled_for_local = value
+        self.emit("rules-changed")
 
     @property
     def enabled_for_ssh(self) -> bool:
@@ -864,7 +920,10 @@ class HighlightManager(GObject.GObject):
     def enabled_for_ssh(self, value: bool) -> None:
         """Set whether highlighting is enabled for SSH sessions."""
         with self._lock:
+            if self._config.enabled_for_ssh == value:
+                return
             self._config.enabled_for_ssh = value
+        self.emit("rules-changed")
 
     @property
     def context_aware_enabled(self) -> bool:
@@ -875,7 +934,10 @@ class HighlightManager(GObject.GObject):
     def context_aware_enabled(self, value: bool) -> None:
         """Set whether context-aware highlighting is enabled."""
         with self._lock:
+            if self._config.context_aware_enabled == value:
+                return
             self._config.context_aware_enabled = value
+        self.emit("rules-changed")
 
     @property
     def contexts(self) -> Dict[str, HighlightContext]:
@@ -901,12 +963,36 @@ class HighlightManager(GObject.GObject):
         with self._lock:
             return list(self._config.contexts.keys())
 
+    def get_rules_version(self, command_name: str = "") -> Tuple[int, int, int]:
+        """
+        Return a version of the rules get_rules_for_context(command_name)
+        is built from; it changes whenever those rules may have changed.
+
+        Edits of one context leave the version of every other context
+        unchanged. Global rule edits change the version of the global rules
+        and of the contexts that include them.
+        """
+        with self._lock:
+            ctx = self._config.contexts.get(command_name) if command_name else None
+            uses_global = ctx is None or not ctx.enabled or ctx.use_global_rules
+            return (
+                self._rules_epoch,
+                self._context_versions.get(command_name, 0) if command_name else 0,
+                self._global_rules_version if uses_global else -1,
+            )
+
+    def _bump_context_version(self, command_name: str) -> None:
+        self._context_versions[command_name] = (
+            self._context_versions.get(command_name, 0) + 1
+        )
+
     def add_context(self, context: HighlightContext) -> None:
         """Add or update a highlight context."""
         with self._lock:
             self._config.contexts[context.command_name] = context
             self._build_trigger_map()
             self._pattern_dirty = True
+            self._bump_context_version(context.command_name)
         self.emit("rules-changed")
 
     def remove_context(self, command_name: str) -> bool:
@@ -916,6 +1002,7 @@ class HighlightManager(GObject.GObject):
                 del self._config.contexts[command_name]
                 self._build_trigger_map()
                 self._pattern_dirty = True
+                self._bump_context_version(command_name)
                 self.emit("rules-changed")
                 return True
             return False
@@ -926,6 +1013,7 @@ class HighlightManager(GObject.GObject):
             if command_name in self._config.contexts:
                 self._config.contexts[command_name].enabled = enabled
                 self._pattern_dirty = True
+                self._bump_context_version(command_name)
                 self.emit("rules-changed")
                 return True
             return False
@@ -936,6 +1024,7 @@ class HighlightManager(GObject.GObject):
             if command_name in self._config.contexts:
                 self._config.contexts[command_name].use_global_rules = use_global
                 self._pattern_dirty = True
+                self._bump_context_version(command_name)
                 self.emit("rules-changed")
                 return True
             return False
@@ -951,6 +1040,15 @@ class HighlightManager(GObject.GObject):
     # Rule Management
     # =========================================================================
 
+    def _is_rule_valid(self, rule: HighlightRule) -> bool:
+        """rule.is_valid(), skipping the compile for patterns known to be valid."""
+        if self._bundle.is_known_valid(rule.pattern):
+            return True
+        if rule.is_valid():
+            self._bundle.add_valid_pattern(rule.pattern)
+            return True
+        return False
+
     def get_rules_for_context(self, command_name: str) -> List[HighlightRule]:
         """
         Get rules for a specific context.
@@ -975,19 +1073,19 @@ class HighlightManager(GObject.GObject):
                 ctx = self._config.contexts[command_name]
                 if ctx.enabled:
                     # Get context-specific rules
-                    context_rules = [r for r in ctx.rules if r.enabled and r.is_valid()]
+                    context_rules = [r for r in ctx.rules if r.enabled and self._is_rule_valid(r)]
 
                     # Check if this context should include global rules
                     if ctx.use_global_rules:
                         # Global rules first, then context rules
-                        global_rules = [r for r in self._config.global_rules if r.enabled and r.is_valid()]
+                        global_rules = [r for r in self._config.global_rules if r.enabled and self._is_rule_valid(r)]
                         return global_rules + context_rules
                     else:
                         # Context rules only (new default behavior)
                         return context_rules
 
             # No context found - use global rules only
-            return [r for r in self._config.global_rules if r.enabled and r.is_valid()]
+            return [r for r in self._config.global_rules if r.enabled and self._is_rule_valid(r)]
 
     def get_rule(self, index: int) -> Optional[HighlightRule]:
         """Get a global rule by index."""
@@ -1001,6 +1099,7 @@ class HighlightManager(GObject.GObject):
         with self._lock:
             self._config.global_rules.append(rule)
             self._pattern_dirty = True
+            self._global_rules_version += 1
         self.emit("rules-changed")
 
     def update_rule(self, index: int, rule: HighlightRule) -> bool:
@@ -1009,6 +1108,7 @@ class HighlightManager(GObject.GObject):
             if 0 <= index < len(self._config.global_rules):
                 self._config.global_rules[index] = rule
                 self._pattern_dirty = True
+                self._global_rules_version += 1
                 self.emit("rules-changed")
                 return True
             return False
@@ -1019,6 +1119,7 @@ class HighlightManager(GObject.GObject):
             if 0 <= index < len(self._config.global_rules):
                 del self._config.global_rules[index]
                 self._pattern_dirty = True
+                self._global_rules_version += 1
                 self.emit("rules-changed")
                 return True
             return False
@@ -1029,6 +1130,7 @@ class HighlightManager(GObject.GObject):
             if 0 <= index < len(self._config.global_rules):
                 self._config.global_rules[index].enabled = enabled
                 self._pattern_dirty = True
+                self._global_rules_version += 1
                 self.emit("rules-changed")
                 return True
             return False
@@ -1043,6 +1145,7 @@ class HighlightManager(GObject.GObject):
             if command_name in self._config.contexts:
                 self._config.contexts[command_name].rules.append(rule)
                 self._pattern_dirty = True
+                self._bump_context_version(command_name)
                 self.emit("rules-changed")
                 return True
             return False
@@ -1055,6 +1158,7 @@ class HighlightManager(GObject.GObject):
                 if 0 <= index < len(ctx.rules):
                     ctx.rules[index] = rule
                     self._pattern_dirty = True
+                    self._bump_context_version(command_name)
                     self.emit("rules-changed")
                     return True
             return False
@@ -1067,6 +1171,7 @@ class HighlightManager(GObject.GObject):
                 if 0 <= index < len(ctx.rules):
                     del ctx.rules[index]
                     self._pattern_dirty = True
+                    self._bump_context_version(command_name)
                     self.emit("rules-changed")
                     return True
             return False
@@ -1079,6 +1184,7 @@ class HighlightManager(GObject.GObject):
                 if 0 <= index < len(ctx.rules):
                     ctx.rules[index].enabled = enabled
                     self._pattern_dirty = True
+                    self._bump_context_version(command_name)
                     self.emit("rules-changed")
                     return True
             return False
@@ -1098,6 +1204,7 @@ class HighlightManager(GObject.GObject):
             ctx.rules.insert(to_index, rule)
 
             self._pattern_dirty = True
+            self._bump_context_version(command_name)
             self.emit("rules-changed")
             return True
 
@@ -1157,6 +1264,45 @@ class HighlightManager(GObject.GObject):
             self._pattern_dirty = True
         self.emit("rules-changed")
 
+    def auto_disable_rule(self, rule_name: str, context_name: str) -> bool:
+        """
+        Disable and persist a rule whose pattern keeps timing out.
+
+        The rule is looked up in the given context first, then in the global
+        rules (contexts may include global rules).
+
+        Args:
+            rule_name: Name of the offending rule.
+            context_name: Context the rule was running in ("global" if none).
+
+        Returns:
+            True if an enabled rule with that name was found and disabled.
+        """
+        ctx = self.get_context(context_name) if context_name != "global" else None
+        if ctx is not None:
+            for index, rule in enumerate(ctx.rules):
+                if rule.name == rule_name and rule.enabled:
+                    self.set_context_rule_enabled(context_name, index, False)
+                    self.save_context_to_user(ctx)
+                    self.logger.warning(
+                        f"Disabled slow rule '{rule_name}' in context '{context_name}'"
+                    )
+                    self.emit("rule-auto-disabled", rule_name, context_name)
+                    return True
+
+        for index, rule in enumerate(self.rules):
+            if rule.name == rule_name and rule.enabled:
+                self.set_rule_enabled(index, False)
+                self.save_global_rules_to_user()
+                self.logger.warning(f"Disabled slow global rule '{rule_name}'")
+                self.emit("rule-auto-disabled", rule_name, "global")
+                return True
+        return False
+
+    def get_pattern_risks(self, pattern: str) -> List[str]:
+        """Return catastrophic-backtracking risks found in a pattern."""
+        return find_backtracking_risks(pattern)
+
     def validate_pattern(self, pattern: str) -> Tuple[bool, str]:
         """Validate a regex pattern."""
         if not pattern:
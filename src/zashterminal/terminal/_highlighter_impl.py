@@ -16,6 +16,18 @@ Performance Architecture:
 - Fast pre-filtering skips regex when line cannot possibly match
 - PCRE2 backend (regex module) for ~50% faster matching
 - Early termination on "stop" action rules
+- Large output chunks are highlighted on the CPU worker pool and fed to
+  VTE in sequence order from the main loop (pipeline mode)
+- Adaptive PTY reads: sustained output is drained per wakeup within a time
+  budget and queued chunks are coalesced into one feed per frame
+- Rate governor: fast streams whose projected highlight cost exceeds the
+  CPU budget are passed through raw until the stream calms down
+- Cat output is colorized by a streaming lexer that keeps its state across
+  chunks, on the CPU worker pool, within a MB/s budget
+- Lock-free PTY path: context, rules and enables are read from an
+  immutable per-proxy snapshot published by the output highlighter
+- Optional per-proxy telemetry (bytes in/fed, fallbacks, read-to-feed
+  latency); while off the proxy holds no telemetry object at all
 """
 
 import fcntl
@@ -25,9 +37,13 @@ import signal
 import struct
 import termios
 import threading
+import time
 import weakref
 from collections import deque
-from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
 
 import gi
 
@@ -37,14 +53,9 @@ gi.require_version("GLib", "2.0")
 import regex as re_engine
 from gi.repository import GLib, Vte
 
+from ..core.tasks import AsyncTaskManager
 from ..utils.logger import get_logger
 from ..utils.shell_echo import is_echo_terminator
-from .highlighter.constants import (
-    ALL_ESCAPE_SEQ_PATTERN as _ALL_ESCAPE_SEQ_PATTERN,
-)
-from .highlighter.constants import (
-    ANSI_COLOR_PATTERN as _ANSI_COLOR_PATTERN,
-)
 
 # Import constants and rules from highlighter package
 from .highlighter.constants import (
@@ -59,20 +70,91 @@ from .highlighter.constants import (
 from .highlighter.constants import (
     SHELL_NAME_PROMPT_PATTERN as _SHELL_NAME_PROMPT_PATTERN,
 )
+from .highlighter.binary import decode_output, incomplete_utf8_tail
+from .highlighter.cat_stream import (
+    CatByteBudget,
+    StreamingCatColorizer,
+    detect_cat_lexer,
+)
+from .highlighter.escapes import (
+    DecodedEscapes,
+    EscapeScan,
+    join_scans,
+    scan_escapes,
+    strip_escapes,
+)
+from .highlighter.governor import (
+    BYPASS_RECHECK_INTERVAL_MS,
+    GovernorStats,
+    HighlightRateGovernor,
+)
+from .highlighter.output_ring import OutputRing
+from .highlighter.pygments_cache import get_lexer_for_file, get_terminal_formatter
+from .highlighter.telemetry import (
+    HighlightTelemetry,
+    MeteredTerminal,
+    TelemetrySnapshot,
+)
 
 if TYPE_CHECKING:
-    pass
+    from .highlighter.rules import RuleSet
 
 # Import OutputHighlighter from its own module
-from .highlighter.output import OutputHighlighter, get_output_highlighter
+from .highlighter.output import (
+    OutputHighlighter,
+    ProxyHighlightState,
+    get_output_highlighter,
+)
 
 # Import ShellInputHighlighter from its own module
 from .highlighter.shell_input import ShellInputHighlighter, get_shell_input_highlighter
 
 # Sentinel marker for prompt detection in CAT queue
 _PROMPT_MARKER = b"__PROMPT_DETECTED__"
-_MAX_LINE_QUEUE_BYTES = 4 * 1024 * 1024
-_MAX_LINE_QUEUE_ITEMS = 20000
+# Highlight pipeline bytes in flight per proxy before falling back to raw feed
+_MAX_PIPELINE_BYTES = 4 * 1024 * 1024
+# Highlight jobs allowed in flight per proxy before falling back to raw feed
+_MAX_PIPELINE_JOBS = 64
+
+# Decode the whole chunk once more than 1/N of its lines hit the byte gate
+_BYTE_GATE_MAX_HIT_DIVISOR = 4
+
+# Adaptive PTY reads: the read size grows while wakeups drain more than one
+# buffer and shrinks back for interactive echo
+_MIN_READ_SIZE = 4096
+_MAX_READ_SIZE = 256 * 1024
+# Reads shorter than this are treated as interactive and never drained
+_INTERACTIVE_READ_BYTES = 1024
+# Per-wakeup drain limits for sustained output
+_READ_TIME_BUDGET = 0.008  # seconds
+_MAX_DRAIN_BYTES = 512 * 1024
+# Max bytes coalesced into a single term.feed() from the line queue
+_MAX_FEED_BYTES_PER_FRAME = 256 * 1024
+# Cat lines held back by the colorizer are flushed once output has been
+# idle this long (ms)
+_CAT_FLUSH_DELAY_MS = 40
+
+
+@dataclass(slots=True)
+class ProxyIOStats:
+    """
+    Read/feed statistics of a HighlightedTerminalProxy, used for tuning.
+
+    Wakeup values describe PTY reads of one io watch callback; frame values
+    describe coalesced term.feed() calls.
+    """
+
+    read_size: int = _MIN_READ_SIZE
+    last_wakeup_bytes: int = 0
+    last_wakeup_reads: int = 0
+    max_wakeup_bytes: int = 0
+    total_bytes_read: int = 0
+    last_frame_bytes: int = 0
+    max_frame_bytes: int = 0
+    total_frames: int = 0
+    # Output fed raw because the terminal was hidden (viewport deferral)
+    deferred_bytes: int = 0
+    deferred_lines: int = 0
 
 
 class HighlightedTerminalProxy:
@@ -115,7 +197,15 @@ class HighlightedTerminalProxy:
         self._highlighter = get_output_highlighter()
         self._shell_input_highlighter = get_shell_input_highlighter()
 
-        self._highlighter.register_proxy(self._proxy_id)
+        # Effective highlighting state (context, rules, enables), replaced
+        # as a whole by the output highlighter so the PTY path reads it
+        # without locks
+        self._state = ProxyHighlightState()
+        self._skip_first_consumed = 0
+
+        self._highlighter.register_proxy(
+            self._proxy_id, self._set_highlight_state, terminal_type
+        )
         self._shell_input_highlighter.register_proxy(self._proxy_id)
 
         self._master_fd: Optional[int] = None
@@ -131,30 +221,81 @@ class HighlightedTerminalProxy:
         self._is_alt_screen = False
         self._child_pid: Optional[int] = None
 
+        # Pipeline mode: highlight jobs run on the CPU pool and are fed in
+        # sequence order from the main loop.
+        # Key: sequence number, Value: (future, raw bytes)
         self._sequence_counter = 0
-        self._pending_outputs: Dict[int, bytes] = {}
+        self._pending_outputs: Dict[int, Tuple[Future, bytes]] = {}
         self._next_sequence_to_feed = 0
+        self._pending_output_bytes = 0
         self._output_lock = threading.Lock()
 
-        self._line_queue: deque = deque()
-        self._line_queue_bytes = 0
+        # Highlighted output waiting to be fed; growth beyond its own small
+        # buffer is charged to a memory pool shared by all proxies
+        self._line_queue = OutputRing()
         self._queue_processing = False
 
+        # Adaptive PTY read size and read/feed statistics
+        self._read_size = _MIN_READ_SIZE
+        self._io_stats = ProxyIOStats()
+
         # Buffer for partial lines
         self._partial_line_buffer: bytes = b""
 
-        # Burst detection counter
-        # Tracks consecutive large chunks to detect file dumps vs commands
-        self._burst_counter = 0
+        # Rate governor: switches to raw passthrough while highlighting the
+        # stream would exceed the CPU budget (replaces burst detection)
+        self._governor = HighlightRateGovernor()
+        self._highlight_bypassed = False
+        # Timer re-checking the governor while bypassed, so highlighting
+        # resumes even when no output follows the burst
+        self._bypass_recheck_id: Optional[int] = None
+        # Called with True/False when the governor pauses/resumes highlighting
+        # (used by the tab indicator). Always invoked on the main thread.
+        self.on_highlight_bypass_changed: Optional[Callable[[bool], None]] = None
+
+        # Viewport deferral: while the terminal is not mapped (background
+        # tab, hidden window) output is fed raw and only counted. None uses
+        # the global "highlight_defer_hidden_tabs" setting; the terminal
+        # manager sets the per-session override and updates it when the
+        # session is saved.
+        self.defer_hidden_override: Optional[bool] = None
+        self._terminal_visible = bool(terminal and terminal.get_mapped())
+        self._hidden_since_bytes = 0
+
+        # Telemetry (None while disabled, so the hooks cost a None check)
+        self._telemetry: Optional[HighlightTelemetry] = None
+        self._telemetry_log_source_id: Optional[int] = None
+        from ..settings.manager import get_settings_manager
+
+        if get_settings_manager().get("highlight_telemetry_enabled", False):
+            self.set_telemetry_enabled(True)
 
         # Bracketed Paste State
         self._in_bracketed_paste = False
+        # Set while output is fed untouched because it is binary or not
+        # UTF-8; cleared at the next line boundary of a text chunk
+        self._binary_passthrough = False
 
         # Pygments state for cat command highlighting
         self._cat_filename: Optional[str] = None
-        self._cat_bytes_processed: int = 0
+        self._cat_budget: Optional[CatByteBudget] = None
         self._cat_limit_reached: bool = False
         self._cat_waiting_for_newline: bool = False
+        # Streaming colorizer of the current cat run. Content lines of a
+        # chunk are collected in _cat_batch and submitted together; the
+        # resulting futures are fed from _cat_queue in order.
+        self._cat_colorizer: Optional[StreamingCatColorizer] = None
+        self._cat_batch: List[Tuple[str, str]] = []
+        self._cat_queue: deque = deque()
+        self._cat_queue_processing = False
+        self._cat_queue_blocked = False
+        self._cat_flush_source_id: Optional[int] = None
+        self._cat_last_chunk_time = 0.0
+        # Lines seen before the lexer of an extension-less file is known
+        self._pygments_needs_content_detection = False
+        self._content_buffer: List[str] = []
+        self._pending_lines: List[Tuple[str, str]] = []
+        self._cat_lines_processed = 0
 
         self._input_highlight_buffer = ""
         # Start as False; will be set True when shell prompt is detected via termprop
@@ -176,6 +317,23 @@ class HighlightedTerminalProxy:
             self._termprop_handler_id = terminal.connect(
                 "termprop-changed", self._on_termprop_changed
             )
+            self._map_handler_id = terminal.connect("map", self._on_widget_map)
+            self._unmap_handler_id = terminal.connect("unmap", self._on_widget_unmap)
+
+    def _set_highlight_state(self, state: ProxyHighlightState) -> None:
+        """Receive a new state snapshot from the output highlighter."""
+        self._state = state
+
+    def _consume_skip_first(self) -> bool:
+        """
+        Return True once per skip request of the output highlighter: the
+        first output after a command line is its echo and is not highlighted.
+        """
+        serial = self._state.skip_first_serial
+        if serial == self._skip_first_consumed:
+            return False
+        self._skip_first_consumed = serial
+        return True
 
     def _on_termprop_changed(self, terminal: Vte.Terminal, prop: str) -> None:
         """Handle VTE termprop changes for shell integration."""
@@ -189,8 +347,7 @@ class HighlightedTerminalProxy:
             self._suppress_shell_input_highlighting = False
             # Don't clear cat context immediately - wait for content to finish
             # The context will be cleared when prompt is detected in _process_cat_output
-            context = self._highlighter._proxy_contexts.get(self._proxy_id, "")
-            if context.lower() != "cat":
+            if self._state.context.lower() != "cat":
                 self._highlighter.clear_context(self._proxy_id)
                 self._reset_cat_state()
         elif prop == Vte.TERMPROP_SHELL_PREEXEC:
@@ -202,8 +359,7 @@ class HighlightedTerminalProxy:
         elif prop == Vte.TERMPROP_SHELL_POSTEXEC:
             # Command finished executing - reset highlighting state
             # Don't clear cat context immediately - content may still be arriving
-            context = self._highlighter._proxy_contexts.get(self._proxy_id, "")
-            if context.lower() != "cat":
+            if self._state.context.lower() != "cat":
                 self._highlighter.clear_context(self._proxy_id)
                 self._reset_cat_state()
             self._reset_input_buffer()
@@ -214,34 +370,6 @@ class HighlightedTerminalProxy:
                 self._shell_input_highlighter.set_at_prompt(self._proxy_id, True)
             self._reset_input_buffer()
 
-    def _has_incomplete_escape(self, data: bytes) -> bool:
-        """Check if data ends with an incomplete escape sequence."""
-        last_esc = data.rfind(b"\x1b")
-        if last_esc == -1:
-            return False
-
-        data_len = len(data)
-        pos = last_esc + 1
-        if pos >= data_len:
-            return True  # ESC at end with nothing after
-
-        second = data[pos]
-        if second == 0x5B:  # '[' - CSI
-            for i in range(pos + 1, data_len):
-                if 0x40 <= data[i] <= 0x7E:
-                    return False  # Found terminator
-            return True  # No terminator found
-        elif second == 0x5D:  # ']' - OSC
-            for i in range(pos + 1, data_len):
-                if data[i] == 0x07 or (
-                    data[i] == 0x1B and i + 1 < data_len and data[i + 1] == 0x5C
-                ):
-                    return False  # Found BEL or ST
-            return True
-        elif second in (0x28, 0x29):  # G0/G1 charset
-            return pos + 1 >= data_len
-        return False  # Simple escape, complete
-
     def _is_in_unclosed_multiline_block(self, buffer: str) -> bool:
         """
         Check if the buffer contains an unclosed multi-line block.
@@ -337,11 +465,8 @@ class HighlightedTerminalProxy:
         clean = _CSI_CONTROL_PATTERN.sub('', content)
         clean = _SGR_RESET_LINE_PATTERN.sub('', clean).strip()
         if clean:
-            highlighted = self._highlight_line_with_pygments(clean, self._cat_filename)
-            self._cat_queue.append(highlighted.encode("utf-8", errors="replace"))
-            if add_newline:
-                self._cat_queue.append(b"\r\n")
-        self._cat_queue.append(_PROMPT_MARKER)
+            self._cat_batch.append((clean, "\r\n" if add_newline else ""))
+        self._queue_cat_raw(_PROMPT_MARKER)
         self._cat_queue.append(prompt.encode("utf-8", errors="replace"))
 
     def _handle_backspace_in_buffer(self, data: bytes) -> int:
@@ -423,6 +548,29 @@ class HighlightedTerminalProxy:
         # We only clean up our Python-side IO watches.
         self._cleanup_io_watch()
 
+    def _on_widget_map(self, widget) -> None:
+        self._terminal_visible = True
+        deferred = self._io_stats.deferred_bytes - self._hidden_since_bytes
+        if deferred:
+            # Already fed to VTE, so the region stays uncolored; highlighting
+            # resumes with the next output
+            self.logger.debug(
+                f"Proxy {self._proxy_id}: {deferred} bytes shown unhighlighted "
+                f"while hidden"
+            )
+
+    def _on_widget_unmap(self, widget) -> None:
+        self._terminal_visible = False
+        self._hidden_since_bytes = self._io_stats.deferred_bytes
+
+    def _defer_while_hidden(self) -> bool:
+        """True if output should be fed raw because the terminal is hidden."""
+        if self._terminal_visible:
+            return False
+        if self.defer_hidden_override is not None:
+            return self.defer_hidden_override
+        return self._state.defer_hidden
+
     def create_pty(self) -> Tuple[int, int]:
         master_fd, slave_fd = pty.openpty()
         flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
@@ -504,6 +652,8 @@ class HighlightedTerminalProxy:
             self._sequence_counter = 0
             self._pending_outputs = {}
             self._next_sequence_to_feed = 0
+            self._pending_output_bytes = 0
+            self._read_size = _MIN_READ_SIZE
 
             self._io_watch_id = GLib.io_add_watch(
                 self._master_fd,
@@ -558,13 +708,19 @@ class HighlightedTerminalProxy:
         self._cleanup_io_watch()
 
         with self._output_lock:
+            for future, _raw in self._pending_outputs.values():
+                future.cancel()
             self._pending_outputs.clear()
+            self._pending_output_bytes = 0
         self._line_queue.clear()
-        self._line_queue_bytes = 0
         self._queue_processing = False
         self._partial_line_buffer = b""
-        self._burst_counter = 0
+        self._governor.reset()
+        self._cancel_bypass_recheck()
+        self._highlight_bypassed = False
         self._in_bracketed_paste = False
+        self._binary_passthrough = False
+        self.set_telemetry_enabled(False)
 
         self._cat_filename = None
         self._input_highlight_buffer = ""
@@ -594,33 +750,206 @@ class HighlightedTerminalProxy:
 
             self._terminal_ref = None
 
-    def _update_alt_screen_state(self, data: bytes) -> bool:
+    def _update_alt_screen_state(self, scan: EscapeScan) -> bool:
         """
-        Check for Alternate Screen buffer switches.
+        Apply Alternate Screen buffer switches (vim, fzf, htop, etc).
+
+        The escape scan records every ?1049/?47/?1047 h/l toggle in the
+        chunk; the last one decides the state.
+
         Returns True if state changed.
         """
-        # Common sequences for entering/exiting alt screen (vim, fzf, htop, etc)
-        # \x1b[?1049h : Enable Alt Screen
-        # \x1b[?1049l : Disable Alt Screen
-        # \x1b[?47h   : Enable Alt Screen (Legacy)
-        # \x1b[?47l   : Disable Alt Screen (Legacy)
-
-        changed = False
-
-        # Check for enable patterns
-        if b"\x1b[?1049h" in data or b"\x1b[?47h" in data or b"\x1b[?1047h" in data:
-            if not self._is_alt_screen:
-                self._is_alt_screen = True
-                changed = True
-
-        # Check for disable patterns
-        # Note: We check disable AFTER enable in case both are in the same chunk (rare but possible)
-        if b"\x1b[?1049l" in data or b"\x1b[?47l" in data or b"\x1b[?1047l" in data:
-            if self._is_alt_screen:
-                self._is_alt_screen = False
-                changed = True
+        alt_screen = scan.alt_screen
+        if alt_screen is None or alt_screen == self._is_alt_screen:
+            return False
+        self._is_alt_screen = alt_screen
+        return True
+
+    def _read_available(self, fd: int) -> bytes:
+        """
+        Read from the PTY with an adaptive read size.
+
+        Short reads (interactive echo) are returned as-is and shrink the read
+        size. Larger reads keep draining the non-blocking fd until it is
+        empty, the time budget runs out or _MAX_DRAIN_BYTES is reached; the
+        read size grows when a wakeup drains more than one buffer.
+
+        Raises:
+            OSError: If the first read fails (e.g. the child exited).
+        """
+        read_size = self._read_size
+        data = os.read(fd, read_size)
+        data_len = len(data)
+        if data_len < _INTERACTIVE_READ_BYTES:
+            if read_size > _MIN_READ_SIZE:
+                self._read_size = max(_MIN_READ_SIZE, read_size // 2)
+            self._record_wakeup(data_len, 1)
+            return data
+
+        chunks = [data]
+        reads = 1
+        deadline = time.monotonic() + _READ_TIME_BUDGET
+        while data_len < _MAX_DRAIN_BYTES and time.monotonic() < deadline:
+            try:
+                chunk = os.read(fd, read_size)
+            except OSError:
+                # EAGAIN: drained. Other errors surface on the next wakeup.
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+            data_len += len(chunk)
+            reads += 1
+
+        if data_len > read_size:
+            self._read_size = min(_MAX_READ_SIZE, read_size * 2)
+        elif data_len < read_size // 4:
+            self._read_size = max(_MIN_READ_SIZE, read_size // 2)
+
+        self._record_wakeup(data_len, reads)
+        return chunks[0] if reads == 1 else b"".join(chunks)
+
+    def _record_wakeup(self, nbytes: int, reads: int) -> None:
+        stats = self._io_stats
+        stats.read_size = self._read_size
+        stats.last_wakeup_bytes = nbytes
+        stats.last_wakeup_reads = reads
+        stats.total_bytes_read += nbytes
+        if nbytes > stats.max_wakeup_bytes:
+            stats.max_wakeup_bytes = nbytes
+
+    def _record_frame(self, nbytes: int) -> None:
+        stats = self._io_stats
+        stats.last_frame_bytes = nbytes
+        stats.total_frames += 1
+        if nbytes > stats.max_frame_bytes:
+            stats.max_frame_bytes = nbytes
+
+    def get_io_stats(self) -> ProxyIOStats:
+        """Return a snapshot of the adaptive read and coalesced feed statistics."""
+        return replace(self._io_stats)
+
+    def get_governor_stats(self) -> GovernorStats:
+        """Return the rate governor's current throughput and cost estimates."""
+        return self._governor.get_stats()
+
+    @property
+    def highlight_bypassed(self) -> bool:
+        """True while highlighting is paused because output is too fast."""
+        return self._highlight_bypassed
+
+    def _set_highlight_bypass(
+        self, bypassed: bool, reason: str = "rate_governor"
+    ) -> None:
+        if bypassed == self._highlight_bypassed:
+            return
+        self._highlight_bypassed = bypassed
+        if bypassed:
+            if self._telemetry is not None:
+                self._telemetry.record_fallback(reason)
+            self._bypass_recheck_id = GLib.timeout_add(
+                BYPASS_RECHECK_INTERVAL_MS, self._recheck_highlight_bypass
+            )
+        else:
+            self._cancel_bypass_recheck()
+        self.logger.debug(
+            f"Proxy {self._proxy_id}: highlighting "
+            f"{'paused (fast output)' if bypassed else 'resumed'}"
+        )
+        if self.on_highlight_bypass_changed is not None:
+            try:
+                self.on_highlight_bypass_changed(bypassed)
+            except Exception as e:
+                self.logger.debug(f"Highlight bypass callback failed: {e}")
+
+    def _recheck_highlight_bypass(self) -> bool:
+        """Timer callback: resume highlighting once a burst has calmed down."""
+        if not self._running or not self._highlight_bypassed:
+            self._bypass_recheck_id = None
+            return False
+        if self._governor.recheck(time.monotonic()):
+            return True
+        self._bypass_recheck_id = None
+        self._set_highlight_bypass(False)
+        return False
+
+    def _cancel_bypass_recheck(self) -> None:
+        if self._bypass_recheck_id is not None:
+            GLib.source_remove(self._bypass_recheck_id)
+            self._bypass_recheck_id = None
+
+    @property
+    def telemetry_enabled(self) -> bool:
+        return self._telemetry is not None
+
+    def set_telemetry_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable telemetry for this proxy.
+
+        While enabled, the counters are also written to the log every
+        "highlight_telemetry_log_interval" seconds (0 disables logging).
+        Counters are discarded when telemetry is disabled.
+        """
+        if enabled == self.telemetry_enabled:
+            return
+        if self._telemetry_log_source_id is not None:
+            GLib.source_remove(self._telemetry_log_source_id)
+            self._telemetry_log_source_id = None
+        if not enabled:
+            self._telemetry = None
+            return
+
+        from ..settings.manager import get_settings_manager
+
+        self._telemetry = HighlightTelemetry()
+        interval = get_settings_manager().get("highlight_telemetry_log_interval", 0)
+        if interval > 0:
+            self._telemetry_log_source_id = GLib.timeout_add_seconds(
+                int(interval), self._log_telemetry
+            )
+
+    def get_telemetry_snapshot(self) -> Optional[TelemetrySnapshot]:
+        """Return the current telemetry counters, or None if disabled."""
+        if self._telemetry is None:
+            return None
+        return self._telemetry.snapshot(self._proxy_id)
+
+    def reset_telemetry(self) -> None:
+        if self._telemetry is not None:
+            self._telemetry.reset()
+
+    def _log_telemetry(self) -> bool:
+        if self._telemetry is None:
+            self._telemetry_log_source_id = None
+            return False
+        self.logger.info(self._telemetry.snapshot(self._proxy_id).format())
+        return True
+
+    def _metered(self, term: Vte.Terminal) -> Vte.Terminal:
+        """Wrap term so that feeds are counted while telemetry is on."""
+        if self._telemetry is None or isinstance(term, MeteredTerminal):
+            return term
+        return MeteredTerminal(term, self._telemetry, self._on_telemetry_fed)
+
+    def _has_output_backlog(self) -> bool:
+        return bool(
+            self._line_queue
+            or self._pending_outputs
+            or self._cat_queue
+            or self._cat_batch
+            or self._cat_flush_source_id is not None
+        )
 
-        return changed
+    def _on_telemetry_fed(self) -> None:
+        telemetry = self._telemetry
+        if telemetry is not None and not self._has_output_backlog():
+            telemetry.drained()
+
+    def _record_queue_depth(self) -> None:
+        if self._telemetry is not None:
+            self._telemetry.record_queue_depth(
+                len(self._line_queue) + self._pending_output_bytes
+            )
 
     def _on_pty_readable(self, fd: int, condition: GLib.IOCondition) -> bool:
         # 1. Fail fast if stopped or destroyed
@@ -634,10 +963,12 @@ class HighlightedTerminalProxy:
             return False
 
         try:
-            # 3. Try read - use 4KB buffer
-            data = os.read(fd, 4096)
+            # 3. Try read - drains sustained output within the time budget
+            data = self._read_available(fd)
             if not data:
                 return True  # Empty read, keep waiting
+            if self._telemetry is not None:
+                self._telemetry.bytes_in += len(data)
 
             # 4. Verify widget is alive before feeding
             term = self._terminal
@@ -674,39 +1005,42 @@ class HighlightedTerminalProxy:
 
             data_len = len(data)
 
-            # Check for incomplete escape sequence and buffer if needed
-            if self._has_incomplete_escape(data):
+            # Tokenize escape sequences once; every later stage reads the
+            # span table instead of re-scanning the chunk
+            scan = scan_escapes(data)
+
+            # Buffer an incomplete escape sequence until the next chunk
+            if scan.incomplete_tail >= 0:
                 self._partial_line_buffer = data
                 return True  # Wait for next chunk
 
-            # Processing logic - skip alt screen check on small packets
-            if data_len > 10:
-                self._update_alt_screen_state(data)
+            self._update_alt_screen_state(scan)
+
+            telemetry = self._telemetry
+            if telemetry is not None:
+                read_time = time.monotonic()
+                term = self._metered(term)
 
             try:
                 if self._is_alt_screen:
+                    self._flush_queue(term)
                     term.feed(data)
                 else:
-                    # Check if any highlighting feature is enabled
-                    from ..settings.manager import get_settings_manager
-
-                    settings = get_settings_manager()
+                    # Check if any highlighting feature is enabled, from the
+                    # state snapshot (no settings or highlighter locks here)
+                    state = self._state
 
                     # First check if output highlighting is enabled at all
                     # (Local Terminals or SSH Sessions must be enabled)
-                    output_highlighting_enabled = self._highlighter.is_enabled_for_type(
-                        self._terminal_type
-                    )
+                    output_highlighting_enabled = state.output_enabled
 
                     # Cat colorization and shell input highlighting only work
                     # when output highlighting is enabled (as shown in UI)
                     cat_colorization_enabled = (
-                        output_highlighting_enabled
-                        and settings.get("cat_colorization_enabled", True)
+                        output_highlighting_enabled and state.cat_enabled
                     )
                     shell_input_enabled = (
-                        output_highlighting_enabled
-                        and self._shell_input_highlighter.enabled
+                        output_highlighting_enabled and state.shell_input_enabled
                     )
 
                     any_highlighting_enabled = (
@@ -717,18 +1051,11 @@ class HighlightedTerminalProxy:
 
                     if not any_highlighting_enabled:
                         # No highlighting features enabled - feed raw data
+                        self._flush_queue(term)
                         term.feed(data)
                     else:
-                        # Get context with lock
-                        with self._highlighter._lock:
-                            context = self._highlighter._proxy_contexts.get(
-                                self._proxy_id, ""
-                            )
-                            is_ignored = (
-                                context
-                                and context.lower()
-                                in self._highlighter._ignored_commands
-                            )
+                        context = state.context
+                        is_ignored = state.ignored
 
                         # Check for cat syntax highlighting
                         is_cat_context = context and context.lower() == "cat"
@@ -745,21 +1072,22 @@ class HighlightedTerminalProxy:
                             if is_interactive_input:
                                 term.feed(data)
                             else:
-                                self._process_cat_output(data, term)
+                                self._process_cat_output(data, term, scan)
                         elif is_ignored:
                             # PERFORMANCE FIX FOR IGNORED COMMANDS
                             # Only apply shell input highlighting if enabled
                             if shell_input_enabled and data_len < 1024:
                                 text = data.decode("utf-8", errors="replace")
-                                self._check_and_update_prompt_state(text)
+                                self._check_and_update_prompt_state(text, data, scan)
 
                                 if self._at_shell_prompt:
                                     highlighted = self._apply_shell_input_highlighting(
-                                        text, term
+                                        text, term, data, scan
                                     )
                                     if highlighted is not None:
                                         return True
 
+                            self._flush_queue(term)
                             term.feed(data)
                         elif (
                             not context
@@ -770,27 +1098,32 @@ class HighlightedTerminalProxy:
                             # Only when shell input highlighting is enabled
                             if data_len < 1024:
                                 text = data.decode("utf-8", errors="replace")
-                                self._check_and_update_prompt_state(text)
+                                self._check_and_update_prompt_state(text, data, scan)
 
                                 if self._at_shell_prompt:
                                     highlighted = self._apply_shell_input_highlighting(
-                                        text, term
+                                        text, term, data, scan
                                     )
                                     if highlighted is not None:
                                         return True
 
+                            self._flush_queue(term)
                             term.feed(data)
                         elif output_highlighting_enabled:
                             # Output highlighting is enabled - stream data with highlighting
-                            self._process_data_streaming(data, term)
+                            self._process_data_streaming(data, term, scan)
                         else:
                             # No applicable highlighting feature is enabled
                             # Feed raw data directly
+                            self._flush_queue(term)
                             term.feed(data)
             except Exception:
                 self._widget_destroyed = True
                 self._io_watch_id = None
                 return False
+            finally:
+                if telemetry is not None:
+                    telemetry.end_read(read_time, self._has_output_backlog())
 
             return True
 
@@ -801,23 +1134,23 @@ class HighlightedTerminalProxy:
             self.logger.error(f"PTY read error: {e}")
             return True
 
-    def _process_cat_output(self, data: bytes, term: Vte.Terminal) -> None:
+    def _process_cat_output(
+        self, data: bytes, term: Vte.Terminal, scan: Optional[EscapeScan] = None
+    ) -> None:
         """
         Process cat output through Pygments for syntax highlighting.
         Includes safety limit, Strict Queue Ordering, Partial Buffer Flushing,
         and Robust Echo Skipping.
+
+        Args:
+            data: Raw chunk read from the PTY.
+            term: Terminal to feed.
+            scan: Escape scan of the chunk; computed here when not given.
         """
         # Early check: if cat colorization is disabled, bypass processing
         # Cat colorization also depends on output highlighting being enabled
-        from ..settings.manager import get_settings_manager
-
-        settings = get_settings_manager()
-        output_highlighting_enabled = self._highlighter.is_enabled_for_type(
-            self._terminal_type
-        )
-        cat_colorization_enabled = output_highlighting_enabled and settings.get(
-            "cat_colorization_enabled", True
-        )
+        state = self._state
+        cat_colorization_enabled = state.output_enabled and state.cat_enabled
         if not cat_colorization_enabled:
             term.feed(data)
             return
@@ -827,37 +1160,88 @@ class HighlightedTerminalProxy:
 
         # 2. Clear any leftover remainder from streaming mode.
         # At prompt boundaries this buffer may contain stale readline fragments;
-        # feeding it here can duplicate characters on the next echo.
+        # feeding it here can duplicate characters on the next echo. A
+        # character split by the previous read is completed by this one.
+        carried = self._partial_line_buffer
         self._partial_line_buffer = b""
-
-        # Constante de limite: 1MB
-        CAT_HIGHLIGHT_LIMIT = 1048576
+        if carried and incomplete_utf8_tail(carried) == len(carried):
+            if scan is not None:
+                scan = join_scans(carried, data, scan)
+            data = carried + data
 
         try:
             data_len = len(data)
+            if scan is None:
+                scan = scan_escapes(data)
 
-            # --- SAFETY LIMIT CHECK ---
-            if self._cat_limit_reached or (
-                self._cat_bytes_processed + data_len > CAT_HIGHLIGHT_LIMIT
-            ):
-                if not self._cat_limit_reached:
+            # --- BUDGET CHECK ---
+            if not self._cat_limit_reached:
+                if self._cat_budget is None:
+                    from ..settings.manager import get_settings_manager
+
+                    self._cat_budget = CatByteBudget(
+                        get_settings_manager().get("cat_highlight_budget_mbps", 2.0)
+                    )
+                if not self._cat_budget.admit(data_len):
                     self._cat_limit_reached = True
+                    if self._telemetry is not None:
+                        self._telemetry.record_fallback("cat_budget")
+
+            # Binary or non-UTF-8 content (cat of a binary file) is fed
+            # untouched, like output past the budget
+            text = None
+            if not self._cat_limit_reached:
+                utf8_tail = incomplete_utf8_tail(data)
+                text = decode_output(data[: data_len - utf8_tail])
+                if text is not None and utf8_tail:
+                    # The character completes in the next read
+                    self._partial_line_buffer = data[-utf8_tail:]
+                    data = data[:-utf8_tail]
+                    data_len -= utf8_tail
+                    scan = scan.slice(0, data_len)
+                    if not data:
+                        return
+                if text is not None:
+                    self._binary_passthrough = False
+                elif not self._binary_passthrough:
+                    self._binary_passthrough = True
+                    if self._telemetry is not None:
+                        self._telemetry.record_fallback("binary")
+
+            if text is None:
+                is_prompt = self._at_shell_prompt or scan.has_osc(7)
+                # Colorized output may still be pending; keep it in order
+                self._submit_cat_batch(flush=True)
+                if self._cat_queue:
+                    if is_prompt:
+                        self._cat_queue.append(_PROMPT_MARKER)
+                    self._cat_queue.append(data)
+                    self._resume_cat_queue()
+                    return
 
                 term.feed(data)
 
                 # Check if shell prompt (via termprops or OSC7 fallback)
-                if self._at_shell_prompt or b"\x1b]7;" in data or b"\033]7;" in data:
+                if is_prompt:
                     self._highlighter.clear_context(self._proxy_id)
                     self._reset_cat_state()
                     self._reset_input_buffer()
                 return
 
-            self._cat_bytes_processed += data_len
+            # Plain file content has no escape sequences at all; skip the
+            # per-line control/color checks for those chunks
+            has_escapes = scan.has_escapes
+            has_colors = scan.has_color
 
             # --- NORMAL PROCESSING ---
-            text = data.decode("utf-8", errors="replace")
             # FIX: Remove NULL bytes which can cause display issues
-            text = text.replace("\x00", "")
+            if "\x00" in text:
+                text = text.replace("\x00", "")
+                if has_escapes:
+                    scan = scan.drop(data)
+                    escapes = DecodedEscapes(scan, data.replace(b"\x00", b""))
+            elif has_escapes:
+                escapes = DecodedEscapes(scan, data)
 
             if not text:
                 term.feed(data)
@@ -874,7 +1258,7 @@ class HighlightedTerminalProxy:
                 return
 
             # Get filename from full command or try TERMPROP_CURRENT_FILE_URI
-            full_command = self._highlighter.get_full_command(self._proxy_id)
+            full_command = self._state.full_command
             new_filename = self._extract_filename_from_cat_command(full_command) or ""
 
             # Debug log for cat filename detection
@@ -888,38 +1272,38 @@ class HighlightedTerminalProxy:
                 )
 
             if new_filename != self._cat_filename:
+                self._submit_cat_batch(flush=True)
                 self._cat_filename = new_filename
-                self._pygments_lexer = None
+                # Batches already queued on the old colorizer still finish
+                self._cat_colorizer = None
                 self._content_buffer = []
                 self._cat_lines_processed = 0
                 self._pending_lines = []
-                self._php_in_multiline_comment = False
 
                 import os.path
 
                 _, ext = os.path.splitext(new_filename)
-                self._pygments_needs_content_detection = not ext and new_filename
-
-            if not hasattr(self, "_cat_queue"):
-                from collections import deque
-
-                self._cat_queue = deque()
-                self._cat_queue_processing = False
+                self._pygments_needs_content_detection = bool(
+                    not ext and new_filename
+                )
 
             # Check if we should start skipping the echo
-            skip_check = self._highlighter.should_skip_first_output(self._proxy_id)
-            if skip_check:
+            if self._consume_skip_first():
                 self._cat_waiting_for_newline = True
 
             lines = text.splitlines(keepends=True)
+            line_end = 0
+
+            for line in lines:
+                line_start = line_end
+                line_end += len(line)
 
-            for i, line in enumerate(lines):
                 # --- ECHO SKIPPING LOGIC ---
                 # If we are waiting for the command echo to finish (newline),
                 # pass everything through raw. This handles split escape sequences
                 # in the echo (like \x1b[C) correctly.
                 if self._cat_waiting_for_newline:
-                    self._cat_queue.append(line.encode("utf-8", errors="replace"))
+                    self._queue_cat_raw(line.encode("utf-8", errors="replace"))
                     # IMPORTANT: During paste, readline often redraws the line using a standalone
                     # '\r' followed by CSI cursor moves (e.g. ESC[C). A bare '\r' is NOT the end
                     # of the echoed command; only stop skipping once we see a newline.
@@ -940,7 +1324,7 @@ class HighlightedTerminalProxy:
                             line[:prompt_split_idx], line[prompt_split_idx:]
                         )
                     else:
-                        self._cat_queue.append(_PROMPT_MARKER)
+                        self._queue_cat_raw(_PROMPT_MARKER)
                         self._cat_queue.append(line.encode("utf-8", errors="replace"))
                     continue
 
@@ -950,7 +1334,7 @@ class HighlightedTerminalProxy:
                     if bpm_idx > 0:
                         self._handle_prompt_split(line[:bpm_idx], line[bpm_idx:])
                     else:
-                        self._cat_queue.append(_PROMPT_MARKER)
+                        self._queue_cat_raw(_PROMPT_MARKER)
                         self._cat_queue.append(line.encode("utf-8", errors="replace"))
                     continue
 
@@ -981,68 +1365,43 @@ class HighlightedTerminalProxy:
                 # The cat context should have already been cleared by prompt detection in the queue.
 
                 # Fallback: check for shell prompt patterns (for shells without termprops)
-                lines_done = getattr(self, "_cat_lines_processed", 0)
+                lines_done = self._cat_lines_processed
                 is_potential_prompt = lines_done > 0 or (
                     len(content) < 30 and "$" in content
                 )
 
                 if is_potential_prompt and self._is_shell_prompt(content):
-                    self._cat_queue.append(_PROMPT_MARKER)
+                    self._queue_cat_raw(_PROMPT_MARKER)
                     self._cat_queue.append(line.encode("utf-8", errors="replace"))
                     continue
 
                 # Skip pure ANSI control sequences
-                clean_content = _CSI_CONTROL_PATTERN.sub("", content).strip()
-                if not clean_content and (not content or content.startswith("\x1b")):
-                    self._cat_queue.append(line.encode("utf-8", errors="replace"))
+                content_end = line_start + len(content)
+                if has_escapes:
+                    is_blank = escapes.is_control_only(text, line_start, content_end)
+                else:
+                    is_blank = not content.replace("\r", "").strip()
+                if is_blank and content.startswith("\x1b"):
+                    self._queue_cat_raw(line.encode("utf-8", errors="replace"))
                     continue
 
-                # Highlight content
-                has_ansi_colors = bool(_ANSI_COLOR_PATTERN.search(content))
-                is_content = bool(content.strip())
-
-                if is_content and not has_ansi_colors:
-                    highlighted = self._highlight_line_with_pygments(
-                        content, self._cat_filename
-                    )
-
-                    current_lexer = getattr(self, "_pygments_lexer", None)
-                    if current_lexer is not None:
-                        # Flush pending
-                        pending = getattr(self, "_pending_lines", [])
-                        if pending:
-                            for pending_content, pending_ending in pending:
-                                pending_highlighted = (
-                                    self._highlight_line_with_pygments(
-                                        pending_content, self._cat_filename
-                                    )
-                                )
-                                self._cat_queue.append(
-                                    (pending_highlighted + pending_ending).encode(
-                                        "utf-8", errors="replace"
-                                    )
-                                )
-                            self._pending_lines = []
-
-                        self._cat_queue.append(
-                            (highlighted + ending).encode("utf-8", errors="replace")
-                        )
-                    else:
-                        # Buffer
-                        pending = getattr(self, "_pending_lines", [])
-                        pending.append((content, ending))
-                        self._pending_lines = pending
-
-                    self._cat_lines_processed = lines_done + 1
+                # Output that is already colored is passed through; everything
+                # else (blank lines included) goes to the streaming colorizer
+                if has_colors and escapes.has_color(line_start, content_end):
+                    self._queue_cat_raw(line.encode("utf-8", errors="replace"))
                 else:
-                    self._cat_queue.append(line.encode("utf-8", errors="replace"))
-                    if is_content:
-                        self._cat_lines_processed = lines_done + 1
+                    self._cat_batch.append((content, ending))
+                if not is_blank:
+                    self._cat_lines_processed = lines_done + 1
+
+            self._submit_cat_batch()
+            if self._cat_colorizer is not None or self._pending_lines:
+                self._schedule_cat_flush()
 
             # Process batch
             if self._cat_queue and not self._cat_queue_processing:
                 self._process_cat_queue_batch(term, immediate=True)
-                if self._cat_queue:
+                if self._cat_queue and not self._cat_queue_blocked:
                     self._cat_queue_processing = True
                     GLib.idle_add(self._process_cat_queue, term)
 
@@ -1173,197 +1532,142 @@ class HighlightedTerminalProxy:
         except ImportError:
             return None
 
-    def _highlight_line_with_pygments(self, line: str, filename: str) -> str:
+    def _create_cat_colorizer(
+        self, lines: List[Tuple[str, str]]
+    ) -> Optional[StreamingCatColorizer]:
         """
-        Highlight a single line using Pygments.
+        Create the colorizer for the current cat file.
 
-        For PHP files, we track multi-line comment state manually to ensure
-        lines inside /* ... */ blocks are highlighted as comments.
+        The lexer comes from the file name, or, for files without a known
+        extension, from the first lines of content (shebang, then
+        guess_lexer). Returns None while content detection is undecided.
 
         Args:
-            line: Single line of text (without line ending)
-            filename: Filename for lexer detection
+            lines: New lines for content detection.
+        """
+        filename = self._cat_filename
+        lexer = None
+        if filename and not self._pygments_needs_content_detection:
+            lexer = get_lexer_for_file(filename)
+            if lexer is None:
+                # Unknown extension - enable content detection as fallback
+                self._pygments_needs_content_detection = True
+
+        if lexer is None and self._pygments_needs_content_detection:
+            for content, _ in lines:
+                # Strip NULL chars and control chars from terminal
+                clean = content.strip().lstrip(
+                    "\x00\x01\x02\x03\x04\x05\x06\x07\x08"
+                )
+                if clean and not clean.startswith("\x1b"):
+                    self._content_buffer.append(clean)
+                    if len(self._content_buffer) >= 10:
+                        break
+            lexer = detect_cat_lexer(self._content_buffer)
+            if lexer is None:
+                return None
+            self._pygments_needs_content_detection = False
+            self._content_buffer = []
 
-        Returns:
-            Highlighted line with ANSI escape codes
+        if lexer is None:
+            return None
+        self.logger.debug(
+            f"Pygments: using {type(lexer).__name__} for filename '{filename}'"
+        )
+        formatter = get_terminal_formatter(
+            self._get_pygments_theme(), self._is_light_background()
+        )
+        return StreamingCatColorizer(lexer, formatter)
+
+    def _submit_cat_batch(self, flush: bool = False) -> None:
         """
-        try:
-            from pygments import highlight
-            from pygments.formatters import Terminal256Formatter
-            from pygments.lexers import (
-                TextLexer,
-                get_lexer_by_name,
-                get_lexer_for_filename,
-                guess_lexer,
+        Submit the content lines collected from the current chunk.
+
+        The colorizer future is queued on _cat_queue and fed in order by
+        _process_cat_queue_batch. Until a lexer is known, lines are kept in
+        _pending_lines; a flush passes them through uncolored.
+
+        Args:
+            flush: Also emit the lines the colorizer holds back (before raw
+                output, prompts, or when the output pauses).
+        """
+        lines = self._cat_batch
+        self._cat_batch = []
+
+        colorizer = self._cat_colorizer
+        if colorizer is None:
+            # Content detection has already seen the pending lines
+            colorizer = self._create_cat_colorizer(lines)
+            lines = self._pending_lines + lines
+            self._pending_lines = []
+            if colorizer is None:
+                if not lines:
+                    return
+                if flush or not self._pygments_needs_content_detection:
+                    self._cat_queue.append(
+                        "".join(content + ending for content, ending in lines).encode(
+                            "utf-8", errors="replace"
+                        )
+                    )
+                else:
+                    self._pending_lines = lines
+                return
+            self._cat_colorizer = colorizer
+        elif not lines and not flush:
+            return
+
+        state = self._state
+        background = state.worker_enabled and (
+            flush
+            or sum(len(content) for content, _ in lines) >= state.worker_min_bytes
+        )
+        future = colorizer.submit(lines, flush=flush, background=background)
+        if self._telemetry is not None:
+            self._telemetry.lines_highlighted += len(lines)
+        self._cat_queue.append(future)
+        if not future.done():
+            future.add_done_callback(
+                lambda _f: GLib.idle_add(self._resume_cat_queue)
             )
-            from pygments.styles import get_style_by_name
-            from pygments.util import ClassNotFound
 
-            # Get or create lexer
-            current_lexer = getattr(self, "_pygments_lexer", None)
-            needs_content_detection = getattr(
-                self, "_pygments_needs_content_detection", False
+    def _queue_cat_raw(self, item: bytes) -> None:
+        """Queue raw cat output (or a prompt marker) after pending content."""
+        self._submit_cat_batch(flush=True)
+        self._cat_queue.append(item)
+
+    def _schedule_cat_flush(self) -> None:
+        """Flush held cat lines once the output has been idle for a moment."""
+        self._cat_last_chunk_time = time.monotonic()
+        if self._cat_flush_source_id is None:
+            self._cat_flush_source_id = GLib.timeout_add(
+                _CAT_FLUSH_DELAY_MS, self._on_cat_flush_timeout
             )
-            is_php = filename and filename.lower().endswith(".php")
-
-            # Debug log for lexer state
-            if current_lexer is None:
-                self.logger.debug(f"Pygments: no lexer yet for filename='{filename}', needs_content_detection={needs_content_detection}")
-
-            # Detect lexer if we don't have one
-            if current_lexer is None:
-                lexer_found = False
-
-                # Try filename-based detection first
-                if filename and not needs_content_detection:
-                    try:
-                        self._pygments_lexer = get_lexer_for_filename(filename)
-                        lexer_found = True
-                        self.logger.debug(f"Pygments: found lexer {type(self._pygments_lexer).__name__} for filename '{filename}'")
-
-                        # For PHP, use startinline=True so code is recognized without <?php
-                        if is_php:
-                            from pygments.lexers import PhpLexer
-
-                            self._pygments_lexer = PhpLexer(startinline=True)
-                            # Initialize multi-line comment tracking for PHP
-                            self._php_in_multiline_comment = False
-
-                    except ClassNotFound:
-                        # Unknown extension - enable content detection as fallback
-                        self._pygments_needs_content_detection = True
-                        needs_content_detection = True
-
-                # Content-based detection (for files without extension OR unknown extension)
-                if needs_content_detection and not lexer_found:
-                    # Initialize buffer if needed
-                    if not hasattr(self, "_content_buffer"):
-                        self._content_buffer = []
-
-                    # Add line to buffer (skip ANSI sequences)
-                    # Strip NULL chars and control chars from terminal
-                    clean = line.strip().lstrip("\x00\x01\x02\x03\x04\x05\x06\x07\x08")
-                    if clean and not clean.startswith("\x1b"):
-                        self._content_buffer.append(clean)
-
-                        # Try shebang detection on first line
-                        if len(self._content_buffer) == 1 and clean.startswith("#!"):
-                            shebang = clean.lower()
-                            # Check for shell interpreters
-                            is_shell = any(
-                                s in shebang
-                                for s in [
-                                    "bash",
-                                    "/sh",
-                                    " sh",
-                                    "zsh",
-                                    "ksh",
-                                    "dash",
-                                    "fish",
-                                ]
-                            )
-                            if is_shell:
-                                self._pygments_lexer = get_lexer_by_name("bash")
-                                self._pygments_needs_content_detection = False
-                                lexer_found = True
-                            elif "python" in shebang:
-                                self._pygments_lexer = get_lexer_by_name("python")
-                                self._pygments_needs_content_detection = False
-                                lexer_found = True
-                            elif "perl" in shebang:
-                                self._pygments_lexer = get_lexer_by_name("perl")
-                                self._pygments_needs_content_detection = False
-                                lexer_found = True
-                            elif "ruby" in shebang:
-                                self._pygments_lexer = get_lexer_by_name("ruby")
-                                self._pygments_needs_content_detection = False
-                                lexer_found = True
-                            elif "node" in shebang:
-                                self._pygments_lexer = get_lexer_by_name("javascript")
-                                self._pygments_needs_content_detection = False
-                                lexer_found = True
-
-                    # Try guess_lexer after 3+ lines
-                    if not lexer_found and len(self._content_buffer) >= 3:
-                        try:
-                            content = "\n".join(self._content_buffer)
-                            guessed = guess_lexer(content)
-                            if not isinstance(guessed, TextLexer):
-                                self._pygments_lexer = guessed
-                                self._pygments_needs_content_detection = False
-                                lexer_found = True
-                        except Exception:
-                            pass
-
-                    # Give up after 10 lines - use TextLexer (no color)
-                    if not lexer_found and len(self._content_buffer) >= 10:
-                        self._pygments_lexer = TextLexer()
-                        self._pygments_needs_content_detection = False
-                        self._content_buffer = []
-
-                # Update current_lexer reference
-                current_lexer = getattr(self, "_pygments_lexer", None)
-
-            # Still no lexer? Return plain text
-            if current_lexer is None:
-                return line
-
-            # Get or create formatter - also recreate if theme changed
-            formatter = getattr(self, "_pygments_formatter", None)
-            current_theme = self._get_pygments_theme()
-            cached_theme = getattr(self, "_pygments_cached_theme", None)
-
-            if formatter is None or cached_theme != current_theme:
-                try:
-                    style = get_style_by_name(current_theme)
-                except ClassNotFound:
-                    style = get_style_by_name("monokai")
-                self._pygments_formatter = Terminal256Formatter(style=style)
-                self._pygments_cached_theme = current_theme
-                formatter = self._pygments_formatter
-
-            # For PHP: Track multi-line comments manually
-            # Pygments with startinline=True doesn't track state between lines
-            is_php = filename and filename.lower().endswith(".php")
-            if is_php:
-                in_comment = getattr(self, "_php_in_multiline_comment", False)
-
-                # Check if line opens or closes a multi-line comment
-                # Strip the line for checking, but preserve original for highlighting
-                if in_comment:
-                    # We're inside a comment - check if it closes
-                    if "*/" in line:
-                        # Comment closes on this line
-                        self._php_in_multiline_comment = False
-                        # Let Pygments try to highlight - it may do partial job
-                    else:
-                        # Still inside comment - apply comment color directly
-                        # Get comment color from the style (usually gray/green)
-                        comment_color = "\x1b[38;5;245m"  # Gray (monokai comment color)
-                        reset = "\x1b[39m"
-                        return f"{comment_color}{line}{reset}"
-                else:
-                    # Not in comment - check if one starts
-                    if "/*" in line:
-                        # Check if it also closes on this line
-                        start_pos = line.find("/*")
-                        end_pos = line.find("*/", start_pos + 2)
-                        if end_pos == -1:
-                            # Comment starts but doesn't close - track it
-                            self._php_in_multiline_comment = True
-                    # Also check for /** docblock
-                    elif "/**" in line:
-                        start_pos = line.find("/**")
-                        end_pos = line.find("*/", start_pos + 3)
-                        if end_pos == -1:
-                            self._php_in_multiline_comment = True
-
-            # Highlight using Pygments
-            return highlight(line, current_lexer, formatter).rstrip("\n")
 
-        except Exception as e:
-            self.logger.error(f"Highlighting error: {e}")
-            return line
+    def _on_cat_flush_timeout(self) -> bool:
+        if not self._running or self._widget_destroyed:
+            self._cat_flush_source_id = None
+            return False
+        idle = time.monotonic() - self._cat_last_chunk_time
+        if idle < _CAT_FLUSH_DELAY_MS / 1000:
+            return True
+        self._cat_flush_source_id = None
+        self._submit_cat_batch(flush=True)
+        self._resume_cat_queue()
+        return False
+
+    def _resume_cat_queue(self) -> bool:
+        """Restart cat queue processing (e.g. once a colorizer batch is done)."""
+        term = self._terminal
+        if term is None or not self._cat_queue or self._cat_queue_processing:
+            return False
+        self._cat_queue_processing = True
+        GLib.idle_add(self._process_cat_queue, self._metered(term))
+        return False
+
+    def _close_cat_colorizer(self) -> None:
+        if self._cat_colorizer is not None:
+            self._cat_colorizer.close()
+            self._cat_colorizer = None
 
     def _process_cat_queue_batch(
         self, term: Vte.Terminal, immediate: bool = False
@@ -1371,6 +1675,9 @@ class HighlightedTerminalProxy:
         """
         Process a batch of lines from the cat queue.
 
+        Colorizer futures that are not done yet stop the batch and set
+        _cat_queue_blocked; their completion resumes the queue.
+
         Args:
             term: VTE terminal to feed output to
             immediate: If True, process smaller batch for immediate display
@@ -1378,22 +1685,34 @@ class HighlightedTerminalProxy:
         Returns:
             True if prompt was detected (signals end of output)
         """
-        queue = getattr(self, "_cat_queue", None)
+        queue = self._cat_queue
+        self._cat_queue_blocked = False
         if not queue:
             return False
 
-        # Smaller batch for immediate display, larger for background
-        batch_size = 10 if immediate else 30
+        # Smaller batch for immediate display; background batches are bounded
+        # by the per-frame byte budget and coalesced into one feed
+        batch_size = 10 if immediate else None
 
         lines_to_feed = []
         prompt_detected = False
         remaining_after_prompt = []
+        frame_bytes = 0
+        popped = 0
 
-        for _ in range(batch_size):
-            if not queue:
+        while queue and frame_bytes < _MAX_FEED_BYTES_PER_FRAME:
+            if batch_size is not None and popped >= batch_size:
                 break
             try:
                 line_data = queue.popleft()
+                if isinstance(line_data, Future):
+                    if not line_data.done():
+                        queue.appendleft(line_data)
+                        self._cat_queue_blocked = True
+                        break
+                    line_data = line_data.result()
+                popped += 1
+                frame_bytes += len(line_data)
 
                 # Check for prompt marker
                 if line_data == _PROMPT_MARKER:
@@ -1413,17 +1732,10 @@ class HighlightedTerminalProxy:
         # Feed batch to terminal
         if lines_to_feed:
             term.feed(b"".join(lines_to_feed))
+            self._record_frame(frame_bytes)
 
         # Handle prompt detection - clear context
         if prompt_detected:
-            # Flush remaining pending lines (content that was buffered)
-            pending = getattr(self, "_pending_lines", [])
-            for pending_content, pending_ending in pending:
-                term.feed(
-                    (pending_content + pending_ending).encode("utf-8", errors="replace")
-                )
-            self._pending_lines = []
-
             # Feed any lines that came after the prompt marker
             # These are prompt lines (OSC7, PS1, etc.) that need to be displayed
             if remaining_after_prompt:
@@ -1434,6 +1746,8 @@ class HighlightedTerminalProxy:
             while queue:
                 try:
                     line_data = queue.popleft()
+                    if isinstance(line_data, Future):
+                        line_data = line_data.result()
                     if line_data != _PROMPT_MARKER:
                         drain_lines.append(line_data)
                 except IndexError:
@@ -1465,7 +1779,7 @@ class HighlightedTerminalProxy:
             return False
 
         try:
-            queue = getattr(self, "_cat_queue", None)
+            queue = self._cat_queue
             if not queue:
                 self._cat_queue_processing = False
                 return False
@@ -1473,7 +1787,8 @@ class HighlightedTerminalProxy:
             # Process batch
             prompt_detected = self._process_cat_queue_batch(term, immediate=False)
 
-            if prompt_detected:
+            if prompt_detected or self._cat_queue_blocked:
+                # Blocked: the pending colorizer batch resumes the queue
                 self._cat_queue_processing = False
                 return False
 
@@ -1492,19 +1807,20 @@ class HighlightedTerminalProxy:
     def _reset_cat_state(self) -> None:
         """Reset cat/pygments state."""
         self._cat_filename = None
-        self._cat_bytes_processed = 0  # Resetar contador
+        self._cat_budget = None
         self._cat_limit_reached = False  # Resetar flag
         self._cat_waiting_for_newline = False
-        self._pygments_lexer = None
+        self._close_cat_colorizer()
+        self._cat_batch = []
         self._pygments_needs_content_detection = False
         self._content_buffer = []
         self._pending_lines = []
         self._cat_lines_processed = 0
-        if hasattr(self, "_cat_queue"):
-            self._cat_queue.clear()
+        self._cat_queue.clear()
         self._cat_queue_processing = False
-        if hasattr(self, "_pygments_formatter"):
-            delattr(self, "_pygments_formatter")
+        if self._cat_flush_source_id is not None:
+            GLib.source_remove(self._cat_flush_source_id)
+            self._cat_flush_source_id = None
 
     def _extract_filename_from_cat_command(self, command: str) -> Optional[str]:
         """
@@ -1535,61 +1851,65 @@ class HighlightedTerminalProxy:
 
     def _flush_queue(self, term: Vte.Terminal) -> None:
         """
-        Force flush any pending lines in the highlighting queue to the terminal.
-        This ensures strict ordering before switching to raw feed.
+        Force flush any pending lines in the highlighting queue and any
+        in-flight pipeline jobs to the terminal.
+        This ensures strict ordering before switching to raw feed. Jobs
+        that have not finished are fed raw, so this never highlights or
+        waits on the main thread.
         """
         if self._line_queue:
             # Drain the entire queue immediately
             while self._line_queue:
-                try:
-                    chunk = self._line_queue.popleft()
-                    self._line_queue_bytes -= len(chunk)
-                    term.feed(chunk)
-                except IndexError:
-                    break
-            if self._line_queue_bytes < 0:
-                self._line_queue_bytes = 0
+                term.feed(self._line_queue.read(_MAX_FEED_BYTES_PER_FRAME))
             self._queue_processing = False
+        if self._pending_outputs:
+            self._feed_completed_outputs(term, drain=True)
 
-    def _enqueue_line_chunk(self, term: Vte.Terminal, chunk: bytes) -> bool:
+    def _enqueue_line_chunk(
+        self, term: Vte.Terminal, chunk: Union[bytes, memoryview]
+    ) -> bool:
         """
         Queue a highlighted chunk with memory backpressure.
 
-        If the queue grows beyond configured thresholds, flush pending chunks and
-        feed the current chunk directly to avoid unbounded memory growth.
+        If the ring buffer cannot take the chunk (per-proxy cap or shared
+        memory pool reached), flush pending chunks and feed the current chunk
+        directly to avoid unbounded memory growth.
         """
-        chunk_len = len(chunk)
-        if (
-            len(self._line_queue) >= _MAX_LINE_QUEUE_ITEMS
-            or self._line_queue_bytes + chunk_len > _MAX_LINE_QUEUE_BYTES
-        ):
+        if not self._line_queue.write(chunk):
             self.logger.debug(
-                f"Highlight queue backlog high ({len(self._line_queue)} items, "
-                f"{self._line_queue_bytes} bytes). Flushing and switching to raw feed "
-                f"for current chunk."
+                f"Highlight queue backlog high ({len(self._line_queue)} bytes). "
+                f"Flushing and switching to raw feed for current chunk."
             )
+            if self._telemetry is not None:
+                self._telemetry.record_fallback("queue_full")
             self._flush_queue(term)
-            term.feed(chunk)
+            term.feed(bytes(chunk))
             return False
-
-        self._line_queue.append(chunk)
-        self._line_queue_bytes += chunk_len
         return True
 
-    def _process_data_streaming(self, data: bytes, term: Vte.Terminal) -> None:
+    def _process_data_streaming(
+        self, data: bytes, term: Vte.Terminal, scan: Optional[EscapeScan] = None
+    ) -> None:
         """
         Apply highlighting with Adaptive Burst Detection, Alt-Screen Bypass,
         Bracketed Paste Bypass, Strict Ordering, and Robust Split-Escape Safety.
+
+        Args:
+            data: Raw chunk read from the PTY.
+            term: Terminal to feed.
+            scan: Escape scan of the chunk; computed here when not given.
         """
         try:
             # --- EARLY EXIT: Output highlighting disabled ---
             # Check if output highlighting is disabled for this terminal type.
             # This ensures that when the user disables output highlighting,
             # all subsequent data is fed raw to the terminal immediately.
-            if not self._highlighter.is_enabled_for_type(self._terminal_type):
+            state = self._state
+            if not state.output_enabled:
                 # Clear any stale highlighted data from the queue
                 self._line_queue.clear()
-                self._line_queue_bytes = 0
+                # In-flight pipeline jobs are still fed, in order
+                self._flush_queue(term)
                 # Feed any partial buffer and the current data raw
                 if self._partial_line_buffer:
                     term.feed(self._partial_line_buffer)
@@ -1597,8 +1917,11 @@ class HighlightedTerminalProxy:
                 term.feed(data)
                 return
 
+            if scan is None:
+                scan = scan_escapes(data)
+
             # --- 0. BRACKETED PASTE DETECTION ---
-            if b"\x1b[200~" in data:
+            if scan.bracketed_paste_start >= 0:
                 self._in_bracketed_paste = True
                 self._flush_queue(term)
                 if self._partial_line_buffer:
@@ -1607,7 +1930,7 @@ class HighlightedTerminalProxy:
 
             if self._in_bracketed_paste:
                 term.feed(data)
-                if b"\x1b[201~" in data:
+                if scan.bracketed_paste_end >= 0:
                     self._in_bracketed_paste = False
                     self._reset_input_buffer()
                     self._suppress_shell_input_highlighting = True
@@ -1636,16 +1959,11 @@ class HighlightedTerminalProxy:
 
                 # Check for readline redraw sequences:
                 # - \r (carriage return) - line redraw start
-                # - \x1b[D / \x1b[C - cursor left/right
-                # - \x1b[1D / \x1b[1C - cursor left/right by 1
-                # - \x1b[K / \x1b[0K - clear to end of line
-                # - \x1b[J / \x1b[0J - clear to end of screen
-                # - \x1b[A / \x1b[B - cursor up/down (history navigation)
-                # - \x1b[H - cursor home
-                # - \x1b[?25l / \x1b[?25h - hide/show cursor
-                # - \x1b[ followed by digits and G - cursor column move
-                # - \x1b[<n>P - delete characters
-                # - \x1b[<n>@ - insert characters
+                # - CSI sequences flagged by the escape scan (scan.has_redraw):
+                #   \x1b[<n>A/B/C/D cursor movement, \x1b[<n>G cursor column,
+                #   \x1b[H cursor home, \x1b[<n>K / \x1b[<n>J erase,
+                #   \x1b[<n>P / \x1b[<n>@ delete/insert characters and
+                #   \x1b[?25l / \x1b[?25h hide/show cursor
                 # - (reverse-i-search) etc. - readline search prompts
                 search_prompt_patterns = (
                     b"(reverse-i-search)",
@@ -1656,22 +1974,8 @@ class HighlightedTerminalProxy:
                 )
                 is_readline_redraw = (
                     b"\r" in data
-                    or b"\x1b[D" in data
-                    or b"\x1b[C" in data
-                    or b"\x1b[K" in data
-                    or b"\x1b[0K" in data
-                    or b"\x1b[1D" in data
-                    or b"\x1b[1C" in data
-                    or b"\x1b[A" in data
-                    or b"\x1b[B" in data
-                    or b"\x1b[J" in data
-                    or b"\x1b[0J" in data
-                    or b"\x1b[H" in data
-                    or b"\x1b[?25l" in data
-                    or b"\x1b[?25h" in data
+                    or scan.has_redraw
                     # Additional patterns for CTRL+R and history search
-                    or b"\x1b[P" in data  # Delete character
-                    or b"\x1b[@" in data  # Insert character
                     or any(pattern in data for pattern in search_prompt_patterns)
                 )
 
@@ -1687,8 +1991,12 @@ class HighlightedTerminalProxy:
                 ):
                     self._flush_queue(term)
                     # Any buffered remainder at the prompt is stale and can
-                    # cause visible duplication when readline redraws.
+                    # cause visible duplication when readline redraws; only
+                    # a character split by the previous read is kept
+                    carried = self._partial_line_buffer
                     self._partial_line_buffer = b""
+                    if carried and incomplete_utf8_tail(carried) == len(carried):
+                        data = carried + data
 
                     # Handle backspace - update the input buffer before returning
                     if b"\x08" in data or b"\x7f" in data:
@@ -1698,7 +2006,7 @@ class HighlightedTerminalProxy:
                     return
 
             # --- 1. ALT SCREEN DETECTION ---
-            self._update_alt_screen_state(data)
+            self._update_alt_screen_state(scan)
 
             if self._is_alt_screen:
                 self._flush_queue(term)
@@ -1710,35 +2018,97 @@ class HighlightedTerminalProxy:
 
             # Combine with partial data
             if self._partial_line_buffer:
+                scan = join_scans(self._partial_line_buffer, data, scan)
                 data = self._partial_line_buffer + data
                 self._partial_line_buffer = b""
 
             data_len = len(data)
 
+            # --- 1b. HIDDEN TERMINAL DEFERRAL ---
+            # Nobody sees a background tab's output as it scrolls by, so skip
+            # the rule engine and record the region instead
+            if self._defer_while_hidden():
+                stats = self._io_stats
+                stats.deferred_bytes += data_len
+                stats.deferred_lines += data.count(b"\n")
+                if self._at_shell_prompt or scan.has_osc(7):
+                    self._reset_input_buffer()
+                self._flush_queue(term)
+                term.feed(data)
+                return
+
             # --- 2. HARD LIMIT (Safety Valve) ---
             # Use 1MB limit to handle extremely long command lines while
             # still providing protection against streaming binary data
             if data_len > 1048576:
-                self._burst_counter = 100
+                self._governor.trip(time.monotonic())
+                self._set_highlight_bypass(True, "oversized_chunk")
                 self._flush_queue(term)
                 term.feed(data)
                 return
 
-            # --- 3. ADAPTIVE BURST DETECTION ---
-            if data_len > 1024:
-                self._burst_counter += 1
-            else:
-                self._burst_counter = 0
+            # --- 3. RATE GOVERNOR ---
+            # Bypass highlighting while the projected highlight CPU load of
+            # the stream exceeds the budget; resumes with hysteresis
+            self._governor.cpu_budget = state.cpu_budget
+            bypass = self._governor.observe(
+                data_len, data.count(b"\n"), time.monotonic()
+            )
+            self._set_highlight_bypass(bypass)
 
-            if self._burst_counter > 15:
+            if bypass:
                 # Use termprop state first, then OSC7 fallback
-                if self._at_shell_prompt or b"\x1b]7;" in data or b"\033]7;" in data:
+                if self._at_shell_prompt or scan.has_osc(7):
                     self._reset_input_buffer()
 
                 self._flush_queue(term)
                 term.feed(data)
                 return
 
+            # --- 4. BINARY / NON-UTF-8 PASSTHROUGH ---
+            # Decoding with replacement characters would corrupt such
+            # output, so it is fed byte for byte; highlighting resumes after
+            # the first newline of the next text chunk, which ends the line
+            # the binary data left open
+            utf8_tail = incomplete_utf8_tail(data)
+            text = decode_output(data[: data_len - utf8_tail])
+            if text is not None and utf8_tail:
+                # Carry a character split by the end of the read over to
+                # the next one instead of taking it for invalid UTF-8
+                carry = data[-utf8_tail:]
+                data = data[:-utf8_tail]
+                data_len -= utf8_tail
+                if not data:
+                    self._partial_line_buffer = carry
+                    return
+                scan = scan.slice(0, data_len)
+            else:
+                carry = b""
+            if text is None or (self._binary_passthrough and b"\n" not in data):
+                if not self._binary_passthrough:
+                    self._binary_passthrough = True
+                    if self._telemetry is not None:
+                        self._telemetry.record_fallback("binary")
+                if self._at_shell_prompt or scan.has_osc(7):
+                    self._reset_input_buffer()
+                self._flush_queue(term)
+                term.feed(data)
+                self._partial_line_buffer = carry
+                return
+
+            self._partial_line_buffer = carry
+            if self._binary_passthrough:
+                self._binary_passthrough = False
+                line_end = data.find(b"\n") + 1
+                self._flush_queue(term)
+                term.feed(data[:line_end])
+                data = data[line_end:]
+                if not data:
+                    return
+                text = None
+                scan = scan.slice(line_end, data_len)
+                data_len = len(data)
+
             # Standard partial line handling (for newlines)
             last_newline_pos = data.rfind(b"\n")
 
@@ -1757,25 +2127,24 @@ class HighlightedTerminalProxy:
                         is_interactive = True
                     elif any(t in rem_str for t in ("$ ", "# ", "% ", "> ")):
                         is_interactive = True
-                    elif (
-                        "\x1b[" in rem_str
-                        or "\x1b]7;" in rem_str
-                        or "\033]7;" in rem_str
-                    ):
+                    elif scan.has_escape_after(last_newline_pos + 1):
                         is_interactive = True
 
                 # Do not buffer remainders while at a shell prompt. Readline may
                 # be mid-redisplay, and buffering can replay stale bytes later
                 # (visible as duplicated trailing characters).
                 if not is_interactive and not self._at_shell_prompt:
-                    self._partial_line_buffer = remainder
+                    self._partial_line_buffer = remainder + carry
                     data = data[: last_newline_pos + 1]
+                    scan = scan.slice(0, last_newline_pos + 1)
+                    text = None
 
             elif last_newline_pos == -1 and data_len < 4096:
                 pass
 
             # --- 5. NORMAL PROCESSING ---
-            text = data.decode("utf-8", errors="replace")
+            if text is None:
+                text = data.decode("utf-8", errors="replace")
             if not text:
                 return
 
@@ -1785,7 +2154,7 @@ class HighlightedTerminalProxy:
             # This is especially important for shells without termprop support (sh, dash).
             if self._input_highlight_buffer and self._at_shell_prompt:
                 stripped_for_prompt = (
-                    _ALL_ESCAPE_SEQ_PATTERN.sub("", text).replace("\x00", "").strip()
+                    strip_escapes(text, data, scan).replace("\x00", "").strip()
                 )
                 # Check if text ENDS with a primary prompt (not continuation)
                 if stripped_for_prompt.endswith("$") or stripped_for_prompt.endswith(
@@ -1832,7 +2201,7 @@ class HighlightedTerminalProxy:
                             is_in_unclosed_block = self._is_in_unclosed_multiline_block(self._input_highlight_buffer)
 
                             # Also check continuation prompt in the data
-                            stripped_text = _ALL_ESCAPE_SEQ_PATTERN.sub("", text)
+                            stripped_text = strip_escapes(text, data, scan)
                             has_continuation_prompt = ">" in stripped_text.strip()
 
                             if is_in_unclosed_block or has_continuation_prompt:
@@ -1869,7 +2238,7 @@ class HighlightedTerminalProxy:
 
                     # Check if data contains a primary prompt (sh-5.3$, bash$, etc.)
                     # If so, we should reset even if we're in a multiline block (command was aborted/errored)
-                    stripped_for_prompt = _ALL_ESCAPE_SEQ_PATTERN.sub("", text).strip()
+                    stripped_for_prompt = strip_escapes(text, data, scan).strip()
                     has_primary_prompt = False
                     if stripped_for_prompt.endswith("$") or stripped_for_prompt.endswith("#"):
                         prompt_part = stripped_for_prompt[:-1].strip()
@@ -1894,6 +2263,7 @@ class HighlightedTerminalProxy:
             # They are used internally for interactive detection and can cause
             # subtle cursor/render artifacts during rapid input (e.g., paste).
             if b"\x00" in data:
+                scan = scan.drop(data)
                 data = data.replace(b"\x00", b"")
                 text = text.replace("\x00", "")
 
@@ -1909,18 +2279,15 @@ class HighlightedTerminalProxy:
                         return
 
             # Get rules
-            rules = None
-            with self._highlighter._lock:
-                context = self._highlighter._proxy_contexts.get(self._proxy_id, "")
-                rules = self._highlighter._get_active_rules(context)
+            rules = state.rules
 
             # Check for shell prompt detection
-            self._check_and_update_prompt_state(text)
+            self._check_and_update_prompt_state(text, data, scan)
 
             # Shell input highlighting
             if (
                 self._at_shell_prompt
-                and self._shell_input_highlighter.enabled
+                and state.shell_input_enabled
                 and chunk_is_likely_user_input
                 and not self._suppress_shell_input_highlighting
             ):
@@ -1928,7 +2295,9 @@ class HighlightedTerminalProxy:
                 # readline redraws the prompt/line (tab completion) and output
                 # arrives slightly earlier/later than echoed keystrokes.
                 self._flush_queue(term)
-                highlighted_data = self._apply_shell_input_highlighting(text, term)
+                highlighted_data = self._apply_shell_input_highlighting(
+                    text, term, data, scan
+                )
                 if highlighted_data is not None:
                     return
 
@@ -1949,7 +2318,7 @@ class HighlightedTerminalProxy:
                         # Check for unclosed blocks (if/then without fi, for/do without done, etc.)
                         is_in_unclosed_block = self._is_in_unclosed_multiline_block(self._input_highlight_buffer)
 
-                        stripped_text = _ALL_ESCAPE_SEQ_PATTERN.sub("", text)
+                        stripped_text = strip_escapes(text, data, scan)
                         has_continuation_prompt = (
                             stripped_text.strip() == ">"
                             or stripped_text.strip().endswith(">")
@@ -1970,12 +2339,12 @@ class HighlightedTerminalProxy:
                     else:
                         # Empty buffer with newline (e.g., command from history via ↑)
                         # Check if we have a context (manager.py detects command from terminal line)
-                        # Re-obtain context and rules as they may have been set since line 1753
-                        # due to async GTK event processing
-                        with self._highlighter._lock:
-                            context = self._highlighter._proxy_contexts.get(self._proxy_id, "")
-                            if context:
-                                rules = self._highlighter._get_active_rules(context)
+                        # Re-read the state: the context may have been set
+                        # meanwhile due to async GTK event processing
+                        state = self._state
+                        context = state.context
+                        if context:
+                            rules = state.rules
 
                         if context and rules:
                             # We have a context and rules - command likely from history
@@ -1995,62 +2364,332 @@ class HighlightedTerminalProxy:
                     return
 
             # If no rules OR output highlighting is disabled, feed raw
-            output_enabled = self._highlighter.is_enabled_for_type(self._terminal_type)
-            if not rules or not output_enabled:
+            if not rules or not state.output_enabled:
                 self._flush_queue(term)
                 term.feed(data)
                 return
 
             # Highlighting Logic
-            lines = text.splitlines(keepends=True)
-            highlight_line = self._highlighter._apply_highlighting_to_line
             # Use simple skip-first logic like the original implementation
-            skip_first = self._highlighter.should_skip_first_output(self._proxy_id)
+            skip_first = self._consume_skip_first()
+
+            # Large chunks go to the worker pipeline. Once a job is in flight,
+            # every following chunk goes through it too to keep strict ordering.
+            use_worker = state.worker_enabled and len(data) >= state.worker_min_bytes
+            if use_worker or self._pending_outputs:
+                self._submit_highlight_job(
+                    term,
+                    rules,
+                    skip_first,
+                    data,
+                    inline=not use_worker,
+                    scan=scan,
+                )
+                return
 
-            for i, line in enumerate(lines):
-                if skip_first and i == 0:
-                    self._enqueue_line_chunk(
-                        term, line.encode("utf-8", errors="replace")
-                    )
-                    continue
+            started = time.perf_counter()
+            chunks, lines = self._highlight_output(
+                data, rules, skip_first, scan, text
+            )
+            self._governor.record_cost(time.perf_counter() - started, lines)
+            if self._telemetry is not None:
+                self._telemetry.lines_highlighted += lines
+            for chunk in chunks:
+                self._enqueue_line_chunk(term, chunk)
+            self._record_queue_depth()
 
-                if not line or line in ("\n", "\r", "\r\n"):
-                    self._enqueue_line_chunk(term, line.encode("utf-8"))
-                    continue
+            if not self._queue_processing:
+                self._queue_processing = True
+                self._process_line_queue(term)
 
-                if "\x1b]7;" in line or "\033]7;" in line:
-                    self._enqueue_line_chunk(
-                        term, line.encode("utf-8", errors="replace")
-                    )
-                    # Termprop handler already manages prompt state for OSC7
-                    continue
+        except Exception:
+            if self._telemetry is not None:
+                self._telemetry.record_fallback("error")
+            self._flush_queue(term)
+            term.feed(data)
 
-                if line[-1] == "\n":
-                    if len(line) > 1 and line[-2] == "\r":
-                        content, ending = line[:-2], "\r\n"
-                    else:
-                        content, ending = line[:-1], "\n"
-                elif line[-1] == "\r":
-                    content, ending = line[:-1], "\r"
-                else:
-                    content, ending = line, ""
+    def _highlight_output(
+        self,
+        data: bytes,
+        rules: "RuleSet",
+        skip_first: bool,
+        scan: Optional[EscapeScan] = None,
+        text: Optional[str] = None,
+    ) -> Tuple[List[Union[bytes, memoryview]], int]:
+        """
+        Highlight a raw output chunk.
+
+        Line boundaries are found on the bytes. When the rule set has a byte
+        gate, only the lines it hits are decoded and highlighted; runs of
+        lines no rule can match are passed through as memoryview slices of
+        ``data`` (or ``data`` itself when nothing is hit), skipping decode,
+        highlight and encode. The whole chunk is decoded instead when there
+        is no gate or it hits most lines.
+
+        Touches no proxy state, so it is safe to run on a worker thread.
 
-                if content:
-                    highlighted = highlight_line(content, rules) + ending
+        Args:
+            data: Raw output chunk.
+            rules: Compiled rules for the active context.
+            skip_first: Leave the first line (command echo) untouched.
+            scan: Escape scan of ``data``; computed here when not given.
+            text: ``data`` already decoded, if the caller has it.
+
+        Returns:
+            Chunks to feed to VTE in order, and the number of lines.
+        """
+        size = len(data)
+        lines = data.count(b"\n") + (not data.endswith(b"\n"))
+        if scan is None:
+            scan = scan_escapes(data)
+        gate = rules.byte_gate
+        runs = (
+            gate.scan(data, lines // _BYTE_GATE_MAX_HIT_DIVISOR)
+            if gate is not None
+            else None
+        )
+        if runs is None:
+            # No gate, or most lines need highlighting: decode the chunk once
+            if text is None:
+                text = data.decode("utf-8", errors="replace")
+            escapes = DecodedEscapes(scan, data) if scan.has_color else None
+            return self._highlight_chunks(text, rules, skip_first, escapes), lines
+        if not runs:
+            return [data], lines
+
+        chunks: List[Union[bytes, memoryview]] = []
+        view = memoryview(data)
+        pos = 0
+        for start, end in runs:
+            if start > pos:
+                chunks.append(view[pos:start])
+            run = data[start:end]
+            escapes = None
+            if scan.has_color_between(start, end):
+                escapes = DecodedEscapes(scan.slice(start, end), run)
+            chunks.extend(
+                self._highlight_chunks(
+                    run.decode("utf-8", errors="replace"),
+                    rules,
+                    skip_first and start == 0,
+                    escapes,
+                )
+            )
+            pos = end
+        if pos < size:
+            chunks.append(view[pos:])
+        return chunks, lines
+
+    def _highlight_chunks(
+        self,
+        text: str,
+        rules: "RuleSet",
+        skip_first: bool,
+        escapes: Optional[DecodedEscapes] = None,
+    ) -> List[bytes]:
+        """
+        Highlight decoded output line by line.
+
+        Touches no proxy state, so it is safe to run on a worker thread.
+
+        Args:
+            text: Decoded output chunk.
+            rules: Compiled rules for the active context.
+            skip_first: Leave the first line (command echo) untouched.
+            escapes: Escape scan of ``text``, which tells the lines that are
+                already colored; None when it holds no color SGR.
+
+        Returns:
+            Encoded chunks, one per line, ready to feed to VTE.
+        """
+        chunks: List[bytes] = []
+        highlight_line = self._highlighter._apply_highlighting_to_line
+
+        line_end = 0
+
+        for i, line in enumerate(text.splitlines(keepends=True)):
+            line_start = line_end
+            line_end += len(line)
+            if skip_first and i == 0:
+                chunks.append(line.encode("utf-8", errors="replace"))
+                continue
+
+            if not line or line in ("\n", "\r", "\r\n"):
+                chunks.append(line.encode("utf-8"))
+                continue
+
+            if "\x1b]7;" in line or "\033]7;" in line:
+                # Termprop handler already manages prompt state for OSC7
+                chunks.append(line.encode("utf-8", errors="replace"))
+                continue
+
+            if line[-1] == "\n":
+                if len(line) > 1 and line[-2] == "\r":
+                    content, ending = line[:-2], "\r\n"
                 else:
-                    highlighted = ending
+                    content, ending = line[:-1], "\n"
+            elif line[-1] == "\r":
+                content, ending = line[:-1], "\r"
+            else:
+                content, ending = line, ""
 
-                self._enqueue_line_chunk(
-                    term, highlighted.encode("utf-8", errors="replace")
+            if content:
+                has_color = escapes is not None and escapes.has_color(
+                    line_start, line_start + len(content)
                 )
+                highlighted = highlight_line(content, rules, has_color) + ending
+            else:
+                highlighted = ending
 
-            if not self._queue_processing:
-                self._queue_processing = True
-                self._process_line_queue(term)
+            chunks.append(highlighted.encode("utf-8", errors="replace"))
 
-        except Exception:
+        return chunks
+
+    def _submit_highlight_job(
+        self,
+        term: Vte.Terminal,
+        rules: "RuleSet",
+        skip_first: bool,
+        raw: bytes,
+        inline: bool = False,
+        scan: Optional[EscapeScan] = None,
+    ) -> None:
+        """
+        Queue a chunk on the highlight pipeline.
+
+        The chunk gets a sequence number and is highlighted on the CPU pool
+        (or inline for small chunks that arrive while jobs are in flight).
+        Results are fed to VTE in sequence order by _feed_completed_outputs.
+        When the pipeline backlog is too large the chunk is fed raw instead,
+        mirroring the backpressure policy of _enqueue_line_chunk.
+        """
+        raw_len = len(raw)
+        if (
+            len(self._pending_outputs) >= _MAX_PIPELINE_JOBS
+            or self._pending_output_bytes + raw_len > _MAX_PIPELINE_BYTES
+        ):
+            self.logger.debug(
+                f"Highlight pipeline backlog high ({len(self._pending_outputs)} jobs, "
+                f"{self._pending_output_bytes} bytes). Flushing and switching to raw "
+                f"feed for current chunk."
+            )
+            if self._telemetry is not None:
+                self._telemetry.record_fallback("pipeline_full")
             self._flush_queue(term)
-            term.feed(data)
+            term.feed(raw)
+            return
+
+        # Lines queued by the inline path are older than any pipeline job
+        if self._line_queue:
+            self._flush_queue(term)
+
+        job = partial(
+            self._render_highlight_job, raw, rules, skip_first, scan
+        )
+        future: Optional[Future] = None
+        if not inline:
+            future = AsyncTaskManager.get().submit_cpu(job)
+        if future is None:
+            # Small chunk or worker pool shut down: highlight on this thread
+            future = Future()
+            try:
+                future.set_result(job())
+            except Exception as e:
+                future.set_exception(e)
+
+        with self._output_lock:
+            seq = self._sequence_counter
+            self._sequence_counter += 1
+            self._pending_outputs[seq] = (future, raw)
+            self._pending_output_bytes += raw_len
+        self._record_queue_depth()
+
+        if future.done():
+            self._feed_completed_outputs(term)
+        else:
+            future.add_done_callback(
+                lambda _f: GLib.idle_add(self._feed_completed_outputs, term)
+            )
+
+    def _render_highlight_job(
+        self,
+        data: bytes,
+        rules: "RuleSet",
+        skip_first: bool,
+        scan: Optional[EscapeScan] = None,
+    ) -> Tuple[bytes, float, int]:
+        """
+        Worker entry point: highlight a chunk into a single byte string.
+
+        Returns the output with the time spent and the number of lines
+        highlighted; _feed_completed_outputs accounts them on the main
+        thread, which owns the governor and the telemetry.
+        """
+        started = time.perf_counter()
+        chunks, lines = self._highlight_output(data, rules, skip_first, scan)
+        return b"".join(chunks), time.perf_counter() - started, lines
+
+    def _feed_completed_outputs(self, term: Vte.Terminal, drain: bool = False) -> bool:
+        """
+        Feed finished pipeline jobs to VTE in sequence order.
+
+        Stops at the first job that has not finished yet unless ``drain`` is
+        set, in which case unfinished jobs are cancelled (or abandoned if
+        already running; their late result is dropped) and fed raw so the
+        pipeline is emptied without blocking. Failed jobs fall back to
+        their raw bytes.
+
+        Returns False to remove from idle queue.
+        """
+        if not self._running or self._widget_destroyed:
+            return False
+
+        ready: List[bytes] = []
+        telemetry = self._telemetry
+        while True:
+            with self._output_lock:
+                seq = self._next_sequence_to_feed
+                entry = self._pending_outputs.get(seq)
+            if entry is None:
+                break
+
+            future, raw = entry
+            result = None
+            if future.done():
+                try:
+                    result = future.result()
+                except Exception:
+                    pass
+            elif not drain:
+                break
+            else:
+                future.cancel()
+
+            if result is None:
+                ready.append(raw)
+            else:
+                output, seconds, lines = result
+                self._governor.record_cost(seconds, lines)
+                if telemetry is not None:
+                    telemetry.lines_highlighted += lines
+                ready.append(output)
+
+            with self._output_lock:
+                self._pending_outputs.pop(seq, None)
+                self._pending_output_bytes = max(
+                    0, self._pending_output_bytes - len(raw)
+                )
+                self._next_sequence_to_feed = seq + 1
+
+        if ready:
+            try:
+                frame = b"".join(ready)
+                term.feed(frame)
+                self._record_frame(len(frame))
+            except Exception:
+                self._widget_destroyed = True
+
+        return False
 
     def _reset_input_buffer(self) -> None:
         """Reset shell input highlighting buffer state."""
@@ -2059,19 +2698,26 @@ class HighlightedTerminalProxy:
         self._prev_shell_input_token_type = None
         self._prev_shell_input_token_len = 0
 
-    def _check_and_update_prompt_state(self, text: str) -> bool:
+    def _check_and_update_prompt_state(
+        self, text: str, data: bytes, scan: EscapeScan
+    ) -> bool:
         """
         Check if text contains a shell prompt (primary or continuation).
         Primary prompt detection is handled by termprop-changed signal,
         but we also detect prompts directly for shells without termprop support.
 
+        Args:
+            text: Decoded output chunk.
+            data: The chunk as read from the PTY.
+            scan: Escape scan of ``data``.
+
         Returns True if a prompt was detected.
         """
         # Early exit: if no potential prompt characters, skip expensive processing
         if not any(c in text for c in "$#%>❯"):
             return False
 
-        stripped_text = _ALL_ESCAPE_SEQ_PATTERN.sub("", text).replace("\x00", "")
+        stripped_text = strip_escapes(text, data, scan).replace("\x00", "")
 
         # Check for continuation prompt ("> ")
         stripped_clean = stripped_text.strip()
@@ -2146,7 +2792,7 @@ class HighlightedTerminalProxy:
         return False
 
     def _apply_shell_input_highlighting(
-        self, text: str, term: Vte.Terminal
+        self, text: str, term: Vte.Terminal, data: bytes, scan: EscapeScan
     ) -> Optional[bytes]:
         """
         Apply syntax highlighting to shell input being echoed.
@@ -2157,17 +2803,21 @@ class HighlightedTerminalProxy:
         The approach:
         1. Track characters as they're typed (building a buffer)
         2. For each character echoed, append to buffer
-        3. Re-tokenize the full buffer and apply colors
-        4. Output only the newly typed character with appropriate color
+        3. Re-tokenize the buffer incrementally (only from the last stable
+           token boundary) and apply colors
+        4. Output only the newly typed character with appropriate color,
+           recoloring the current word only when its token type changed
 
         Args:
             text: The echoed text from PTY
             term: The VTE terminal
+            data: The chunk as read from the PTY
+            scan: Escape scan of ``data``
 
         Returns:
             bytes if handled, None if shell input highlighting didn't apply
         """
-        if not self._shell_input_highlighter.enabled:
+        if not self._state.shell_input_enabled:
             return None
 
         # Strip NULL bytes that may be prepended by terminal
@@ -2183,8 +2833,8 @@ class HighlightedTerminalProxy:
         # Handle backspace: reuse unified helper function
         # Patterns: \x08 \x08 (sh/dash), \x08\x1b[K (bash), single \x08 or \x7f
         if "\x08" in text or "\x7f" in text:
-            data = text.encode("utf-8", errors="replace")
-            if self._handle_backspace_in_buffer(data) > 0:
+            encoded = text.encode("utf-8", errors="replace")
+            if self._handle_backspace_in_buffer(encoded) > 0:
                 return None  # Let terminal handle the backspace display
 
         # Don't process chunks that contain escape sequences (like OSC7, colors, etc.)
@@ -2198,7 +2848,7 @@ class HighlightedTerminalProxy:
                 is_in_unclosed_block = self._is_in_unclosed_multiline_block(self._input_highlight_buffer)
 
                 # Also check if this chunk contains a continuation prompt ("> ")
-                stripped_text = _ALL_ESCAPE_SEQ_PATTERN.sub("", text)
+                stripped_text = strip_escapes(text, data, scan).lstrip("\x00")
                 has_continuation_prompt = (
                     stripped_text.strip() == ">" or stripped_text.strip().endswith(">")
                 )
@@ -2263,22 +2913,16 @@ class HighlightedTerminalProxy:
 
         # Get highlighted version of the current buffer
         try:
-            from pygments import lex
-            from pygments.lexers import BashLexer
-
             # Always use lexer/formatter from the global singleton
             # This ensures theme changes are applied immediately
             highlighter = self._shell_input_highlighter
-            lexer = highlighter._lexer
             formatter = highlighter._formatter
 
-            # Fallback if singleton not initialized
-            if lexer is None:
-                lexer = BashLexer()
-
-            # Tokenize to find the color of the last character
-            # We use lex() to get token types and then map to colors
-            tokens = list(lex(self._input_highlight_buffer, lexer))
+            # Tokenize to find the color of the last character. Lexer state
+            # is kept per proxy, so only the tail of the buffer is re-lexed.
+            tokens = highlighter.tokenize_buffer(
+                self._proxy_id, self._input_highlight_buffer
+            )
 
             if not tokens:
                 # No tokens, just output the raw text
@@ -2464,9 +3108,9 @@ class HighlightedTerminalProxy:
         Process multiple lines from queue per callback for efficiency.
 
         This is the SINGLE consumer for the line queue. It processes
-        a batch of lines per callback, balancing responsiveness with efficiency.
+        up to _MAX_FEED_BYTES_PER_FRAME bytes per callback as a single feed.
 
-        Uses deque.popleft() for O(1) performance.
+        Each frame is taken from the ring buffer as one contiguous read.
 
         Returns False to remove from idle queue.
         """
@@ -2476,33 +3120,21 @@ class HighlightedTerminalProxy:
 
         try:
             if self._line_queue:
-                # Process up to 10 lines per callback for efficiency
-                # This reduces GTK overhead while maintaining responsiveness
-                lines_to_feed = []
-                for _ in range(10):
-                    if self._line_queue:
-                        chunk = self._line_queue.popleft()
-                        self._line_queue_bytes -= len(chunk)
-                        lines_to_feed.append(chunk)
-                    else:
-                        break
-
-                # Feed all lines in one batch
-                if lines_to_feed:
-                    term.feed(b"".join(lines_to_feed))
+                # Feed queued lines as one frame per callback, bounded by a
+                # byte budget so a single frame stays responsive
+                frame = self._line_queue.read(_MAX_FEED_BYTES_PER_FRAME)
+                term.feed(frame)
+                self._record_frame(len(frame))
 
                 # Schedule next batch if queue not empty
                 if self._line_queue:
                     GLib.idle_add(self._process_line_queue, term)
                 else:
                     self._queue_processing = False
-                    self._line_queue_bytes = 0
             else:
                 self._queue_processing = False
-                self._line_queue_bytes = 0
 
         except Exception:
             self._queue_processing = False
-            self._line_queue_bytes = 0
 
         return False  # Remove this callback
@@ -0,0 +1,68 @@
+# zashterminal/terminal/highlighter/binary.py
+"""
+Text/binary classification of PTY output chunks.
+
+Highlighting decodes output as UTF-8 with replacement characters and feeds
+the re-encoded result, so a chunk that is not UTF-8 (Latin-1 logs, a binary
+file sent to the terminal) would reach VTE changed, and binary data would
+also pay the full rule cost for nothing. decode_output() singles out such
+chunks so the proxy can feed them byte for byte instead. A read can also end
+in the middle of a character; incomplete_utf8_tail() finds those bytes so
+they are carried over to the next read rather than taken for invalid UTF-8.
+"""
+
+from typing import Optional
+
+# C0 controls that occur in ordinary terminal text: NUL (the proxy's own
+# input marker), BEL, BS, TAB, LF, VT, FF, CR, SO, SI and ESC
+_TEXT_CONTROLS = frozenset(b"\x00\x07\x08\t\n\x0b\x0c\r\x0e\x0f\x1b")
+# Every other C0 control; deleted with bytes.translate() to count them
+_BINARY_CONTROLS = bytes(b for b in range(0x20) if b not in _TEXT_CONTROLS)
+# A chunk is binary once more than 1 in this many bytes is such a control
+_BINARY_CONTROL_RATIO = 32
+
+
+def incomplete_utf8_tail(data: bytes) -> int:
+    """
+    Length of a UTF-8 character cut off by the end of a read.
+
+    Returns:
+        The number of trailing bytes (at most 3) that start a multibyte
+        character without completing it, or 0.
+    """
+    for back in range(1, min(3, len(data)) + 1):
+        byte = data[-back]
+        if byte < 0x80:
+            return 0
+        if byte >= 0xC0:
+            # Lead byte: the sequence length is given by its high bits
+            length = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return back if back < length else 0
+        # Continuation byte: keep looking for the lead byte
+    return 0
+
+
+def decode_output(data: bytes) -> Optional[str]:
+    """
+    Decode a PTY output chunk for highlighting.
+
+    Args:
+        data: Raw output chunk.
+
+    Returns:
+        The decoded text, or None if the chunk should be fed untouched:
+        it has a high share of control bytes text never contains, or it
+        is not valid UTF-8. Callers strip a character split by the end of
+        the read first (see incomplete_utf8_tail()), as decoding it would
+        count it as invalid.
+    """
+    size = len(data)
+    controls = size - len(data.translate(None, _BINARY_CONTROLS))
+    if controls and controls * _BINARY_CONTROL_RATIO > size:
+        return None
+    if data.isascii():
+        return data.decode("ascii")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
@@ -0,0 +1,413 @@
+# zashterminal/terminal/highlighter/cat_stream.py
+"""
+Streaming Pygments colorizer for cat output.
+
+Cat output used to be highlighted one line at a time on the GTK main loop,
+with ad-hoc state for constructs spanning lines (PHP block comments) and a
+fixed 1 MB cap. StreamingCatColorizer drives one lexer over the whole file
+instead: every batch of lines continues from where the previous batch left
+off (lexer state stack plus a short look-ahead), so strings, comments and
+heredocs that span chunks keep their color.
+
+Batches run serially on the CPU worker pool; results are handed back as
+futures so the proxy can feed them to VTE in order. How much output gets
+colorized is bounded by CatByteBudget, a byte rate rather than a byte count.
+"""
+
+import io
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Iterator, List, Optional, Tuple
+
+from ...core.tasks import AsyncTaskManager
+from .pygments_cache import get_lexer_for_shebang
+from .regex_lexing import lex_steps, supports_lex_steps
+
+# Seconds of budget a cat run may use up front (covers files that are
+# written to the PTY all at once)
+_BURST_SECONDS = 2.0
+
+# Lines held back at the end of a batch and lexed again with the next one
+_LOOKAHEAD_LINES = 64
+# Lines of context lexed before a batch by lexers that cannot be resumed
+_LEAD_IN_LINES = 64
+# Held lines after which a window is cut even without a token boundary
+_MAX_HELD_LINES = 4096
+# Lines of content needed before guess_lexer is tried / detection gives up
+_GUESS_MIN_LINES = 3
+_GUESS_MAX_LINES = 10
+
+# (offset into the lexed text, state stack there)
+_Checkpoint = Tuple[int, List[str]]
+
+
+def detect_cat_lexer(lines: List[str]):
+    """
+    Detect the lexer of a file without a known extension from its content.
+
+    Args:
+        lines: First non-empty lines of the file, stripped.
+
+    Returns:
+        A lexer when one was detected, a TextLexer once enough lines were
+        seen without a match, or None while undecided.
+    """
+    from pygments.lexers import TextLexer, guess_lexer
+
+    if not lines:
+        return None
+
+    lexer = get_lexer_for_shebang(lines[0])
+    if lexer is not None:
+        return lexer
+
+    if len(lines) >= _GUESS_MIN_LINES:
+        try:
+            guessed = guess_lexer("\n".join(lines))
+            if not isinstance(guessed, TextLexer):
+                return guessed
+        except Exception:
+            pass
+
+    if len(lines) >= _GUESS_MAX_LINES:
+        return TextLexer()
+    return None
+
+
+class CatByteBudget:
+    """
+    Token bucket bounding the rate at which cat output is colorized.
+
+    The bucket refills at the budget rate and holds up to _BURST_SECONDS of
+    it, so a file written at once is colorized up to that size and longer
+    streams as long as they arrive no faster than the budget.
+    """
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_last")
+
+    def __init__(self, mb_per_sec: float):
+        """
+        Args:
+            mb_per_sec: Budget in MB/s; zero or less disables the limit.
+        """
+        self._rate = mb_per_sec * 1024 * 1024
+        self._capacity = self._rate * _BURST_SECONDS
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+
+    def admit(self, nbytes: int) -> bool:
+        """Consume budget for a chunk; False if the budget is exhausted."""
+        if self._rate <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last) * self._rate
+        )
+        self._last = now
+        if nbytes > self._tokens:
+            return False
+        self._tokens -= nbytes
+        return True
+
+
+class StreamingCatColorizer:
+    """
+    Colorizes the lines of one file, batch after batch, with one lexer.
+
+    Two things keep colors right across batch boundaries:
+
+    - Look-ahead: the last _LOOKAHEAD_LINES lines of a batch are held back
+      and lexed again with the next batch. Many lexers match multi-line
+      comments and strings with a single regex, which fails when the text
+      ends inside the token.
+    - State: for plain RegexLexer subclasses, lexing resumes from the state
+      stack at the first held line, so constructs of any length carry
+      over. Other lexers are restarted in their initial state with the
+      last _LEAD_IN_LINES emitted lines as context.
+
+    Held lines are emitted by the next batch, or by a flush when the output
+    ends or pauses.
+
+    Batches go through submit(), which runs them serially (inline or on the
+    CPU pool); the lexing methods themselves are not thread-safe.
+    """
+
+    def __init__(self, lexer, formatter):
+        from pygments.lexer import ExtendedRegexLexer, RegexLexer
+
+        self._lexer = lexer
+        self._formatter = formatter
+        # ExtendedRegexLexer keeps extra state in its LexerContext (Ruby
+        # heredocs), so only plain RegexLexers are resumed mid-stream
+        self._resumable = supports_lex_steps(lexer) and not isinstance(
+            lexer, ExtendedRegexLexer
+        )
+        # Lexers overriding get_tokens_unprocessed() post-process tokens
+        # (C types, PHP builtins); their own tokens are used whenever a
+        # batch starts in the initial state
+        self._postprocessed = (
+            self._resumable
+            and type(lexer).get_tokens_unprocessed
+            is not RegexLexer.get_tokens_unprocessed
+        )
+        # PhpLexer(startinline=True) starts inside PHP code
+        self._initial_stack = (
+            ["root", "php"] if getattr(lexer, "startinline", False) else ["root"]
+        )
+        self._stack: List[str] = list(self._initial_stack)
+        self._held: List[Tuple[str, str]] = []
+        self._context: List[str] = []
+
+        self._jobs: Deque[Tuple[List[Tuple[str, str]], bool, Future]] = deque()
+        self._jobs_lock = threading.Lock()
+        self._draining = False
+        self._closed = False
+
+    @property
+    def lexer(self):
+        return self._lexer
+
+    def close(self) -> None:
+        """Stop lexing; batches still queued complete uncolored."""
+        self._closed = True
+
+    def submit(
+        self,
+        lines: List[Tuple[str, str]],
+        flush: bool = False,
+        background: bool = True,
+    ) -> Future:
+        """
+        Queue a batch of lines for colorizing.
+
+        Args:
+            lines: (content, line ending) pairs.
+            flush: Emit every held line (end of output or output paused).
+            background: Run on the CPU pool. Otherwise the batch is lexed on
+                the calling thread, unless earlier batches are still queued
+                on the pool, in which case it is queued behind them.
+
+        Returns:
+            Future resolving to the encoded output ready to feed to VTE.
+            It may cover lines of earlier batches and omit held lines.
+        """
+        future: Future = Future()
+        with self._jobs_lock:
+            self._jobs.append((lines, flush, future))
+            start = not self._draining
+            if start:
+                self._draining = True
+        if start and (
+            not background or AsyncTaskManager.get().submit_cpu(self._drain) is None
+        ):
+            self._drain()
+        return future
+
+    def _drain(self) -> None:
+        """Colorize queued batches in order until the queue is empty."""
+        while True:
+            with self._jobs_lock:
+                if not self._jobs:
+                    self._draining = False
+                    return
+                lines, flush, future = self._jobs.popleft()
+            if not self._closed:
+                try:
+                    future.set_result(self.colorize(lines, flush))
+                    continue
+                except Exception:
+                    pass
+            # Closed, or the lexer failed: pass the text through uncolored
+            future.set_result(_encode(self._held + lines))
+            self._held = []
+            self._stack = list(self._initial_stack)
+
+    def colorize(self, lines: List[Tuple[str, str]], flush: bool = False) -> bytes:
+        """
+        Colorize a batch of lines, continuing from the previous batch.
+
+        Args:
+            lines: (content, line ending) pairs. The last line may be
+                incomplete; lexing simply continues with the next batch.
+            flush: Emit every held line instead of keeping a look-ahead.
+                Lexing still continues from the end of the text.
+
+        Returns:
+            Encoded output of the lines that are no longer held.
+        """
+        window = self._held + lines
+        if not window:
+            return b""
+        hold = 0 if flush else min(_LOOKAHEAD_LINES, len(window))
+        if hold == len(window):
+            self._held = window
+            return b""
+        contents = [content for content, _ in window]
+        emit = len(window) - hold
+
+        if self._resumable:
+            colored, emit = self._colorize_resumed(contents, emit, flush)
+        else:
+            colored, emit = self._colorize_restarted(contents, emit)
+
+        self._held = window[emit:]
+        if colored is None:
+            return _encode(window[:emit])
+        return "".join(
+            highlighted + ending
+            for highlighted, (_, ending) in zip(colored, window[:emit])
+        ).encode("utf-8", errors="replace")
+
+    def _format(self, tokens, count: int) -> Optional[List[str]]:
+        """Format the tokens of count newline-terminated lines into lines."""
+        out = io.StringIO()
+        self._formatter.format(tokens, out)
+        colored = out.getvalue().split("\n")
+        # Lines plus the empty piece after the final newline
+        if len(colored) != count + 1:
+            return None
+        return colored
+
+    def _prepare(self, contents: List[str]) -> str:
+        text = "\n".join(contents) + "\n"
+        if self._lexer.tabsize > 0:
+            text = text.expandtabs(self._lexer.tabsize)
+        return text
+
+    def _lex(self, text: str) -> Iterator[Tuple[Any, str]]:
+        """
+        Tokenize text with the lexer's own entry point.
+
+        Tokens are trimmed to cover the text exactly once: some lexers
+        repeat text of constructs left open at the end (Ruby heredocs),
+        which would shift every following line.
+        """
+        from pygments.token import Text
+
+        position = 0
+        for index, token_type, value in self._lexer.get_tokens_unprocessed(text):
+            if index < position:
+                value = value[position - index :]
+                if not value:
+                    continue
+                index = position
+            elif index > position:
+                yield Text, text[position:index]
+            yield token_type, value
+            position = index + len(value)
+        if position < len(text):
+            yield Text, text[position:]
+
+    def _colorize_restarted(
+        self, contents: List[str], emit: int
+    ) -> Tuple[Optional[List[str]], int]:
+        """
+        Lex the window from the initial state, after the lead-in lines.
+
+        The lead-in starts after its first blank line, if any: the lexer is
+        far more likely to be at the top level there.
+
+        Returns:
+            Colorized emitted lines (None if formatting failed) and their
+            number.
+        """
+        context = self._context
+        for index, line in enumerate(context):
+            if not line.strip():
+                context = context[index + 1 :]
+                break
+        colored = self._format(
+            self._lex(self._prepare(context + contents)), len(context) + len(contents)
+        )
+        self._context = (self._context + contents[:emit])[-_LEAD_IN_LINES:]
+        if colored is None:
+            return None, emit
+        return colored[len(context) : len(context) + emit], emit
+
+    def _colorize_resumed(
+        self, contents: List[str], emit: int, flush: bool
+    ) -> Tuple[Optional[List[str]], int]:
+        """
+        Lex the window from the saved state stack.
+
+        The window is cut at the last line start before the look-ahead
+        where the lexer was between tokens; the lines after it are held and
+        the state stack there is where the next batch resumes.
+
+        Returns:
+            Colorized emitted lines (None if formatting failed) and their
+            number.
+        """
+        text = self._prepare(contents)
+        mark = 0
+        for _ in range(emit):
+            mark = text.index("\n", mark) + 1
+        starts_initial = self._stack == self._initial_stack
+        tokens, checkpoints = self._lex_regex(text, mark)
+
+        if flush:
+            position, stack = checkpoints[0]
+            if position != len(text):
+                stack = list(self._initial_stack)
+            self._stack = stack
+        else:
+            # Prefer cutting where the lexer is back in its initial state,
+            # so post-processing lexers can use their own tokens next time
+            position, stack = checkpoints[0]
+            if self._postprocessed and checkpoints[1][0]:
+                position, stack = checkpoints[1]
+            if position:
+                emit = text.count("\n", 0, position)
+                self._stack = stack
+            elif len(contents) < _MAX_HELD_LINES:
+                # One token spans the whole window; wait for more text
+                return None, 0
+            else:
+                self._stack = list(self._initial_stack)
+
+        if self._postprocessed and starts_initial:
+            tokens = self._lex(text)
+        colored = self._format(tokens, len(contents))
+        if colored is None:
+            return None, emit
+        return colored[:emit], emit
+
+    def _lex_regex(
+        self, text: str, mark: int
+    ) -> Tuple[List[Tuple[Any, str]], List[_Checkpoint]]:
+        """
+        Lex text starting from the saved state stack.
+
+        Returns:
+            The tokens and two checkpoints: the last line start at or before
+            mark where the lexer was between tokens, and the last one where
+            it was also in its initial state. A checkpoint is (offset, state
+            stack); offset 0 means none was found.
+        """
+        tokens: List[Tuple[Any, str]] = []
+        append = tokens.append
+        initial = self._initial_stack
+        checkpoints: List[_Checkpoint] = [(0, []), (0, [])]
+
+        for position, statestack, step in lex_steps(self._lexer, text, 0, self._stack):
+            for _, token_type, value in step:
+                append((token_type, value))
+            if (
+                position <= mark
+                and position != checkpoints[0][0]
+                and text[position - 1] == "\n"
+            ):
+                checkpoints[0] = (position, list(statestack))
+                if statestack == initial:
+                    checkpoints[1] = checkpoints[0]
+
+        return tokens, checkpoints
+
+
+def _encode(lines: List[Tuple[str, str]]) -> bytes:
+    """Encode lines without colorizing them."""
+    return "".join(content + ending for content, ending in lines).encode(
+        "utf-8", errors="replace"
+    )
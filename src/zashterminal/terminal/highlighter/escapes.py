@@ -0,0 +1,443 @@
+# zashterminal/terminal/highlighter/escapes.py
+"""
+Single-pass escape-sequence tokenizer for PTY output chunks.
+
+The proxy used to scan every chunk several times: once for an incomplete
+trailing escape, once per alt-screen sequence, and again per line for SGR
+colors, bracketed paste, OSC 7 and readline redraw sequences. scan_escapes()
+walks the chunk once and returns an EscapeScan span table that all of those
+stages read instead.
+
+Offsets are byte offsets into the scanned chunk. Chunks without ESC take a
+fast path that only records a single text span.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+# Span kinds
+TEXT = 0
+SGR = 1  # CSI ... m
+CSI = 2  # Any other CSI sequence
+OSC = 3  # OSC terminated by BEL or ST
+ESC = 4  # Other escape sequences (charset selection, keypad modes, ...)
+
+# (kind, start, end)
+Span = Tuple[int, int, int]
+
+_ESCAPE_PATTERN = re.compile(
+    rb"\x1b(?:"
+    rb"\[([\x30-\x3f]*)[\x20-\x2f]*([\x40-\x7e])"  # CSI: params, final byte
+    rb"|\](\d*)(?:[^\x07\x1b]|\x1b(?!\\))*(?:\x07|\x1b\\)"  # OSC: code, BEL/ST
+    rb"|[\x28\x29][\x20-\x7e]"  # G0/G1 charset
+    rb"|[\x20-\x2f]*[\x30-\x5a\x5c\x5e-\x7e]"  # Two-byte and nF sequences
+    rb")"
+)
+
+# An unterminated sequence at the very end of a chunk
+_INCOMPLETE_TAIL_PATTERN = re.compile(
+    rb"\x1b(?:\[[\x20-\x3f]*|\][^\x07]*|[\x20-\x2f]+)?\Z"
+)
+
+# SGR parameters that set a foreground/background color; the parameter
+# part of ANSI_COLOR_PATTERN, so both agree on which lines are colored
+_COLOR_PARAM_PATTERN = re.compile(
+    rb"(?:[0-9;]*;)?"
+    rb"(?:3[0-79]|4[0-79]|9[0-7]|10[0-7]"
+    rb"|38;5;\d+|48;5;\d+|38;2;\d+;\d+;\d+|48;2;\d+;\d+;\d+)"
+    rb"[;0-9]*"
+)
+
+_ALT_SCREEN_PARAMS = frozenset((b"?1049", b"?47", b"?1047"))
+
+# CSI final bytes readline uses when redrawing the command line: cursor
+# up/down/left/right, cursor column, cursor home, erase line/screen,
+# delete/insert chars
+_REDRAW_FINALS = frozenset(b"ABCDGHJKP@")
+
+
+@dataclass(slots=True)
+class EscapeScan:
+    """
+    Span table of one PTY chunk.
+
+    Every sequence the stages look for is recorded by offset, so the table
+    can follow the chunk when it is trimmed or joined (slice(), drop(),
+    join_scans()) instead of being rebuilt.
+
+    Attributes:
+        length: Length of the scanned chunk.
+        spans: (kind, start, end) spans covering the chunk in order. Text
+            runs between sequences are TEXT spans.
+        incomplete_tail: Offset of an unterminated escape sequence at the
+            end of the chunk, or -1.
+        alt_screen_toggles: (offset, enabled) for every alternate screen
+            enable/disable sequence, in order.
+        color_offsets: Offsets of SGR sequences that set a color.
+        redraw_offsets: Offsets of readline redraw sequences (cursor
+            movement, erase, insert/delete, cursor show/hide).
+        paste_starts: Offsets of ESC[200~ (bracketed paste start).
+        paste_ends: Offsets of ESC[201~ (bracketed paste end).
+        osc_offsets: (offset, numeric code) of OSC sequences with a code.
+    """
+
+    length: int
+    spans: List[Span] = field(default_factory=list)
+    incomplete_tail: int = -1
+    alt_screen_toggles: List[Tuple[int, bool]] = field(default_factory=list)
+    color_offsets: List[int] = field(default_factory=list)
+    redraw_offsets: List[int] = field(default_factory=list)
+    paste_starts: List[int] = field(default_factory=list)
+    paste_ends: List[int] = field(default_factory=list)
+    osc_offsets: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def has_escapes(self) -> bool:
+        """Whether the chunk contains any complete sequence."""
+        spans = self.spans
+        return len(spans) > 1 or (bool(spans) and spans[0][0] != TEXT)
+
+    @property
+    def has_color(self) -> bool:
+        """Whether any SGR sequence sets a color."""
+        return bool(self.color_offsets)
+
+    @property
+    def has_redraw(self) -> bool:
+        """Whether any CSI sequence is a readline redraw."""
+        return bool(self.redraw_offsets)
+
+    @property
+    def bracketed_paste_start(self) -> int:
+        """Offset of the first ESC[200~, or -1."""
+        return self.paste_starts[0] if self.paste_starts else -1
+
+    @property
+    def bracketed_paste_end(self) -> int:
+        """Offset of the last ESC[201~, or -1."""
+        return self.paste_ends[-1] if self.paste_ends else -1
+
+    @property
+    def alt_screen(self) -> Optional[bool]:
+        """Alternate screen state after the chunk, or None if not toggled."""
+        if not self.alt_screen_toggles:
+            return None
+        return self.alt_screen_toggles[-1][1]
+
+    def has_osc(self, code: int) -> bool:
+        """Whether the chunk contains an OSC sequence with the given code."""
+        return any(osc_code == code for _offset, osc_code in self.osc_offsets)
+
+    def has_escape_after(self, offset: int) -> bool:
+        """Whether an escape sequence starts at or after the offset."""
+        for kind, start, _end in reversed(self.spans):
+            if start < offset:
+                return False
+            if kind != TEXT:
+                return True
+        return False
+
+    def has_color_between(self, start: int, end: int) -> bool:
+        """Whether a color SGR sequence starts within [start, end)."""
+        offsets = self.color_offsets
+        index = bisect_left(offsets, start)
+        return index < len(offsets) and offsets[index] < end
+
+    def slice(self, start: int, end: int) -> "EscapeScan":
+        """
+        Return the scan of data[start:end], as scan_escapes() would.
+
+        The bytes of a sequence cut by start no longer form a sequence and
+        become text; a sequence cut by end becomes the incomplete tail.
+        """
+        limit = end
+        for kind, span_start, span_end in self.spans:
+            if kind != TEXT and start <= span_start < end < span_end:
+                limit = span_start
+                break
+        if start <= self.incomplete_tail < limit:
+            limit = self.incomplete_tail
+        sliced = self._remap(
+            lambda offset: offset - start,
+            lambda offset: start <= offset < limit,
+            end - start,
+        )
+        spans = sliced.spans
+        for kind, span_start, span_end in self.spans:
+            if span_end <= start:
+                continue
+            if span_start >= limit:
+                break
+            if span_start < start:
+                kind = TEXT
+            clipped_start = max(span_start, start) - start
+            clipped_end = min(span_end, limit) - start
+            if clipped_end > clipped_start:
+                _append_span(spans, kind, clipped_start, clipped_end)
+        if limit < end:
+            sliced.incomplete_tail = limit - start
+        return sliced
+
+    def drop(self, data: bytes, byte: bytes = b"\x00") -> "EscapeScan":
+        """
+        Return the scan of data with every occurrence of a byte removed.
+
+        Args:
+            data: The scanned chunk.
+            byte: Single byte to remove (NUL markers by default).
+        """
+        positions = []
+        position = data.find(byte)
+        while position != -1:
+            positions.append(position)
+            position = data.find(byte, position + 1)
+        if not positions:
+            return self
+
+        def shift(offset: int) -> int:
+            return offset - bisect_left(positions, offset)
+
+        dropped = self._remap(shift, lambda _offset: True, self.length - len(positions))
+        spans = dropped.spans
+        for kind, start, end in self.spans:
+            start, end = shift(start), shift(end)
+            if end > start:
+                _append_span(spans, kind, start, end)
+        if self.incomplete_tail >= 0:
+            dropped.incomplete_tail = shift(self.incomplete_tail)
+        return dropped
+
+    def _remap(
+        self,
+        shift: Callable[[int], int],
+        keep: Callable[[int], bool],
+        length: int,
+    ) -> "EscapeScan":
+        """Copy the sequence offsets that pass keep, moved by shift."""
+        return EscapeScan(
+            length,
+            alt_screen_toggles=[
+                (shift(offset), enabled)
+                for offset, enabled in self.alt_screen_toggles
+                if keep(offset)
+            ],
+            color_offsets=[shift(o) for o in self.color_offsets if keep(o)],
+            redraw_offsets=[shift(o) for o in self.redraw_offsets if keep(o)],
+            paste_starts=[shift(o) for o in self.paste_starts if keep(o)],
+            paste_ends=[shift(o) for o in self.paste_ends if keep(o)],
+            osc_offsets=[
+                (shift(offset), code)
+                for offset, code in self.osc_offsets
+                if keep(offset)
+            ],
+        )
+
+
+def _char_offsets(data: bytes, offsets: List[int]) -> List[int]:
+    """
+    Map sorted byte offsets to offsets into data decoded.
+
+    The offsets must fall on character boundaries, as sequence starts do.
+    """
+    result = []
+    chars = 0
+    previous = 0
+    for offset in offsets:
+        chars += len(data[previous:offset].decode("utf-8", errors="replace"))
+        result.append(chars)
+        previous = offset
+    return result
+
+
+class DecodedEscapes:
+    """
+    Escape scan of a chunk in offsets of its decoded text.
+
+    Stages that work on decoded lines answer their per-line questions from
+    it instead of matching escape patterns against every line. Escape
+    sequences are ASCII, so ASCII chunks use the scan offsets as they are.
+    """
+
+    __slots__ = ("_colors", "_data", "_scan", "_spans", "_starts")
+
+    def __init__(self, scan: EscapeScan, data: bytes):
+        self._scan = scan
+        self._data = data
+        if data.isascii():
+            self._colors = scan.color_offsets
+        else:
+            self._colors = _char_offsets(data, scan.color_offsets)
+        # Mapped on first use; the color check does not need them
+        self._spans: Optional[List[Span]] = None
+        self._starts: List[int] = []
+
+    def has_color(self, start: int, end: int) -> bool:
+        """Whether a color SGR sequence starts within text[start:end]."""
+        colors = self._colors
+        index = bisect_left(colors, start)
+        return index < len(colors) and colors[index] < end
+
+    def is_control_only(self, text: str, start: int, end: int) -> bool:
+        """
+        Whether text[start:end] holds nothing but CSI control sequences
+        (SGR excluded), carriage returns and whitespace.
+        """
+        spans = self._spans
+        if spans is None:
+            spans = self._map_spans()
+        index = max(bisect_right(self._starts, start) - 1, 0)
+        count = len(spans)
+        while index < count:
+            kind, span_start, span_end = spans[index]
+            if span_start >= end:
+                break
+            index += 1
+            if kind == CSI:
+                continue
+            if kind != TEXT:
+                return False
+            piece = text[max(span_start, start) : min(span_end, end)]
+            if piece.replace("\r", "").strip():
+                return False
+        return True
+
+    def _map_spans(self) -> List[Span]:
+        scan, data = self._scan, self._data
+        if data.isascii():
+            spans = scan.spans
+        else:
+            bounds = _char_offsets(data, [end for _kind, _start, end in scan.spans])
+            spans = [
+                (kind, bounds[index - 1] if index else 0, bounds[index])
+                for index, (kind, _start, _end) in enumerate(scan.spans)
+            ]
+        self._spans = spans
+        self._starts = [start for _kind, start, _end in spans]
+        return spans
+
+
+def _append_span(spans: List[Span], kind: int, start: int, end: int) -> None:
+    """Append a span, merging adjacent text spans."""
+    if kind == TEXT and spans and spans[-1][0] == TEXT and spans[-1][2] == start:
+        spans[-1] = (TEXT, spans[-1][1], end)
+    else:
+        spans.append((kind, start, end))
+
+
+def scan_escapes(data: bytes) -> EscapeScan:
+    """
+    Tokenize a PTY chunk into text and escape-sequence spans.
+
+    Args:
+        data: Raw bytes read from the PTY.
+
+    Returns:
+        The span table of the chunk.
+    """
+    length = len(data)
+    scan = EscapeScan(length)
+    if b"\x1b" not in data:
+        if length:
+            scan.spans.append((TEXT, 0, length))
+        return scan
+
+    spans = scan.spans
+    pos = 0
+    for match in _ESCAPE_PATTERN.finditer(data):
+        start, end = match.span()
+        if start > pos:
+            spans.append((TEXT, pos, start))
+        pos = end
+
+        final = match.group(2)
+        if final is not None:
+            params = match.group(1)
+            if final == b"m":
+                spans.append((SGR, start, end))
+                if match.end(1) == match.start(2) and _COLOR_PARAM_PATTERN.fullmatch(
+                    params
+                ):
+                    scan.color_offsets.append(start)
+                continue
+            spans.append((CSI, start, end))
+            if final in b"hl" and params in _ALT_SCREEN_PARAMS:
+                scan.alt_screen_toggles.append((start, final == b"h"))
+            elif final[0] in _REDRAW_FINALS or (
+                params == b"?25" and final in b"hl"
+            ):
+                scan.redraw_offsets.append(start)
+            elif final == b"~":
+                if params == b"200":
+                    scan.paste_starts.append(start)
+                elif params == b"201":
+                    scan.paste_ends.append(start)
+            continue
+
+        code = match.group(3)
+        if code is not None:
+            spans.append((OSC, start, end))
+            if code:
+                scan.osc_offsets.append((start, int(code)))
+        else:
+            spans.append((ESC, start, end))
+
+    tail = data.rfind(b"\x1b", pos)
+    if tail != -1 and _INCOMPLETE_TAIL_PATTERN.match(data, tail):
+        scan.incomplete_tail = tail
+        if tail > pos:
+            spans.append((TEXT, pos, tail))
+    elif pos < length:
+        spans.append((TEXT, pos, length))
+    return scan
+
+
+def join_scans(head: bytes, data: bytes, scan: EscapeScan) -> EscapeScan:
+    """
+    Return the scan of head + data, given the scan of data.
+
+    Used when buffered bytes are put back in front of a new read; only the
+    (short) buffered bytes are scanned. A sequence left open at the end of
+    head may be completed by data, so that case is rescanned from the start
+    of the open sequence.
+    """
+    head_scan = scan_escapes(head)
+    if head_scan.incomplete_tail >= 0:
+        cut = head_scan.incomplete_tail
+        return join_scans(head[:cut], head[cut:] + data, scan_escapes(head[cut:] + data))
+    offset = len(head)
+    joined = EscapeScan(offset + scan.length)
+    spans = joined.spans
+    spans.extend(head_scan.spans)
+    for kind, start, end in scan.spans:
+        _append_span(spans, kind, start + offset, end + offset)
+    tail = scan._remap(lambda o: o + offset, lambda _o: True, scan.length)
+    joined.alt_screen_toggles = head_scan.alt_screen_toggles + tail.alt_screen_toggles
+    joined.color_offsets = head_scan.color_offsets + tail.color_offsets
+    joined.redraw_offsets = head_scan.redraw_offsets + tail.redraw_offsets
+    joined.paste_starts = head_scan.paste_starts + tail.paste_starts
+    joined.paste_ends = head_scan.paste_ends + tail.paste_ends
+    joined.osc_offsets = head_scan.osc_offsets + tail.osc_offsets
+    if scan.incomplete_tail >= 0:
+        joined.incomplete_tail = scan.incomplete_tail + offset
+    return joined
+
+
+def strip_escapes(text: str, data: bytes, scan: EscapeScan) -> str:
+    """
+    Remove escape sequences from the decoded text of a scanned chunk.
+
+    Args:
+        text: data decoded; returned as is when the scan found no sequence.
+        data: The scanned chunk.
+        scan: Escape scan of data.
+
+    Returns:
+        The text spans of data, decoded.
+    """
+    if not scan.has_escapes:
+        return text
+    return b"".join(
+        data[start:end] for kind, start, end in scan.spans if kind == TEXT
+    ).decode("utf-8", errors="replace")
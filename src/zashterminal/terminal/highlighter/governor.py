@@ -0,0 +1,182 @@
+# zashterminal/terminal/highlighter/governor.py
+"""
+Throughput-aware rate governor for output highlighting.
+
+Each HighlightedTerminalProxy owns one HighlightRateGovernor. The proxy
+reports every output chunk (highlighted or not) and the time spent
+highlighting it. The governor keeps time-decayed estimates of bytes/s,
+lines/s and highlight cost per line. It projects the CPU load highlighting
+would need at the current rate.
+
+When the projected load exceeds the CPU budget, the governor switches to
+raw passthrough. It resumes only once the load has dropped below a fraction
+of the budget and the bypass has been held for a minimum time. This
+hysteresis avoids flapping on and off mid-stream.
+"""
+
+import math
+from dataclasses import dataclass
+
+# Time constant (seconds) of the exponential rate/cost estimators
+_RATE_TAU = 0.5
+# Minimum interval between rate samples; chunks in between are accumulated
+_SAMPLE_INTERVAL = 0.05
+# Resume highlighting when projected load < budget * _RESUME_RATIO ...
+_RESUME_RATIO = 0.5
+# ... and the bypass has been active for at least this long (seconds)
+_MIN_BYPASS_HOLD = 1.0
+# How often a bypassed proxy re-checks the governor while no output arrives
+BYPASS_RECHECK_INTERVAL_MS = int(_MIN_BYPASS_HOLD * 1000)
+
+
+@dataclass(slots=True)
+class GovernorStats:
+    """Snapshot of a rate governor's estimates."""
+
+    bytes_per_sec: float
+    lines_per_sec: float
+    cost_per_line: float
+    projected_load: float
+    cpu_budget: float
+    bypassed: bool
+
+
+class HighlightRateGovernor:
+    """
+    Decides per chunk whether output highlighting should be bypassed.
+
+    Not thread-safe: the proxy calls it from the main thread only, worker
+    results included.
+    """
+
+    __slots__ = (
+        "cpu_budget",
+        "_bytes_per_sec",
+        "_lines_per_sec",
+        "_cost_per_line",
+        "_pending_bytes",
+        "_pending_lines",
+        "_last_sample",
+        "_bypassed",
+        "_bypass_since",
+    )
+
+    def __init__(self, cpu_budget: float = 0.35):
+        """
+        Args:
+            cpu_budget: Fraction of one CPU core highlighting may use before
+                the stream is passed through raw.
+        """
+        self.cpu_budget = cpu_budget
+        self._bytes_per_sec = 0.0
+        self._lines_per_sec = 0.0
+        self._cost_per_line = 0.0
+        self._pending_bytes = 0
+        self._pending_lines = 0
+        self._last_sample = 0.0
+        self._bypassed = False
+        self._bypass_since = 0.0
+
+    @property
+    def bypassed(self) -> bool:
+        return self._bypassed
+
+    @property
+    def projected_load(self) -> float:
+        """Estimated CPU fraction needed to highlight the current stream."""
+        return self._lines_per_sec * self._cost_per_line
+
+    def reset(self) -> None:
+        """Forget all estimates and leave bypass mode."""
+        self._bytes_per_sec = 0.0
+        self._lines_per_sec = 0.0
+        self._cost_per_line = 0.0
+        self._pending_bytes = 0
+        self._pending_lines = 0
+        self._last_sample = 0.0
+        self._bypassed = False
+
+    def record_cost(self, seconds: float, lines: int) -> None:
+        """Record the time spent highlighting ``lines`` lines."""
+        if lines <= 0:
+            return
+        sample = seconds / lines
+        if self._cost_per_line == 0.0:
+            self._cost_per_line = sample
+        else:
+            self._cost_per_line += 0.2 * (sample - self._cost_per_line)
+
+    def trip(self, now: float) -> None:
+        """Enter bypass immediately (e.g. after a hard size limit was hit)."""
+        if not self._bypassed:
+            self._bypassed = True
+            self._bypass_since = now
+
+    def observe(self, nbytes: int, nlines: int, now: float) -> bool:
+        """
+        Account an incoming chunk and update the bypass decision.
+
+        Args:
+            nbytes: Size of the chunk in bytes.
+            nlines: Number of lines in the chunk.
+            now: Current time.monotonic() value.
+
+        Returns:
+            True if the chunk should be passed through without highlighting.
+        """
+        self._pending_bytes += nbytes
+        self._pending_lines += nlines
+
+        if self._last_sample == 0.0:
+            self._last_sample = now
+            return self._bypassed
+
+        elapsed = now - self._last_sample
+        if elapsed >= _SAMPLE_INTERVAL:
+            # Time-decayed moving average: a long quiet gap makes the new
+            # (low) sample dominate, so a calmed-down stream resumes quickly
+            alpha = 1.0 - math.exp(-elapsed / _RATE_TAU)
+            self._bytes_per_sec += alpha * (
+                self._pending_bytes / elapsed - self._bytes_per_sec
+            )
+            self._lines_per_sec += alpha * (
+                self._pending_lines / elapsed - self._lines_per_sec
+            )
+            self._pending_bytes = 0
+            self._pending_lines = 0
+            self._last_sample = now
+
+        load = self.projected_load
+        if not self._bypassed:
+            if load > self.cpu_budget:
+                self._bypassed = True
+                self._bypass_since = now
+        elif (
+            load < self.cpu_budget * _RESUME_RATIO
+            and now - self._bypass_since >= _MIN_BYPASS_HOLD
+        ):
+            self._bypassed = False
+
+        return self._bypassed
+
+    def recheck(self, now: float) -> bool:
+        """
+        Update the bypass decision without a new chunk.
+
+        Output may stop right after a burst, leaving no chunk to observe;
+        this lets the rates decay over the quiet period so bypass can end.
+
+        Returns:
+            True if highlighting is still bypassed.
+        """
+        return self.observe(0, 0, now)
+
+    def get_stats(self) -> GovernorStats:
+        return GovernorStats(
+            bytes_per_sec=self._bytes_per_sec,
+            lines_per_sec=self._lines_per_sec,
+            cost_per_line=self._cost_per_line,
+            projected_load=self.projected_load,
+            cpu_budget=self.cpu_budget,
+            bypassed=self._bypassed,
+        )
@@ -7,20 +7,32 @@ highlighting rules to terminal output text using ANSI escape codes.
 """
 
 import threading
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, Union
 
 # Use regex module (PCRE2 backend) for ~50% faster matching
 import regex as re_engine
+from gi.repository import GLib
 
+from ...settings.highlight_bundle import PatternInfo
 from ...settings.highlights import HighlightRule, get_highlight_manager
 from ...utils.logger import get_logger
+from ...utils.regex_safety import find_backtracking_risks
 
 from .constants import ANSI_RESET, ANSI_COLOR_PATTERN
+from .profiler import KEYWORD_SCAN, LITERAL_SCAN, RuleProfiler, RuleSample
 from .rules import (
     CompiledRule,
     LiteralKeywordRule,
+    RuleSet,
+    build_rule_set,
     extract_literal_keywords,
-    extract_prefilter,
+    extract_prefilter_literals,
+    extract_required_literals,
+    make_prefilter,
 )
 
 if TYPE_CHECKING:
@@ -31,6 +43,68 @@ if TYPE_CHECKING:
 _output_highlighter: Optional["OutputHighlighter"] = None
 
 
+# Default time limit for one rule on one line before the match is abandoned
+_DEFAULT_MATCH_TIMEOUT = 0.05
+# Timeouts after which a rule is disabled (risky rules: on the first one)
+_DEFAULT_TIMEOUT_STRIKES = 3
+# Compiled context rule sets kept (least recently used ones are evicted)
+_CONTEXT_CACHE_SIZE = 64
+# Settings that are part of ProxyHighlightState
+_PROXY_STATE_SETTINGS = frozenset(
+    {
+        "cat_colorization_enabled",
+        "shell_input_highlighting_enabled",
+        "highlight_cpu_budget",
+        "highlight_worker_enabled",
+        "highlight_worker_min_bytes",
+        "highlight_defer_hidden_tabs",
+        "ignored_highlight_commands",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ProxyHighlightState:
+    """
+    Effective highlighting state of one proxy.
+
+    Published by OutputHighlighter whenever the proxy's context, the rules
+    or a relevant setting changes. The proxy reads its current snapshot
+    without taking any lock; a new snapshot replaces it as a whole.
+
+    Attributes:
+        version: Increases with every snapshot published.
+        context: Active context name ("" for none).
+        full_command: Command line that set the context (used to find the
+            file name for cat).
+        rules: Rule set to highlight with (global rules if no context).
+        ignored: The context is an ignored command (native coloring).
+        output_enabled: Output highlighting is on for the terminal type.
+        cat_enabled: Cat colorization setting.
+        shell_input_enabled: Shell input highlighting is on and ready.
+        skip_first_serial: Changes whenever the next output should skip
+            highlighting (the echoed command line).
+        cpu_budget: Rate governor CPU budget.
+        worker_enabled: Highlight large chunks on the worker pool.
+        worker_min_bytes: Chunk size from which the worker pool is used.
+        defer_hidden: Feed output raw while the terminal is hidden.
+    """
+
+    version: int = 0
+    context: str = ""
+    full_command: str = ""
+    rules: RuleSet = field(default_factory=RuleSet)
+    ignored: bool = False
+    output_enabled: bool = False
+    cat_enabled: bool = False
+    shell_input_enabled: bool = False
+    skip_first_serial: int = 0
+    cpu_budget: float = 0.35
+    worker_enabled: bool = True
+    worker_min_bytes: int = 4096
+    defer_hidden: bool = True
+
+
 class OutputHighlighter:
     """
     Applies syntax highlighting to terminal output using ANSI escape codes.
@@ -45,10 +119,14 @@ class OutputHighlighter:
 
     Performance Architecture:
     - Per-rule iteration with PCRE2 backend
+    - All literal keyword rules share one automaton (single scan per line)
+    - Regex rules are gated by one fused scan over their required literals
     - Fast pre-filtering skips rules that cannot match
     - Tuples instead of lists for faster iteration
+    - Bounded LRU of merged per-context rule sets, invalidated per context
     - Early termination on "stop" action
     - Early return for ignored commands (native coloring tools)
+    - Optional per-rule profiling (see set_profiling_enabled)
     """
 
     def __init__(self):
@@ -56,14 +134,29 @@ class OutputHighlighter:
         self._manager: "HighlightManager" = get_highlight_manager()
         self._lock = threading.Lock()
 
-        # Cache for compiled rules per context
-        # Key: context_name, Value: Tuple of CompiledRule or LiteralKeywordRule
-        self._context_rules_cache: Dict[
-            str, Tuple[Union[CompiledRule, LiteralKeywordRule], ...]
+        # LRU of compiled rule sets per context
+        # Key: (context_name, rules version), Value: RuleSet (merged rules +
+        # keyword automaton). Rule edits only invalidate the contexts whose
+        # rules version changed.
+        self._context_rules_cache: "OrderedDict[Tuple[str, tuple], RuleSet]" = (
+            OrderedDict()
+        )
+        # Current rules version per context (filled on first use)
+        self._context_versions: Dict[str, tuple] = {}
+
+        # Global compiled rule set and the rules version it was built from
+        self._global_rules: RuleSet = RuleSet()
+        self._global_rules_version: Optional[tuple] = None
+
+        # Compiled rules keyed by rule content, shared between contexts
+        self._compiled_rules: Dict[
+            tuple, Optional[Union[CompiledRule, LiteralKeywordRule]]
         ] = {}
-
-        # Global compiled rules (tuple for faster iteration)
-        self._global_rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...] = ()
+        # Pattern analysis and ANSI colors cached across launches
+        self._bundle = self._manager.get_rule_bundle()
+        # Bumped whenever rules change, so a running warm-up discards its work
+        self._rules_generation = 0
+        self._warm_up_thread: Optional[threading.Thread] = None
 
         # Per-proxy context tracking: proxy_id -> context_name
         self._proxy_contexts: Dict[int, str] = {}
@@ -76,18 +169,55 @@ class OutputHighlighter:
         # This prevents the echoed command line from being highlighted
         # Key: proxy_id, Value: True if should skip first output
         self._skip_first_output: Dict[int, bool] = {}
+        # Bumped with every skip flag set; published in ProxyHighlightState
+        self._skip_first_serials: Dict[int, int] = {}
+
+        # Proxies receiving ProxyHighlightState snapshots
+        # Key: proxy_id, Value: (weak listener, terminal type)
+        self._state_listeners: Dict[int, Tuple[weakref.WeakMethod, str]] = {}
+        self._state_version = 0
+        self._publish_source_id: Optional[int] = None
 
         # Cached set of ignored commands (tools with native coloring)
         self._ignored_commands: frozenset = frozenset()
         self._refresh_ignored_commands()
 
-        self.logger.info("Using regex module (PCRE2) for high-performance highlighting")
+        # Per-rule cost profiler (None while profiling is disabled)
+        self._profiler: Optional[RuleProfiler] = None
 
-        # Reusable buffer for collecting matches (avoids allocation per line)
-        self._match_buffer: List[Tuple[int, int, str]] = []
+        # Backtracking guard: per-match timeout and timeout strikes per rule
+        self._match_timeout = _DEFAULT_MATCH_TIMEOUT
+        self._timeout_strikes = _DEFAULT_TIMEOUT_STRIKES
+        self._guard_lock = threading.Lock()
+        # Keyed by (context, rule name): a rule name is only unique per context
+        self._rule_timeouts: Dict[Tuple[str, str], int] = {}
+        self._disabling_rules: Set[Tuple[str, str]] = set()
+        self._warned_patterns: set = set()
+        self._refresh_guard_settings()
+
+        self.logger.info("Using regex module (PCRE2) for high-performance highlighting")
 
         self._refresh_rules()
+        self._init_profiling()
         self._manager.connect("rules-changed", self._on_rules_changed)
+        self._connect_settings()
+
+    def _connect_settings(self) -> None:
+        """Republish proxy states when a setting they include changes."""
+        try:
+            from ...settings.manager import get_settings_manager
+
+            get_settings_manager().add_change_listener(self._on_setting_changed)
+        except Exception as e:
+            self.logger.debug(f"Could not watch highlight settings: {e}")
+
+    def _on_setting_changed(self, key: str, _old_value, _new_value) -> None:
+        if key not in _PROXY_STATE_SETTINGS:
+            return
+        if key == "ignored_highlight_commands":
+            with self._lock:
+                self._refresh_ignored_commands()
+        self.schedule_publish_states()
 
     def _refresh_ignored_commands(self) -> None:
         """Refresh the cached set of ignored commands from settings."""
@@ -104,16 +234,88 @@ class OutputHighlighter:
             self.logger.warning(f"Failed to refresh ignored commands: {e}")
             self._ignored_commands = frozenset()
 
+    def _refresh_guard_settings(self) -> None:
+        """Read the match timeout and strike limit from settings."""
+        try:
+            from ...settings.manager import get_settings_manager
+
+            settings = get_settings_manager()
+            timeout_ms = settings.get(
+                "highlight_match_timeout_ms", _DEFAULT_MATCH_TIMEOUT * 1000
+            )
+            self._match_timeout = max(1, int(timeout_ms)) / 1000.0
+            self._timeout_strikes = max(
+                1,
+                int(
+                    settings.get(
+                        "highlight_rule_timeout_strikes", _DEFAULT_TIMEOUT_STRIKES
+                    )
+                ),
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to read highlight guard settings: {e}")
+
+    def _init_profiling(self) -> None:
+        """Enable the rule profiler if requested in settings."""
+        try:
+            from ...settings.manager import get_settings_manager
+
+            if get_settings_manager().get("highlight_rule_profiling", False):
+                self.set_profiling_enabled(True)
+        except Exception as e:
+            self.logger.debug(f"Could not read rule profiling setting: {e}")
+
+    @property
+    def profiling_enabled(self) -> bool:
+        return self._profiler is not None
+
+    def set_profiling_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable per-rule cost profiling.
+
+        The line highlighter records samples only while a profiler is
+        installed; with none it skips the timing entirely. Collected
+        numbers are discarded when profiling is disabled.
+        """
+        if enabled == self.profiling_enabled:
+            return
+        self._profiler = RuleProfiler() if enabled else None
+        self.logger.info(f"Rule profiling {'enabled' if enabled else 'disabled'}")
+
+    def get_rule_profiler(self) -> Optional[RuleProfiler]:
+        """Return the active rule profiler, or None if profiling is disabled."""
+        return self._profiler
+
     def refresh_ignored_commands(self) -> None:
         """Public method to refresh ignored commands (called when settings change)."""
         with self._lock:
             self._refresh_ignored_commands()
+        self.schedule_publish_states()
 
-    def register_proxy(self, proxy_id: int) -> None:
-        """Register a proxy with the highlighter."""
+    def register_proxy(
+        self,
+        proxy_id: int,
+        state_listener: Optional[Callable[[ProxyHighlightState], None]] = None,
+        terminal_type: str = "local",
+    ) -> None:
+        """
+        Register a proxy with the highlighter.
+
+        Args:
+            proxy_id: The ID of the proxy.
+            state_listener: Bound method receiving the proxy's
+                ProxyHighlightState, now and after every change. Held weakly.
+            terminal_type: Terminal type of the proxy ("local", "ssh", ...).
+        """
         with self._lock:
             self._proxy_contexts[proxy_id] = ""
+            if state_listener is not None:
+                self._state_listeners[proxy_id] = (
+                    weakref.WeakMethod(state_listener),
+                    terminal_type,
+                )
             self.logger.debug(f"Registered proxy {proxy_id}")
+        self._publish_state(proxy_id)
 
     def unregister_proxy(self, proxy_id: int) -> None:
         """Unregister a proxy from the highlighter."""
@@ -124,13 +326,169 @@ class OutputHighlighter:
                 del self._full_commands[proxy_id]
             if proxy_id in self._skip_first_output:
                 del self._skip_first_output[proxy_id]
+            self._skip_first_serials.pop(proxy_id, None)
+            self._state_listeners.pop(proxy_id, None)
             self.logger.debug(f"Unregistered proxy {proxy_id}")
 
+    def _publish_state(self, proxy_id: int) -> None:
+        """Build the proxy's current ProxyHighlightState and hand it over."""
+        with self._lock:
+            entry = self._state_listeners.get(proxy_id)
+            if entry is None:
+                return
+            listener_ref, terminal_type = entry
+            context = self._proxy_contexts.get(proxy_id, "")
+            full_command = self._full_commands.get(proxy_id, "")
+            ignored = bool(context) and context.lower() in self._ignored_commands
+            skip_first_serial = self._skip_first_serials.get(proxy_id, 0)
+            self._state_version += 1
+            version = self._state_version
+
+        listener = listener_ref()
+        if listener is None:
+            return
+
+        from ...settings.manager import get_settings_manager
+        from .shell_input import get_shell_input_highlighter
+
+        settings = get_settings_manager()
+        listener(
+            ProxyHighlightState(
+                version=version,
+                context=context,
+                full_command=full_command,
+                rules=self._get_active_rules(context),
+                ignored=ignored,
+                output_enabled=self.is_enabled_for_type(terminal_type),
+                cat_enabled=settings.get("cat_colorization_enabled", True),
+                shell_input_enabled=get_shell_input_highlighter().enabled,
+                skip_first_serial=skip_first_serial,
+                cpu_budget=settings.get("highlight_cpu_budget", 0.35),
+                worker_enabled=settings.get("highlight_worker_enabled", True),
+                worker_min_bytes=settings.get("highlight_worker_min_bytes", 4096),
+                defer_hidden=settings.get("highlight_defer_hidden_tabs", True),
+            )
+        )
+
+    def publish_states(self) -> bool:
+        """Republish the state of every registered proxy."""
+        self._publish_source_id = None
+        with self._lock:
+            proxy_ids = list(self._state_listeners)
+        for proxy_id in proxy_ids:
+            try:
+                self._publish_state(proxy_id)
+            except Exception as e:
+                self.logger.error(f"Failed to publish state of proxy {proxy_id}: {e}")
+        return False
+
+    def schedule_publish_states(self) -> None:
+        """
+        Republish all proxy states from the main loop.
+
+        Coalesces bursts of changes, and runs after the other settings
+        listeners (e.g. the shell input highlighter loading its lexer).
+        """
+        if self._publish_source_id is None:
+            self._publish_source_id = GLib.idle_add(self.publish_states)
+
     def _on_rules_changed(self, manager) -> None:
-        self._refresh_rules()
-        # Clear context cache when rules change
+        if self._manager.get_rules_version() != self._global_rules_version:
+            self._refresh_rules()
+        # Drop the compiled rule sets of contexts whose rules changed
+        with self._lock:
+            contexts = {context for context, _version in self._context_rules_cache}
+        versions = {
+            context: self._manager.get_rules_version(context) for context in contexts
+        }
         with self._lock:
-            self._context_rules_cache.clear()
+            for key in list(self._context_rules_cache):
+                if versions.get(key[0]) != key[1]:
+                    del self._context_rules_cache[key]
+            self._context_versions = versions
+            self._rules_generation += 1
+            running = self._warm_up_thread is not None and self._warm_up_thread.is_alive()
+        self.publish_states()
+        if not running:
+            self._warm_up_thread = threading.Thread(
+                target=self.warm_up, name="highlight-warm-up", daemon=True
+            )
+            self._warm_up_thread.start()
+
+    def warm_up(self) -> None:
+        """
+        Compile the rules of every enabled context ahead of time.
+
+        Keeps rule compilation off the output path when a command first
+        switches context. Runs in a background thread; if rules change
+        meanwhile, the stale results are discarded and compilation restarts.
+        """
+        while True:
+            with self._lock:
+                generation = self._rules_generation
+                cached = {name for name, _version in self._context_rules_cache}
+                # Never warm up more contexts than the cache keeps
+                room = _CONTEXT_CACHE_SIZE - len(self._context_rules_cache)
+            missing = [
+                name
+                for name in self._manager.get_context_names()
+                if name not in cached
+            ]
+
+            compiled = {}
+            for name in missing:
+                if len(compiled) >= room:
+                    break
+                ctx = self._manager.get_context(name)
+                if ctx is not None and ctx.enabled:
+                    key = (name, self._manager.get_rules_version(name))
+                    compiled[key] = self._compile_rules_for_context(name)
+
+            with self._lock:
+                if generation != self._rules_generation:
+                    continue
+                for key, rule_set in compiled.items():
+                    if key not in self._context_rules_cache:
+                        self._store_context_rules(key, rule_set)
+                break
+
+        self.logger.debug(f"Warmed up rules for {len(compiled)} contexts")
+        self._bundle.save()
+
+    def _on_rule_timeout(self, rule: CompiledRule, context: str) -> None:
+        """
+        Count a match timeout and disable the rule once it keeps timing out.
+
+        May be called from worker threads; disabling happens on the main loop.
+        """
+        key = (context, rule.name)
+        with self._guard_lock:
+            strikes = self._rule_timeouts.get(key, 0) + 1
+            self._rule_timeouts[key] = strikes
+            limit = 1 if rule.risky else self._timeout_strikes
+            if strikes < limit or key in self._disabling_rules:
+                self.logger.debug(
+                    f"Highlight rule '{rule.name}' timed out ({strikes}/{limit})"
+                )
+                return
+            self._disabling_rules.add(key)
+
+        self.logger.warning(
+            f"Highlight rule '{rule.name}' timed out {strikes} time(s); disabling it"
+        )
+        GLib.idle_add(self._auto_disable_rule, rule.name, context)
+
+    def _auto_disable_rule(self, rule_name: str, context: str) -> bool:
+        try:
+            self._manager.auto_disable_rule(rule_name, context)
+        except Exception as e:
+            self.logger.error(f"Failed to disable highlight rule '{rule_name}': {e}")
+        finally:
+            with self._guard_lock:
+                key = (context, rule_name)
+                self._rule_timeouts.pop(key, None)
+                self._disabling_rules.discard(key)
+        return False
 
     def _compile_rule(
         self, rule: HighlightRule
@@ -145,22 +503,64 @@ class OutputHighlighter:
         - Compiled regex pattern (PCRE2)
         - ANSI color tuple
         - Pre-filter function for fast skipping
+
+        Results are memoized by rule content, so global rules included in
+        several contexts are compiled only once.
         """
         if not rule.enabled or not rule.pattern:
             return None
 
+        key = (rule.name, rule.pattern, tuple(rule.colors), rule.action)
+        try:
+            return self._compiled_rules[key]
+        except KeyError:
+            pass
+
+        compiled = self._build_compiled_rule(rule)
+        self._compiled_rules[key] = compiled
+        return compiled
+
+    def _analyze_pattern(self, pattern: str) -> PatternInfo:
+        """Return the (cached) literal and backtracking analysis of a pattern."""
+        info = self._bundle.get_pattern_info(pattern)
+        if info is None:
+            literal_keywords = extract_literal_keywords(pattern)
+            if literal_keywords:
+                info = PatternInfo(literal_keywords, None)
+            else:
+                info = PatternInfo(
+                    None,
+                    extract_required_literals(pattern),
+                    tuple(find_backtracking_risks(pattern)),
+                )
+            self._bundle.set_pattern_info(pattern, info)
+        return info
+
+    def _resolve_ansi(self, color_name: str) -> str:
+        """Resolve a color name to an ANSI sequence (cached across launches)."""
+        ansi = self._bundle.get_ansi_color(color_name)
+        if ansi is None:
+            ansi = self._manager.resolve_color_to_ansi(color_name)
+            self._bundle.set_ansi_color(color_name, ansi)
+        return ansi
+
+    def _build_compiled_rule(
+        self, rule: HighlightRule
+    ) -> Optional[Union[CompiledRule, LiteralKeywordRule]]:
+        """Compile a rule without consulting the compiled-rule cache."""
         # Get action (default: "next")
         action = getattr(rule, "action", "next")
         if action not in ("next", "stop"):
             action = "next"
 
         # Check if this is a simple keyword pattern that can use optimized matching
-        literal_keywords = extract_literal_keywords(rule.pattern)
+        info = self._analyze_pattern(rule.pattern)
+        literal_keywords = info.literal_keywords
         if literal_keywords:
             # Use optimized literal keyword matching (no regex!)
             # Resolve first color only (keyword rules use single color)
             if rule.colors:
-                ansi_color = self._manager.resolve_color_to_ansi(rule.colors[0])
+                ansi_color = self._resolve_ansi(rule.colors[0])
             else:
                 ansi_color = ""
 
@@ -172,6 +572,7 @@ class OutputHighlighter:
                 keyword_tuple=literal_keywords,
                 ansi_color=ansi_color,
                 action=action,
+                name=rule.name,
             )
 
         # Fall back to regex for complex patterns
@@ -184,7 +585,7 @@ class OutputHighlighter:
             # Resolve colors to ANSI sequences (tuple for faster iteration)
             ansi_colors = (
                 tuple(
-                    self._manager.resolve_color_to_ansi(c) if c else ""
+                    self._resolve_ansi(c) if c else ""
                     for c in rule.colors
                 )
                 if rule.colors
@@ -195,7 +596,16 @@ class OutputHighlighter:
                 return None
 
             # Create pre-filter for fast skipping
-            prefilter = extract_prefilter(rule.pattern, rule.name)
+            prefilter_literals = extract_prefilter_literals(rule.pattern, rule.name)
+            prefilter = make_prefilter(prefilter_literals)
+
+            risks = info.risks
+            if risks and rule.pattern not in self._warned_patterns:
+                self._warned_patterns.add(rule.pattern)
+                self.logger.warning(
+                    f"Highlight rule '{rule.name}' may backtrack catastrophically: "
+                    f"{'; '.join(risks)}"
+                )
 
             return CompiledRule(
                 pattern=pattern,
@@ -203,6 +613,10 @@ class OutputHighlighter:
                 action=action,
                 num_groups=num_groups,
                 prefilter=prefilter,
+                name=rule.name,
+                risky=bool(risks),
+                required_literals=info.required_literals,
+                prefilter_literals=prefilter_literals,
             )
 
         except Exception as e:
@@ -228,8 +642,9 @@ class OutputHighlighter:
                     else:
                         regex_count += 1
 
-            # Convert to tuple for faster iteration
-            self._global_rules = tuple(compiled)
+            # Tuple for faster iteration, keyword automaton built once here
+            self._global_rules = build_rule_set(tuple(compiled))
+            self._global_rules_version = self._manager.get_rules_version()
 
             self.logger.debug(
                 f"Compiled {len(self._global_rules)} global rules "
@@ -296,25 +711,32 @@ class OutputHighlighter:
                         f"Full command updated for proxy {proxy_id}: '{full_command[:50]}...'"
                     )
                     # Set skip flag since this is a new command execution
-                    self._skip_first_output[proxy_id] = True
-                return False
+                    self._set_skip_first_output(proxy_id)
+                changed = False
+            else:
+                self._proxy_contexts[proxy_id] = resolved_context
 
-            self._proxy_contexts[proxy_id] = resolved_context
+                # Set the skip flag to prevent highlighting the echoed command line
+                # This flag will be consumed by the first data processing after Enter
+                self._set_skip_first_output(proxy_id)
+                changed = True
 
-            # Set the skip flag to prevent highlighting the echoed command line
-            # This flag will be consumed by the first data processing after Enter
-            self._skip_first_output[proxy_id] = True
+                if resolved_context:
+                    self.logger.debug(
+                        f"Context changed for proxy {proxy_id}: '{current_context}' -> '{resolved_context}' (from '{command_name}')"
+                    )
+                else:
+                    self.logger.debug(
+                        f"Context cleared for proxy {proxy_id} (command '{command_name}' has no context)"
+                    )
 
-            if resolved_context:
-                self.logger.debug(
-                    f"Context changed for proxy {proxy_id}: '{current_context}' -> '{resolved_context}' (from '{command_name}')"
-                )
-            else:
-                self.logger.debug(
-                    f"Context cleared for proxy {proxy_id} (command '{command_name}' has no context)"
-                )
+        self._publish_state(proxy_id)
+        return changed
 
-            return True
+    def _set_skip_first_output(self, proxy_id: int) -> None:
+        """Arm the skip flag of a proxy. Caller holds self._lock."""
+        self._skip_first_output[proxy_id] = True
+        self._skip_first_serials[proxy_id] = self._skip_first_serials.get(proxy_id, 0) + 1
 
     def get_full_command(self, proxy_id: int = 0) -> str:
         """Get the full command line for a specific proxy (for Pygments file highlighting)."""
@@ -354,59 +776,82 @@ class OutputHighlighter:
         on subsequent Enter key presses.
         """
         with self._lock:
-            if proxy_id in self._proxy_contexts:
-                old_context = self._proxy_contexts[proxy_id]
-                del self._proxy_contexts[proxy_id]
+            old_context = self._proxy_contexts.pop(proxy_id, None)
+            if old_context is not None:
                 self.logger.debug(
                     f"Cleared context for proxy {proxy_id} (was: {old_context})"
                 )
-            if proxy_id in self._full_commands:
-                del self._full_commands[proxy_id]
+            had_full_command = self._full_commands.pop(proxy_id, None) is not None
+        if old_context or had_full_command:
+            self._publish_state(proxy_id)
 
-    def _compile_rules_for_context(
-        self, context_name: str
-    ) -> Tuple[Union[CompiledRule, LiteralKeywordRule], ...]:
+    def _compile_rules_for_context(self, context_name: str) -> RuleSet:
         """
         Compile rules for a specific context.
 
-        This merges global rules with context-specific rules.
+        This merges global rules with context-specific rules and builds
+        the shared keyword automaton for the merged set. A context rule
+        identical to an included global rule compiles to the same object
+        and is only kept once.
         """
         rules = self._manager.get_rules_for_context(context_name)
         self.logger.debug(f"Compiling {len(rules)} rules for context '{context_name}'")
 
         compiled = []
+        seen = set()
         for rule in rules:
             cr = self._compile_rule(rule)
-            if cr:
+            if cr and id(cr) not in seen:
+                seen.add(id(cr))
                 compiled.append(cr)
 
-        return tuple(compiled)
+        return build_rule_set(tuple(compiled), context_name)
+
+    def _store_context_rules(self, key: Tuple[str, tuple], rule_set: RuleSet) -> None:
+        """Add a compiled rule set to the LRU. Caller holds self._lock."""
+        cache = self._context_rules_cache
+        cache[key] = rule_set
+        cache.move_to_end(key)
+        while len(cache) > _CONTEXT_CACHE_SIZE:
+            cache.popitem(last=False)
 
-    def _get_active_rules(
-        self, context: str = ""
-    ) -> Tuple[Union[CompiledRule, LiteralKeywordRule], ...]:
+    def _get_active_rules(self, context: str = "") -> RuleSet:
         """
         Get the active compiled rules based on given context.
 
-        Uses caching to avoid recompiling rules repeatedly.
+        Compiled rule sets are kept in an LRU keyed by context and rules
+        version, so they are only rebuilt after that context's rules change.
 
         Args:
             context: The context name to get rules for.
 
         Returns:
-            Tuple of CompiledRule or LiteralKeywordRule objects
+            RuleSet for the context
         """
         # If no context or context-aware disabled, use global rules
         if not context or not self._manager.context_aware_enabled:
             return self._global_rules
 
+        generation = self._rules_generation
+        version = self._context_versions.get(context)
+        if version is None:
+            version = self._manager.get_rules_version(context)
+        key = (context, version)
+
         # Check cache
-        if context in self._context_rules_cache:
-            return self._context_rules_cache[context]
+        with self._lock:
+            rule_set = self._context_rules_cache.get(key)
+            if rule_set is not None:
+                self._context_rules_cache.move_to_end(key)
+                return rule_set
 
         # Compile and cache rules for this context
         context_rules = self._compile_rules_for_context(context)
-        self._context_rules_cache[context] = context_rules
+        with self._lock:
+            # Rules changed while compiling: the version may be stale
+            if generation == self._rules_generation:
+                self._context_versions[context] = version
+                self._store_context_rules(key, context_rules)
 
         return context_rules
 
@@ -424,16 +869,19 @@ class OutputHighlighter:
         if not text:
             return text
 
-        # Fast path: get context and rules with minimal locking
+        # Fast path: get context with minimal locking
         with self._lock:
-            context = self.get_context(proxy_id)
+            # Read directly: get_context() takes the same (non-reentrant) lock
+            context = self._proxy_contexts.get(proxy_id, "")
+            ignored = bool(context) and context.lower() in self._ignored_commands
 
-            # Early return for ignored commands (tools with native coloring)
-            # This preserves their ANSI colors and saves CPU
-            if context and context.lower() in self._ignored_commands:
-                return text
+        # Early return for ignored commands (tools with native coloring)
+        # This preserves their ANSI colors and saves CPU
+        if ignored:
+            return text
 
-            rules = self._get_active_rules(context)
+        # Outside the lock: _get_active_rules() takes it for the rule cache
+        rules = self._get_active_rules(context)
 
         if not rules:
             return text
@@ -456,31 +904,30 @@ class OutputHighlighter:
             return line
 
         with self._lock:
-            context = self.get_context(proxy_id)
+            # Read directly: get_context() takes the same (non-reentrant) lock
+            context = self._proxy_contexts.get(proxy_id, "")
+            ignored = bool(context) and context.lower() in self._ignored_commands
 
-            # Early return for ignored commands (tools with native coloring)
-            # This preserves their ANSI colors and saves CPU
-            if context and context.lower() in self._ignored_commands:
-                return line
+        # Early return for ignored commands (tools with native coloring)
+        # This preserves their ANSI colors and saves CPU
+        if ignored:
+            return line
 
-            rules = self._get_active_rules(context)
+        # Outside the lock: _get_active_rules() takes it for the rule cache
+        rules = self._get_active_rules(context)
 
         if not rules:
             return line
 
         return self._apply_highlighting_to_line(line, rules)
 
-    def _apply_highlighting(
-        self,
-        text: str,
-        rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...],
-    ) -> str:
+    def _apply_highlighting(self, text: str, rules: RuleSet) -> str:
         """
         Apply highlighting using optimized per-rule iteration.
 
         Args:
             text: The text to highlight
-            rules: Tuple of CompiledRule or LiteralKeywordRule objects
+            rules: Compiled RuleSet to apply
 
         Returns:
             Text with ANSI color codes applied
@@ -496,23 +943,29 @@ class OutputHighlighter:
         return "\n".join(result_lines)
 
     def _apply_highlighting_to_line(
-        self,
-        line: str,
-        rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...],
+        self, line: str, rules: RuleSet, has_color: Optional[bool] = None
     ) -> str:
         """
         Apply highlighting to a single line using per-rule iteration.
 
         Optimizations:
-        - LiteralKeywordRule: O(1) set lookup + string.find() (no regex!)
-        - CompiledRule: Pre-filtering skips regex when line cannot match
+        - LiteralKeywordRule: hits for every keyword rule come from one
+          KeywordAutomaton scan, done lazily on the first keyword rule
+        - CompiledRule: one RequiredLiteralScanner pass selects the regex
+          rules that can match; uncovered rules use their own pre-filter
         - Tuple iteration is faster than list
         - Early termination on "stop" action
         - PCRE2 backend for regex rules
 
+        While profiling is enabled, also records per rule whether it was
+        rejected by the literal scan/pre-filter, whether it matched and how
+        long it took.
+
         Args:
             line: The line to highlight
-            rules: Tuple of CompiledRule or LiteralKeywordRule objects
+            rules: Compiled RuleSet to apply
+            has_color: Whether the line holds a color SGR, as found by the
+                caller's escape scan; None looks for one in the line itself.
 
         Returns:
             Line with ANSI color codes applied
@@ -523,52 +976,97 @@ class OutputHighlighter:
         # Skip lines that already contain ANSI color codes to prevent double-highlighting
         # This handles cases where the shell or another tool has already colorized the output
         # Uses pre-compiled pattern for efficiency
-        if "\x1b[" in line and ANSI_COLOR_PATTERN.search(line):
+        if has_color is None:
+            has_color = "\x1b[" in line and bool(ANSI_COLOR_PATTERN.search(line))
+        if has_color:
             return line
 
+        # Samples for the rule profiler; None while profiling is disabled
+        profiler = self._profiler
+        samples: Optional[List[RuleSample]] = None
+        if profiler is not None:
+            samples = []
+            clock = time.perf_counter_ns
+
         # Pre-compute lowercase line for matching (O(n) once)
         line_lower = line.lower()
 
-        # Reuse match buffer to avoid allocation per line
-        matches = self._match_buffer
-        matches.clear()
+        # Per-call list: lines may be highlighted concurrently on worker threads
+        matches: List[Tuple[int, int, str]] = []
         should_stop = False
+        match_timeout = self._match_timeout
 
-        for rule in rules:
+        # Keyword hits per rule index, filled by a single automaton scan
+        keyword_hits = None
+        # Regex rules whose required literals occur in the line (lazy scan)
+        literal_scanner = rules.literal_scanner
+        regex_candidates = None
+
+        for rule_index, rule in enumerate(rules.rules):
             if should_stop:
                 break
 
-            # Handle LiteralKeywordRule (optimized path - no regex!)
+            # Handle LiteralKeywordRule (shared automaton - no per-rule scan)
             if isinstance(rule, LiteralKeywordRule):
-                # Quick check: any keyword might be in line?
-                # This is O(k) where k is number of keywords, but very fast
-                has_potential = False
-                for kw in rule.keyword_tuple:
-                    if kw in line_lower:
-                        has_potential = True
-                        break
-
-                if not has_potential:
+                if keyword_hits is None:
+                    automaton = rules.keyword_automaton
+                    if samples is None:
+                        keyword_hits = automaton.scan(line_lower) if automaton else {}
+                    else:
+                        t0 = clock()
+                        keyword_hits = automaton.scan(line_lower) if automaton else {}
+                        samples.append(
+                            (KEYWORD_SCAN, "scan", bool(keyword_hits), False, clock() - t0)
+                        )
+
+                rule_spans = keyword_hits.get(rule_index)
+                if samples is not None:
+                    samples.append(
+                        (rule.name, "keyword", bool(rule_spans), not rule_spans, 0)
+                    )
+                if not rule_spans:
                     continue
 
-                # Find all keyword matches with word boundaries
-                rule_matches = rule.find_matches(line, line_lower)
-                rule_matched = bool(rule_matches)
-                matches.extend(rule_matches)
+                ansi_color = rule.ansi_color
+                for start, end in rule_spans:
+                    matches.append((start, end, ansi_color))
 
-                if rule_matched and rule.action == "stop":
+                if rule.action == "stop":
                     should_stop = True
                 continue
 
             # Handle CompiledRule (regex path)
-            # Pre-filter: fast check if line might match
-            if rule.prefilter is not None:
-                if not rule.prefilter(line_lower):
-                    continue  # Skip this rule - pre-filter failed
-
+            if literal_scanner is not None and rule_index in literal_scanner.covered:
+                # Fused literal scan: skip rules whose literals are absent
+                if regex_candidates is None:
+                    if samples is None:
+                        regex_candidates = literal_scanner.scan(line_lower)
+                    else:
+                        t0 = clock()
+                        regex_candidates = literal_scanner.scan(line_lower)
+                        samples.append(
+                            (
+                                LITERAL_SCAN,
+                                "scan",
+                                bool(regex_candidates),
+                                False,
+                                clock() - t0,
+                            )
+                        )
+                rejected = rule_index not in regex_candidates
+            else:
+                # Pre-filter: fast check if line might match
+                rejected = rule.prefilter is not None and not rule.prefilter(line_lower)
+            if rejected:
+                if samples is not None:
+                    samples.append((rule.name, "regex", False, True, 0))
+                continue  # Skip this rule - pre-filter failed
+
+            if samples is not None:
+                t0 = clock()
+            rule_matched = False
             try:
-                rule_matched = False
-                for match in rule.pattern.finditer(line):
+                for match in rule.pattern.finditer(line, timeout=match_timeout):
                     rule_matched = True
 
                     if rule.num_groups > 0:
@@ -603,44 +1101,24 @@ class OutputHighlighter:
                 if rule_matched and rule.action == "stop":
                     should_stop = True
 
+            except TimeoutError:
+                self._on_rule_timeout(rule, rules.context)
+                rule_matched = False
             except Exception as e:
                 # Log at debug level to help diagnose pattern issues without flooding logs
                 if hasattr(self, "logger"):
                     self.logger.debug(f"Rule pattern matching failed: {e}")
-                continue
+                rule_matched = False
+            if samples is not None:
+                samples.append((rule.name, "regex", rule_matched, False, clock() - t0))
+
+        if samples is not None:
+            profiler.record_line(rules.context, samples)
 
         if not matches:
             return line
 
-        # Sort by start position, then by length (longer first)
-        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
-
-        result = []
-        last_end = 0
-        covered_until = 0
-
-        for start, end, color in matches:
-            # Skip if already covered by previous match
-            if start < covered_until:
-                continue
-
-            # Add text before this match
-            if start > last_end:
-                result.append(line[last_end:start])
-
-            # Add colored match
-            result.append(color)
-            result.append(line[start:end])
-            result.append(ANSI_RESET)
-
-            last_end = end
-            covered_until = end
-
-        # Add remaining text
-        if last_end < len(line):
-            result.append(line[last_end:])
-
-        return "".join(result)
+        return _render_matches(line, matches)
 
     def is_enabled_for_type(self, terminal_type: str) -> bool:
         """Check if highlighting is enabled for the given terminal type."""
@@ -651,6 +1129,43 @@ class OutputHighlighter:
         return False
 
 
+def _render_matches(line: str, matches: List[Tuple[int, int, str]]) -> str:
+    """
+    Wrap matched spans of a line in ANSI colors.
+
+    Overlaps are resolved in favour of the earliest, then longest match.
+    """
+    # Sort by start position, then by length (longer first)
+    matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+
+    result = []
+    last_end = 0
+    covered_until = 0
+
+    for start, end, color in matches:
+        # Skip if already covered by previous match
+        if start < covered_until:
+            continue
+
+        # Add text before this match
+        if start > last_end:
+            result.append(line[last_end:start])
+
+        # Add colored match
+        result.append(color)
+        result.append(line[start:end])
+        result.append(ANSI_RESET)
+
+        last_end = end
+        covered_until = end
+
+    # Add remaining text
+    if last_end < len(line):
+        result.append(line[last_end:])
+
+    return "".join(result)
+
+
 def get_output_highlighter() -> OutputHighlighter:
     """Get or create the singleton OutputHighlighter instance."""
     global _output_highlighter
@@ -0,0 +1,206 @@
+# zashterminal/terminal/highlighter/output_ring.py
+"""
+Byte ring buffer for highlighted output waiting to be fed to VTE.
+
+Highlighted lines used to be queued as one small bytes object each, bounded
+per proxy by an item count and a byte count. OutputRing copies them into a
+per-proxy bytearray instead, so a backlog costs one allocation rather than
+one object per line, and the consumer takes whole frames out of it.
+
+Every ring keeps a small preallocated buffer of its own. Growing beyond it
+is charged against one OutputMemoryPool shared by all proxies: a tab with a
+large backlog can use the pool, but once it is spent the tab falls back to
+raw feed while other tabs still have their own buffer to work with.
+"""
+
+import threading
+from typing import Optional
+
+# Buffer each ring owns outright (not charged to the shared pool)
+_RING_INITIAL_CAPACITY = 64 * 1024
+# Largest buffer a single ring may grow to
+_RING_MAX_CAPACITY = 4 * 1024 * 1024
+# Growth beyond the initial buffers allowed across all proxies
+_POOL_LIMIT = 64 * 1024 * 1024
+
+
+class OutputMemoryPool:
+    """Process-wide byte budget for ring buffer growth."""
+
+    __slots__ = ("_limit", "_used", "_lock")
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._used = 0
+        # Reentrant: a ring collected while reserve() holds the lock
+        # releases its growth from OutputRing.__del__ on the same thread
+        self._lock = threading.RLock()
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def reserve(self, nbytes: int) -> bool:
+        """Take nbytes from the pool; False (and nothing taken) if it is spent."""
+        with self._lock:
+            if self._used + nbytes > self._limit:
+                return False
+            self._used += nbytes
+            return True
+
+    def release(self, nbytes: int) -> None:
+        with self._lock:
+            self._used = max(0, self._used - nbytes)
+
+
+_pool: Optional[OutputMemoryPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_output_memory_pool() -> OutputMemoryPool:
+    """Return the pool shared by all proxies' output rings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OutputMemoryPool(_POOL_LIMIT)
+    return _pool
+
+
+class OutputRing:
+    """
+    FIFO of output bytes in a growable circular bytearray.
+
+    Used from the GTK main thread only. len() is the number of bytes
+    queued; the capacity doubles as needed up to max_capacity, charging the
+    pool, and drops back to the initial buffer once the ring is drained,
+    cleared or garbage collected.
+    """
+
+    __slots__ = ("_pool", "_initial", "_max", "_buf", "_view", "_head", "_size")
+
+    def __init__(
+        self,
+        pool: Optional[OutputMemoryPool] = None,
+        initial_capacity: int = _RING_INITIAL_CAPACITY,
+        max_capacity: int = _RING_MAX_CAPACITY,
+    ):
+        self._pool = pool if pool is not None else get_output_memory_pool()
+        self._initial = initial_capacity
+        self._max = max_capacity
+        self._buf = bytearray(initial_capacity)
+        self._view = memoryview(self._buf)
+        self._head = 0
+        self._size = 0
+
+    def __del__(self) -> None:
+        # A ring dropped without being cleared (its proxy was never
+        # stopped) must not keep its growth reserved in the shared pool
+        excess = len(self._buf) - self._initial
+        if excess > 0:
+            self._pool.release(excess)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def write(self, data: bytes) -> bool:
+        """
+        Append data.
+
+        Returns:
+            False, leaving the ring unchanged, when the data does not fit
+            within max_capacity or the shared pool.
+        """
+        n = len(data)
+        if not n:
+            return True
+        capacity = len(self._buf)
+        if self._size + n > capacity:
+            if not self._grow(self._size + n):
+                return False
+            capacity = len(self._buf)
+
+        tail = (self._head + self._size) % capacity
+        first = min(n, capacity - tail)
+        view = self._view
+        src = memoryview(data)
+        view[tail : tail + first] = src[:first]
+        if first < n:
+            view[: n - first] = src[first:]
+        self._size += n
+        return True
+
+    def read(self, max_bytes: int) -> bytes:
+        """Remove and return up to max_bytes from the front."""
+        n = min(self._size, max_bytes)
+        if n <= 0:
+            return b""
+        view = self._view
+        head = self._head
+        capacity = len(self._buf)
+        first = min(n, capacity - head)
+        if first == n:
+            data = bytes(view[head : head + n])
+        else:
+            data = b"".join((view[head:capacity], view[: n - first]))
+        self._head = (head + n) % capacity
+        self._size -= n
+        if not self._size:
+            self._head = 0
+            if capacity > self._initial:
+                self._resize(self._initial)
+        return data
+
+    def clear(self) -> None:
+        """Drop queued data and return any grown capacity to the pool."""
+        self._head = 0
+        self._size = 0
+        if len(self._buf) > self._initial:
+            self._resize(self._initial)
+
+    def _grow(self, needed: int) -> bool:
+        if needed > self._max:
+            return False
+        capacity = len(self._buf)
+        new_capacity = capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        new_capacity = min(new_capacity, self._max)
+        # The initial buffer is the ring's own; only growth beyond it is charged
+        charge = new_capacity - max(capacity, self._initial)
+        if charge > 0 and not self._pool.reserve(charge):
+            return False
+        self._resize(new_capacity, charged=True)
+        return True
+
+    def _resize(self, new_capacity: int, charged: bool = False) -> None:
+        """Move the queued bytes to a new buffer (linearized at offset 0)."""
+        old_capacity = len(self._buf)
+        buf = bytearray(new_capacity)
+        if self._size:
+            head = self._head
+            first = min(self._size, old_capacity - head)
+            buf[:first] = self._view[head : head + first]
+            if first < self._size:
+                buf[first : self._size] = self._view[: self._size - first]
+        self._view.release()
+        self._buf = buf
+        self._view = memoryview(buf)
+        self._head = 0
+        if not charged:
+            released = max(old_capacity, self._initial) - max(
+                new_capacity, self._initial
+            )
+            if released > 0:
+                self._pool.release(released)
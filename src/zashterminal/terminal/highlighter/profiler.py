@@ -0,0 +1,116 @@
+# zashterminal/terminal/highlighter/profiler.py
+"""
+Per-rule cost profiler for output highlighting.
+
+When profiling is enabled, OutputHighlighter swaps in an instrumented line
+highlighter that reports, for every rule it evaluates, whether the rule was
+rejected by the literal scan/pre-filter, whether it matched, and how long
+matching took. Samples are merged here per (context, rule name).
+
+Profiling is off by default. While it is off the regular line highlighter
+runs unchanged, so there is no cost.
+"""
+
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Rules costing more than this per highlighted line get a warning badge
+SLOW_RULE_THRESHOLD_US = 25.0
+
+# Pseudo rule names for the scans shared by all rules of a rule set
+KEYWORD_SCAN = "(keyword scan)"
+LITERAL_SCAN = "(literal scan)"
+
+# One evaluation sample: (rule name, kind, matched, rejected, nanoseconds)
+RuleSample = Tuple[str, str, bool, bool, int]
+
+
+@dataclass(slots=True)
+class RuleCost:
+    """
+    Accumulated cost of one rule within one context.
+
+    Attributes:
+        context: Rule set the rule ran in ("global" for global rules).
+        rule_name: Name of the highlight rule.
+        kind: "regex", "keyword" or "scan" (shared per-line scans).
+        hits: Lines on which the rule matched.
+        rejects: Lines skipped by the literal scan or pre-filter.
+        evaluations: Lines on which the rule actually ran.
+        time_ns: Cumulative matching time.
+        lines: Lines highlighted with the rule set (filled in snapshots).
+    """
+
+    context: str
+    rule_name: str
+    kind: str
+    hits: int = 0
+    rejects: int = 0
+    evaluations: int = 0
+    time_ns: int = 0
+    lines: int = 0
+
+    @property
+    def cost_per_line_us(self) -> float:
+        """Average matching time per highlighted line, in microseconds."""
+        if not self.lines:
+            return 0.0
+        return self.time_ns / self.lines / 1000.0
+
+    @property
+    def is_slow(self) -> bool:
+        return self.cost_per_line_us > SLOW_RULE_THRESHOLD_US
+
+
+class RuleProfiler:
+    """Thread-safe accumulator of per-rule samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._costs: Dict[Tuple[str, str], RuleCost] = {}
+        self._lines: Dict[str, int] = {}
+
+    def record_line(self, context: str, samples: Iterable[RuleSample]) -> None:
+        """Merge the samples of one highlighted line."""
+        with self._lock:
+            self._lines[context] = self._lines.get(context, 0) + 1
+            costs = self._costs
+            for name, kind, matched, rejected, elapsed_ns in samples:
+                cost = costs.get((context, name))
+                if cost is None:
+                    cost = costs[(context, name)] = RuleCost(context, name, kind)
+                if rejected:
+                    cost.rejects += 1
+                    continue
+                cost.evaluations += 1
+                cost.time_ns += elapsed_ns
+                if matched:
+                    cost.hits += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._costs.clear()
+            self._lines.clear()
+
+    def snapshot(self) -> List[RuleCost]:
+        """Return copies of all accumulated costs."""
+        with self._lock:
+            return [
+                replace(cost, lines=self._lines.get(cost.context, 0))
+                for cost in self._costs.values()
+            ]
+
+    def get(self, context: str, rule_name: str) -> Optional[RuleCost]:
+        """Return a copy of the cost of one rule, or None if never evaluated."""
+        with self._lock:
+            cost = self._costs.get((context, rule_name))
+            if cost is None:
+                return None
+            return replace(cost, lines=self._lines.get(context, 0))
+
+    def slowest(self, limit: int = 10) -> List[RuleCost]:
+        """Return the rules with the highest cost per line."""
+        costs = self.snapshot()
+        costs.sort(key=lambda c: c.cost_per_line_us, reverse=True)
+        return costs[:limit]
@@ -0,0 +1,256 @@
+# zashterminal/terminal/highlighter/pygments_cache.py
+"""
+Process-wide cache of Pygments lexers and formatters.
+
+Every terminal proxy, the shell input highlighter and the AI chat panel
+used to resolve their own lexers and build their own formatters. Lexer
+lookup by file name walks the whole plugin registry (the first call also
+imports the lexer mapping), and building a Terminal256Formatter maps every
+style color to the 256-color palette, so both are worth doing once per
+process.
+
+Lexers are cached as (class, options) and instantiated per caller, since
+callers such as StreamingCatColorizer keep per-file state next to them;
+formatters are shared. warm_up() resolves the most common languages on the
+CPU worker pool at startup so the first cat in a new tab does not stall.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from ...utils.logger import get_logger
+
+# Entries kept per cache before the least recently used one is dropped
+_LEXER_CACHE_SIZE = 256
+_FORMATTER_CACHE_SIZE = 16
+
+# Fallback styles when the configured one is not installed
+_FALLBACK_DARK_STYLE = "monokai"
+_FALLBACK_LIGHT_STYLE = "default"
+
+# Shebang interpreter fragments and the lexer used for them
+_SHEBANG_LEXERS = (
+    (("bash", "/sh", " sh", "zsh", "ksh", "dash", "fish"), "bash"),
+    (("python",), "python"),
+    (("perl",), "perl"),
+    (("ruby",), "ruby"),
+    (("node",), "javascript"),
+)
+
+# File names resolved by warm_up(), most common first
+_WARM_UP_FILENAMES = (
+    "x.py",
+    "x.sh",
+    "x.json",
+    "x.yaml",
+    "x.js",
+    "x.ts",
+    "x.c",
+    "x.h",
+    "x.cpp",
+    "x.go",
+    "x.rs",
+    "x.java",
+    "x.md",
+    "x.html",
+    "x.css",
+    "x.xml",
+    "x.toml",
+    "x.ini",
+    "x.sql",
+    "x.php",
+    "x.rb",
+    "x.lua",
+    "Makefile",
+    "Dockerfile",
+)
+
+# (lexer class, constructor options)
+_LexerSpec = Tuple[type, Dict[str, Any]]
+
+logger = get_logger("zashterminal.terminal.pygments_cache")
+
+
+# Cache miss marker (None is a valid cached value)
+_MISSING = object()
+
+
+class _LRUCache:
+    """Small thread-safe LRU mapping; misses are reported as _MISSING."""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return _MISSING
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """Store a value unless another thread got there first; return the kept one."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = value
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+            return value
+
+
+# Keys: ("file", basename), ("shebang", interpreter),
+# ("alias", name). Values: _LexerSpec, or None when Pygments has no lexer
+_lexer_cache = _LRUCache(_LEXER_CACHE_SIZE)
+# Keys: (style name, light background). Values: Terminal256Formatter
+_formatter_cache = _LRUCache(_FORMATTER_CACHE_SIZE)
+
+
+def _instantiate(spec: Optional[_LexerSpec]):
+    if spec is None:
+        return None
+    lexer_class, options = spec
+    return lexer_class(**options)
+
+
+def _resolve_file_lexer(basename: str) -> Optional[_LexerSpec]:
+    from pygments.lexers import get_lexer_for_filename
+    from pygments.util import ClassNotFound
+
+    try:
+        lexer_class = type(get_lexer_for_filename(basename))
+    except ClassNotFound:
+        return None
+    options: Dict[str, Any] = {}
+    if basename.lower().endswith(".php"):
+        options = {"startinline": True}
+    return (lexer_class, options)
+
+
+def get_lexer_for_file(filename: str):
+    """
+    Return a new lexer for a file name, or None if no lexer matches.
+
+    The lexer class is cached per basename: Pygments matches whole file
+    name patterns (nginx.conf, CMakeLists.txt, meson.build), so the
+    extension alone does not decide it. PHP files get startinline so code
+    without a leading <?php is recognized.
+    """
+    basename = os.path.basename(filename)
+    key = ("file", basename)
+    spec = _lexer_cache.get(key)
+    if spec is _MISSING:
+        spec = _lexer_cache.put(key, _resolve_file_lexer(basename))
+    return _instantiate(spec)
+
+
+def get_lexer_by_alias(name: str):
+    """Return a new lexer for a Pygments alias (e.g. "bash"), or None."""
+    key = ("alias", name.lower())
+    spec = _lexer_cache.get(key)
+    if spec is _MISSING:
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+
+        try:
+            spec = (type(get_lexer_by_name(key[1])), {})
+        except ClassNotFound:
+            spec = None
+        spec = _lexer_cache.put(key, spec)
+    return _instantiate(spec)
+
+
+def get_lexer_for_shebang(line: str):
+    """
+    Return a new lexer for a "#!" line, or None if it names no known interpreter.
+
+    Args:
+        line: First line of the file.
+    """
+    if not line.startswith("#!"):
+        return None
+    parts = line[2:].strip().lower().split()
+    if not parts:
+        return None
+    interpreter = os.path.basename(parts[0])
+    if interpreter == "env" and len(parts) > 1:
+        interpreter = parts[1]
+    key = ("shebang", interpreter)
+    spec = _lexer_cache.get(key)
+    if spec is _MISSING:
+        spec = None
+        probe = f"/{interpreter} "
+        for fragments, name in _SHEBANG_LEXERS:
+            if any(fragment in probe for fragment in fragments):
+                lexer = get_lexer_by_alias(name)
+                spec = (type(lexer), {}) if lexer is not None else None
+                break
+        spec = _lexer_cache.put(key, spec)
+    return _instantiate(spec)
+
+
+def get_terminal_formatter(style_name: str, light: bool = False):
+    """
+    Return the shared Terminal256Formatter for a Pygments style.
+
+    Args:
+        style_name: Pygments style name.
+        light: Whether the style is used on a light background; picks the
+            fallback when the style is not installed.
+    """
+    key = (style_name.lower(), light)
+    formatter = _formatter_cache.get(key)
+    if formatter is _MISSING:
+        from pygments.formatters import Terminal256Formatter
+        from pygments.styles import get_style_by_name
+        from pygments.util import ClassNotFound
+
+        try:
+            style = get_style_by_name(key[0])
+        except ClassNotFound:
+            fallback = _FALLBACK_LIGHT_STYLE if light else _FALLBACK_DARK_STYLE
+            logger.warning(
+                f"Pygments style '{style_name}' not found, falling back to {fallback}"
+            )
+            style = get_style_by_name(fallback)
+        formatter = _formatter_cache.put(key, Terminal256Formatter(style=style))
+    return formatter
+
+
+def warm_up(styles: Iterable[Tuple[str, bool]] = ()) -> None:
+    """
+    Resolve the lexers of common languages and the given formatters.
+
+    Instantiating each lexer also compiles its token regexes, which Pygments
+    does once per class. The sample file names are not cached, as real
+    files are looked up by their own names. Meant to run on a worker thread.
+
+    Args:
+        styles: (style name, light background) pairs to build formatters for.
+    """
+    try:
+        for filename in _WARM_UP_FILENAMES:
+            _instantiate(_resolve_file_lexer(filename))
+        get_lexer_by_alias("bash")
+        get_lexer_by_alias("text")
+        for style_name, light in styles:
+            get_terminal_formatter(style_name, light)
+    except ImportError:
+        return
+    except Exception as e:
+        logger.debug(f"Pygments warm-up stopped early: {e}")
+        return
+    logger.debug("Pygments lexer cache warmed up")
+
+
+def schedule_warm_up(styles: Iterable[Tuple[str, bool]] = ()) -> None:
+    """Run warm_up() on the CPU worker pool."""
+    from ...core.tasks import AsyncTaskManager
+
+    AsyncTaskManager.get().submit_cpu(warm_up, list(styles))
@@ -0,0 +1,121 @@
+# zashterminal/terminal/highlighter/regex_lexing.py
+"""
+Resumable RegexLexer loop.
+
+RegexLexer.get_tokens_unprocessed() accepts a start stack but does not
+expose the stack it is in later on, which both the incremental shell input
+lexer and the streaming cat colorizer need to resume lexing. lex_steps()
+mirrors its loop and reports the state stack after every step. Callers
+check supports_lex_steps() first and lex with the lexer's own
+get_tokens_unprocessed() when it returns False.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterator, List, Sequence, Tuple
+
+# (offset, token type, value)
+_Token = Tuple[int, Any, str]
+
+# Pygments major version whose RegexLexer loop lex_steps() mirrors
+_MIRRORED_MAJOR_VERSION = "2"
+
+
+@lru_cache(maxsize=1)
+def _pygments_version_supported() -> bool:
+    import pygments
+
+    return pygments.__version__.split(".", 1)[0] == _MIRRORED_MAJOR_VERSION
+
+
+def supports_lex_steps(lexer) -> bool:
+    """
+    Whether lex_steps() can drive a lexer.
+
+    lex_steps() reads the private rule table of RegexLexer, so it is only
+    used for RegexLexers of the Pygments series it mirrors that carry that
+    table in the expected form.
+    """
+    from pygments.lexer import RegexLexer
+
+    if not isinstance(lexer, RegexLexer) or not _pygments_version_supported():
+        return False
+    tokendefs = getattr(lexer, "_tokens", None)
+    return isinstance(tokendefs, dict) and all(
+        len(rule) == 3 for rule in tokendefs.get("root", ((),))
+    )
+
+
+def lex_steps(
+    lexer, text: str, position: int, stack: Sequence[str]
+) -> Iterator[Tuple[int, List[str], Sequence[_Token]]]:
+    """
+    Lex text from a position and state stack, one rule match at a time.
+
+    Only for lexers supports_lex_steps() accepts.
+
+    Args:
+        lexer: RegexLexer instance.
+        text: Text prepared as by Lexer.get_tokens().
+        position: Offset to start lexing at.
+        stack: State stack at position; an unknown top state starts from
+            "root".
+
+    Yields:
+        (position, state stack, tokens) after each rule match or unmatched
+        character. The stack is the live list and must be copied to be
+        kept.
+    """
+    from pygments.token import Error, Whitespace, _TokenType
+
+    # Mirrors RegexLexer.get_tokens_unprocessed() of Pygments 2.19.2; keep
+    # in step with it when _MIRRORED_MAJOR_VERSION changes
+    tokendefs = lexer._tokens
+    statestack = list(stack)
+    if not statestack or statestack[-1] not in tokendefs:
+        statestack = ["root"]
+    statetokens = tokendefs[statestack[-1]]
+    length = len(text)
+
+    while True:
+        for rexmatch, action, new_state in statetokens:
+            match = rexmatch(text, position)
+            if not match:
+                continue
+            if action is None:
+                tokens: Sequence[_Token] = ()
+            elif type(action) is _TokenType:
+                tokens = ((position, action, match.group()),)
+            else:
+                tokens = list(action(lexer, match))
+            position = match.end()
+            if new_state is not None:
+                if isinstance(new_state, tuple):
+                    for state in new_state:
+                        if state == "#pop":
+                            if len(statestack) > 1:
+                                statestack.pop()
+                        elif state == "#push":
+                            statestack.append(statestack[-1])
+                        else:
+                            statestack.append(state)
+                elif isinstance(new_state, int):
+                    if abs(new_state) >= len(statestack):
+                        del statestack[1:]
+                    else:
+                        del statestack[new_state:]
+                elif new_state == "#push":
+                    statestack.append(statestack[-1])
+                statetokens = tokendefs[statestack[-1]]
+            break
+        else:
+            if position >= length:
+                return
+            if text[position] == "\n":
+                # At EOL the lexer resets to the root state
+                statestack = ["root"]
+                statetokens = tokendefs["root"]
+                tokens = ((position, Whitespace, "\n"),)
+            else:
+                tokens = ((position, Error, text[position]),)
+            position += 1
+        yield position, statestack, tokens
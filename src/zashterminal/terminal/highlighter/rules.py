@@ -5,15 +5,39 @@ Rule classes and utilities for terminal highlighting.
 This module contains:
 - CompiledRule: Compiled regex rule with pre-filter optimization
 - LiteralKeywordRule: Optimized rule for simple keyword patterns
+- KeywordAutomaton: Single-pass matcher for all literal keywords of a rule set
+- RequiredLiteralScanner: Single-pass candidate selection for regex rules
+- ByteLineGate: Byte-level test for lines no rule can match
+- RuleSet: Compiled rules plus the shared matchers built from them
 - Helper functions for pattern extraction and pre-filter creation
 """
 
 import re
 from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Tuple
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ...utils.sre_compat import REPEAT_OPCODES, sre_constants, sre_parse
 from .constants import KEYWORD_PATTERN, is_word_boundary
 
+_SRE_LITERAL = sre_constants.LITERAL
+_SRE_SUBPATTERN = sre_constants.SUBPATTERN
+_SRE_BRANCH = sre_constants.BRANCH
+
+# Character-class syntax the stdlib parser reads differently from the regex
+# module in VERSION1 mode (set operations); such patterns get no literals
+_VERSION1_SET_OPERATORS = ("--", "&&", "~~", "||")
+
 
 def smart_split_alternation(inner: str) -> List[str]:
     """
@@ -122,20 +146,20 @@ def extract_literal_keywords(pattern: str) -> Optional[Tuple[str, ...]]:
     return tuple(keywords)
 
 
-def extract_prefilter(pattern: str, rule_name: str) -> Optional[Callable[[str], bool]]:
+def extract_prefilter_literals(
+    pattern: str, rule_name: str
+) -> Optional[Tuple[str, ...]]:
     """
-    Create a fast pre-filter function for a rule pattern.
+    Find the substrings a rule's pre-filter looks for.
+
+    A lowercased line can only match the rule if it contains one of them.
 
-    Pre-filters are simple string checks that run before the regex.
-    If the pre-filter returns False, the regex is skipped entirely.
-    This provides massive speedup for lines that cannot match.
-    
     Args:
         pattern: The regex pattern string.
         rule_name: The name of the rule (used for heuristics).
 
     Returns:
-        A pre-filter function, or None if no efficient pre-filter can be created.
+        Tuple of lowercase literals, or None if no pre-filter can be derived.
     """
     # Extract keywords from word-boundary alternation patterns like \b(word1|word2)\b
     match = KEYWORD_PATTERN.match(pattern)
@@ -149,48 +173,183 @@ def extract_prefilter(pattern: str, rule_name: str) -> Optional[Callable[[str],
             if clean and clean.isalpha():
                 words.add(clean.lower())
         if words:
-            # Frozen tuple for slightly faster iteration
-            keywords = tuple(words)
-            return lambda line: any(kw in line for kw in keywords)
+            return tuple(words)
 
     # Pattern-specific pre-filters based on required characters
     rule_lower = rule_name.lower()
 
     # IPv4: requires dots and digits
     if "ipv4" in rule_lower or ("ip" in rule_lower and "v6" not in rule_lower):
-        return lambda line: "." in line
+        return (".",)
 
     # IPv6: requires colons
     if "ipv6" in rule_lower:
-        return lambda line: ":" in line
+        return (":",)
 
     # MAC address: requires colons or hyphens
     if "mac" in rule_lower and "address" in rule_lower:
-        return lambda line: ":" in line or "-" in line
+        return (":", "-")
 
     # UUID/GUID: requires hyphens
     if "uuid" in rule_lower or "guid" in rule_lower:
-        return lambda line: "-" in line
+        return ("-",)
 
     # URLs: requires http
     if "url" in rule_lower or "http" in rule_lower:
-        return lambda line: "http" in line
+        return ("http",)
 
     # Email: requires @
     if "email" in rule_lower:
-        return lambda line: "@" in line
+        return ("@",)
 
     # Date (ISO): requires hyphens and digits
     if "date" in rule_lower:
-        return lambda line: "-" in line
+        return ("-",)
 
     # Quoted strings: requires quotes
     if "quote" in rule_lower or "string" in rule_lower:
-        return lambda line: '"' in line or "'" in line
+        return ('"', "'")
 
     return None
 
 
+def extract_prefilter(pattern: str, rule_name: str) -> Optional[Callable[[str], bool]]:
+    """
+    Create a fast pre-filter function for a rule pattern.
+
+    Pre-filters are simple string checks that run before the regex.
+    If the pre-filter returns False, the regex is skipped entirely.
+    This provides massive speedup for lines that cannot match.
+    
+    Args:
+        pattern: The regex pattern string.
+        rule_name: The name of the rule (used for heuristics).
+
+    Returns:
+        A pre-filter function, or None if no efficient pre-filter can be created.
+    """
+    return make_prefilter(extract_prefilter_literals(pattern, rule_name))
+
+
+def make_prefilter(
+    literals: Optional[Tuple[str, ...]],
+) -> Optional[Callable[[str], bool]]:
+    """Pre-filter testing a lowercased line for any of ``literals``."""
+    if not literals:
+        return None
+    if len(literals) == 1:
+        literal = literals[0]
+        return lambda line: literal in line
+    return lambda line: any(lit in line for lit in literals)
+
+
+def _has_version1_set_syntax(pattern: str) -> bool:
+    """Check for nested sets or set operations inside character classes."""
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char != "[":
+            i += 1
+            continue
+
+        j = i + 1
+        if j < length and pattern[j] == "^":
+            j += 1
+        if j < length and pattern[j] == "]":
+            j += 1  # Leading ] is a literal member
+        while j < length and pattern[j] != "]":
+            if pattern[j] == "\\":
+                j += 2
+                continue
+            if pattern[j] == "[" or pattern[j : j + 2] in _VERSION1_SET_OPERATORS:
+                return True
+            j += 1
+        i = j + 1
+    return False
+
+
+def _required_literals_of_sequence(items: Any) -> Optional[Set[str]]:
+    """
+    Find a set of literals of which at least one occurs in any match.
+
+    Walks a parsed regex sequence, collecting runs of consecutive literal
+    characters plus the requirements of mandatory groups, repeats with a
+    minimum of one, and alternations where every branch has a requirement.
+    The most selective candidate (longest shortest-literal) wins.
+
+    Args:
+        items: Parsed sequence from the stdlib regex parser.
+
+    Returns:
+        Set of lowercase literals, or None if no requirement was found.
+    """
+    candidates: List[Set[str]] = []
+    run: List[str] = []
+
+    for op, av in items:
+        if op is _SRE_LITERAL:
+            run.append(chr(av))
+            continue
+
+        if run:
+            candidates.append({"".join(run).lower()})
+            run = []
+
+        required = None
+        if op is _SRE_SUBPATTERN:
+            required = _required_literals_of_sequence(av[-1])
+        elif op in REPEAT_OPCODES and av[0] >= 1:
+            required = _required_literals_of_sequence(av[2])
+        elif op is _SRE_BRANCH:
+            branches = [_required_literals_of_sequence(b) for b in av[1]]
+            if branches and all(branches):
+                required = set().union(*branches)
+
+        if required:
+            candidates.append(required)
+
+    if run:
+        candidates.append({"".join(run).lower()})
+
+    if not candidates:
+        return None
+
+    return max(candidates, key=lambda c: (min(len(lit) for lit in c), -len(c)))
+
+
+def extract_required_literals(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    Extract literals that any match of a regex pattern must contain.
+
+    For example, (HTTP/[\\d.]+)\\s+(5\\d{2}) requires "http/", and
+    (Exited|Restarting) requires one of "exited" or "restarting". Lines that
+    contain none of the literals can skip the regex entirely.
+
+    Args:
+        pattern: A regex pattern string.
+
+    Returns:
+        Tuple of lowercase literals, or None if none can be extracted safely.
+    """
+    if _has_version1_set_syntax(pattern):
+        return None
+
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except Exception:
+        # regex-module-only syntax: rule keeps its regular prefilter
+        return None
+
+    required = _required_literals_of_sequence(parsed)
+    if not required:
+        return None
+    return tuple(sorted(required))
+
+
 @dataclass(slots=True)
 class CompiledRule:
     """
@@ -205,6 +364,13 @@ class CompiledRule:
         action: "next" to continue processing, "stop" to halt after match.
         num_groups: Number of capture groups in the pattern.
         prefilter: Optional function that returns True if regex should run.
+        name: Name of the source HighlightRule (for profiling/diagnostics).
+        risky: True if static analysis found a backtracking risk; such rules
+            are disabled on their first match timeout.
+        required_literals: Literals one of which every match contains (see
+            extract_required_literals), or None if none are known.
+        prefilter_literals: Literals the pre-filter looks for (see
+            extract_prefilter_literals), or None without a pre-filter.
     """
 
     pattern: Any  # Compiled regex pattern
@@ -212,6 +378,10 @@ class CompiledRule:
     action: str  # "next" or "stop"
     num_groups: int
     prefilter: Optional[Callable[[str], bool]]  # Returns True if regex should run
+    name: str = ""
+    risky: bool = False
+    required_literals: Optional[Tuple[str, ...]] = None
+    prefilter_literals: Optional[Tuple[str, ...]] = None
 
 
 @dataclass(slots=True)
@@ -231,12 +401,14 @@ class LiteralKeywordRule:
         keyword_tuple: Tuple of keywords for iteration.
         ansi_color: Single ANSI color code for all matches.
         action: "next" to continue processing, "stop" to halt after match.
+        name: Name of the source HighlightRule (for profiling/diagnostics).
     """
 
     keywords: frozenset  # Frozen set of lowercase keywords for O(1) lookup
     keyword_tuple: Tuple[str, ...]  # Tuple of keywords for iteration
     ansi_color: str  # Single ANSI color (keyword rules use one color)
     action: str  # "next" or "stop"
+    name: str = ""
 
     def find_matches(self, line: str, line_lower: str) -> List[Tuple[int, int, str]]:
         """
@@ -270,3 +442,399 @@ class LiteralKeywordRule:
                 start = pos + 1
 
         return matches
+
+
+# Lookarounds equivalent to is_word_boundary() for ASCII word characters
+_KEYWORD_BOUNDARY_BEFORE = r"(?<![0-9A-Za-z_])"
+_KEYWORD_BOUNDARY_AFTER = r"(?![0-9A-Za-z_])"
+
+
+def _trie_to_regex(node: Dict[str, Any]) -> str:
+    """
+    Convert a keyword trie into a nested regex alternation.
+
+    Shared prefixes are factored out ("fail", "failed", "failure" becomes
+    "fail(?:ed|ure)?"), so the regex engine walks the trie once per start
+    position instead of retrying every keyword.
+
+    Args:
+        node: Trie node mapping characters to child nodes. The "" key marks
+              the end of a keyword.
+
+    Returns:
+        Regex source for the subtree (empty string for a leaf).
+    """
+    alternatives = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not alternatives:
+        return ""
+
+    is_terminal = "" in node
+    if len(alternatives) == 1 and not is_terminal:
+        return alternatives[0]
+
+    body = "(?:" + "|".join(alternatives) + ")"
+    # Greedy optional: longer keywords are tried first, so "failure" is
+    # never reported as "fail" followed by a failed boundary check
+    return body + "?" if is_terminal else body
+
+
+@dataclass(slots=True)
+class KeywordAutomaton:
+    """
+    Multi-pattern matcher for every LiteralKeywordRule in a rule set.
+
+    All keywords are merged into one trie-shaped regex anchored on word
+    boundaries, so a line is scanned once regardless of how many keyword
+    rules or keywords are active. Each hit is mapped back to the rules
+    that own the keyword, preserving per-rule colors and "stop" handling.
+
+    Attributes:
+        pattern: Compiled trie regex matching any keyword at word boundaries.
+        owners: Keyword -> indexes (in the rule tuple) of rules containing it.
+    """
+
+    pattern: Any  # Compiled trie regex
+    owners: Dict[str, Tuple[int, ...]]
+
+    def scan(self, line_lower: str) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Find all keyword hits in a lowercased line.
+
+        Args:
+            line_lower: Lowercase version of the line.
+
+        Returns:
+            Mapping of rule index -> list of (start, end) spans.
+        """
+        hits: Dict[int, List[Tuple[int, int]]] = {}
+        owners = self.owners
+        for match in self.pattern.finditer(line_lower):
+            span = match.span()
+            for rule_index in owners[match.group()]:
+                rule_hits = hits.get(rule_index)
+                if rule_hits is None:
+                    hits[rule_index] = [span]
+                else:
+                    rule_hits.append(span)
+        return hits
+
+
+def build_keyword_automaton(
+    rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...],
+) -> Optional[KeywordAutomaton]:
+    """
+    Build a KeywordAutomaton from the LiteralKeywordRules in a rule tuple.
+
+    Args:
+        rules: Compiled rules in evaluation order.
+
+    Returns:
+        The automaton, or None if the tuple has no literal keyword rules.
+    """
+    owners: Dict[str, List[int]] = {}
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, LiteralKeywordRule):
+            continue
+        for keyword in rule.keyword_tuple:
+            rule_indexes = owners.setdefault(keyword, [])
+            if index not in rule_indexes:
+                rule_indexes.append(index)
+
+    if not owners:
+        return None
+
+    trie: Dict[str, Any] = {}
+    for keyword in owners:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    pattern = re.compile(
+        _KEYWORD_BOUNDARY_BEFORE + _trie_to_regex(trie) + _KEYWORD_BOUNDARY_AFTER
+    )
+
+    return KeywordAutomaton(
+        pattern=pattern,
+        owners={kw: tuple(indexes) for kw, indexes in owners.items()},
+    )
+
+
+@dataclass(slots=True)
+class RequiredLiteralScanner:
+    """
+    Fused candidate scan for the regex rules of a rule set.
+
+    The required literals of every regex rule are merged into one trie
+    regex wrapped in a lookahead, so a single pass over the line reports
+    every literal occurrence (including overlapping ones). Only rules whose
+    literals were seen run their own pattern, which keeps match spans,
+    per-group colors and "stop" ordering exactly as with per-rule matching.
+
+    Single-character literals (".", ":", "%") occur on most lines, so they
+    are checked with a plain substring test instead of producing a trie hit
+    at every occurrence. Rules without extractable literals are not covered
+    and fall back to their own prefilter.
+
+    Attributes:
+        pattern: Compiled lookahead trie regex over multi-character literals,
+                 or None if every literal is a single character.
+        owners: Literal -> indexes of rules satisfied by it (including rules
+                requiring a literal that is a prefix of it).
+        char_owners: (character, rule indexes) pairs for 1-char literals.
+        covered: Indexes of the regex rules gated by this scanner.
+    """
+
+    pattern: Any  # Compiled lookahead trie regex
+    owners: Dict[str, Tuple[int, ...]]
+    char_owners: Tuple[Tuple[str, Tuple[int, ...]], ...]
+    covered: FrozenSet[int]
+
+    def scan(self, line_lower: str) -> Set[int]:
+        """
+        Find the covered rules whose required literals occur in the line.
+
+        Args:
+            line_lower: Lowercase version of the line.
+
+        Returns:
+            Set of rule indexes that may match.
+        """
+        candidates: Set[int] = set()
+        for char, rule_indexes in self.char_owners:
+            if char in line_lower:
+                candidates.update(rule_indexes)
+        if self.pattern is not None:
+            owners = self.owners
+            for match in self.pattern.finditer(line_lower):
+                candidates.update(owners[match.group(1)])
+        return candidates
+
+
+def build_required_literal_scanner(
+    rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...],
+) -> Optional[RequiredLiteralScanner]:
+    """
+    Build a RequiredLiteralScanner for the CompiledRules in a rule tuple.
+
+    Args:
+        rules: Compiled rules in evaluation order.
+
+    Returns:
+        The scanner, or None if no regex rule has required literals.
+    """
+    literal_rules: Dict[str, Set[int]] = {}
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, CompiledRule):
+            continue
+        literals = rule.required_literals
+        if not literals:
+            continue
+        for literal in literals:
+            literal_rules.setdefault(literal, set()).add(index)
+
+    if not literal_rules:
+        return None
+
+    char_owners = tuple(
+        (literal, tuple(sorted(rule_indexes)))
+        for literal, rule_indexes in sorted(literal_rules.items())
+        if len(literal) == 1
+    )
+    multi_char = {
+        literal: rule_indexes
+        for literal, rule_indexes in literal_rules.items()
+        if len(literal) > 1
+    }
+
+    # The trie regex reports the longest literal starting at a position, so
+    # each literal also satisfies rules requiring any of its prefixes
+    # (single-character prefixes are already handled by char_owners)
+    owners: Dict[str, Tuple[int, ...]] = {}
+    for literal in multi_char:
+        satisfied: Set[int] = set()
+        for prefix, rule_indexes in multi_char.items():
+            if literal.startswith(prefix):
+                satisfied.update(rule_indexes)
+        owners[literal] = tuple(sorted(satisfied))
+
+    pattern = None
+    if multi_char:
+        trie: Dict[str, Any] = {}
+        for literal in multi_char:
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        pattern = re.compile("(?=(" + _trie_to_regex(trie) + "))")
+
+    return RequiredLiteralScanner(
+        pattern=pattern,
+        owners=owners,
+        char_owners=char_owners,
+        covered=frozenset(i for indexes in literal_rules.values() for i in indexes),
+    )
+
+
+# Any byte outside ASCII; lines containing one are always decoded
+_NON_ASCII_BYTE = re.compile(rb"[\x80-\xff]")
+
+
+@dataclass(slots=True)
+class ByteLineGate:
+    """
+    Byte-level test for output lines that no rule of a rule set can match.
+
+    Every rule is gated by literals (keywords, required literals or
+    pre-filter literals), so an ASCII line containing none of them comes
+    out of highlighting unchanged. The gate finds the lines that do contain
+    one with a bytes.find() pass per literal over the lowercased chunk, so
+    the remaining lines can skip decode, highlight and encode entirely.
+    Lines with non-ASCII bytes are always reported, as they need decoding.
+
+    Keywords are matched as plain substrings, without the word-boundary
+    check of the KeywordAutomaton; an extra hit only costs a decode.
+
+    Attributes:
+        literals: Lowercase ASCII literals; none contains another.
+    """
+
+    literals: Tuple[bytes, ...]
+
+    def scan(self, data: bytes, max_lines: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Find the lines of raw output that may need highlighting.
+
+        Args:
+            data: Raw output chunk.
+            max_lines: Give up once more lines than this are hit.
+
+        Returns:
+            Sorted (start, end) byte ranges of runs of consecutive hit lines
+            (end includes the newline), or None if the limit was exceeded.
+        """
+        lower = data.lower()
+        find = lower.find
+        rfind = lower.rfind
+        starts: Set[int] = set()
+
+        for literal in self.literals:
+            pos = find(literal)
+            while pos != -1:
+                starts.add(rfind(b"\n", 0, pos) + 1)
+                if len(starts) > max_lines:
+                    return None
+                # One hit per line is enough: continue on the next line
+                pos = find(b"\n", pos)
+                if pos == -1:
+                    break
+                pos = find(literal, pos + 1)
+
+        if not data.isascii():
+            match = _NON_ASCII_BYTE.search(data)
+            while match is not None:
+                pos = match.start()
+                starts.add(rfind(b"\n", 0, pos) + 1)
+                if len(starts) > max_lines:
+                    return None
+                pos = find(b"\n", pos)
+                if pos == -1:
+                    break
+                match = _NON_ASCII_BYTE.search(data, pos + 1)
+
+        size = len(data)
+        runs: List[Tuple[int, int]] = []
+        run_start = run_end = -1
+        for start in sorted(starts):
+            end = find(b"\n", start) + 1 or size
+            if start != run_end:
+                if run_end != -1:
+                    runs.append((run_start, run_end))
+                run_start = start
+            run_end = end
+        if run_end != -1:
+            runs.append((run_start, run_end))
+        return runs
+
+
+def build_byte_line_gate(
+    rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...],
+) -> Optional[ByteLineGate]:
+    """
+    Build a ByteLineGate for a rule tuple.
+
+    Args:
+        rules: Compiled rules in evaluation order.
+
+    Returns:
+        The gate, or None if a regex rule has neither required nor
+        pre-filter literals (it may match any line).
+    """
+    literals: Set[str] = set()
+    for rule in rules:
+        if isinstance(rule, LiteralKeywordRule):
+            literals.update(rule.keyword_tuple)
+            continue
+        rule_literals = rule.required_literals or rule.prefilter_literals
+        if not rule_literals:
+            return None
+        literals.update(rule_literals)
+
+    # Non-ASCII literals cannot occur in the ASCII lines the gate passes,
+    # and a line containing a literal also contains any substring of it
+    ascii_literals = {lit for lit in literals if lit and lit.isascii()}
+    minimal = sorted(
+        lit
+        for lit in ascii_literals
+        if not any(other != lit and other in lit for other in ascii_literals)
+    )
+    return ByteLineGate(literals=tuple(lit.encode("ascii") for lit in minimal))
+
+
+@dataclass(slots=True)
+class RuleSet:
+    """
+    Compiled rules for one context, plus matchers shared across rules.
+
+    Iterating and len() behave like the plain rule tuple, so callers that
+    only need the rules (or a truthiness check) can treat it as one.
+
+    Attributes:
+        rules: Compiled rules in evaluation order.
+        keyword_automaton: Single-pass matcher for all literal keyword rules.
+        literal_scanner: Single-pass candidate selection for regex rules.
+        byte_gate: Byte-level test for lines no rule can match, or None
+            if some rule may match any line.
+        context: Context the rules were compiled for ("global" for the
+            global rule set).
+    """
+
+    rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...] = ()
+    keyword_automaton: Optional[KeywordAutomaton] = None
+    literal_scanner: Optional[RequiredLiteralScanner] = None
+    byte_gate: Optional[ByteLineGate] = None
+    context: str = "global"
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self) -> Iterator[Union[CompiledRule, LiteralKeywordRule]]:
+        return iter(self.rules)
+
+
+def build_rule_set(
+    rules: Tuple[Union[CompiledRule, LiteralKeywordRule], ...],
+    context: str = "global",
+) -> RuleSet:
+    """Create a RuleSet and its shared matchers from compiled rules."""
+    return RuleSet(
+        rules=rules,
+        keyword_automaton=build_keyword_automaton(rules),
+        literal_scanner=build_required_literal_scanner(rules),
+        byte_gate=build_byte_line_gate(rules),
+        context=context,
+    )
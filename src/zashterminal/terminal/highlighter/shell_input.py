@@ -7,9 +7,10 @@ commands as they are typed in real-time.
 """
 
 import threading
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...utils.logger import get_logger
+from .shell_lexer import IncrementalBashLexer
 
 
 # Singleton instance
@@ -57,6 +58,11 @@ class ShellInputHighlighter:
         # Key: proxy_id, Value: True if at prompt
         self._at_prompt: Dict[int, bool] = {}
 
+        # Incremental tokenizer state per proxy (see tokenize_buffer)
+        self._incremental_lexers: Dict[int, IncrementalBashLexer] = {}
+        # Lexer used when highlighting is disabled in settings
+        self._fallback_lexer = None
+
         # Color palette from terminal color scheme
         self._palette: Optional[List[str]] = None
         self._foreground: str = "#ffffff"
@@ -103,19 +109,16 @@ class ShellInputHighlighter:
             self._enabled = False
 
     def _init_lexer(self) -> None:
-        """Initialize Pygments lexer and formatter."""
+        """Initialize Pygments lexer and formatter from the shared cache."""
         try:
-            from pygments.lexers import BashLexer
-            from pygments.formatters import Terminal256Formatter
-            from pygments.styles import get_style_by_name
-            from pygments.util import ClassNotFound
+            from .pygments_cache import get_lexer_by_alias, get_terminal_formatter
 
-            self._lexer = BashLexer()
+            self._lexer = get_lexer_by_alias("bash")
 
             # Determine which theme to use based on mode
+            is_light_bg = self._is_light_color(self._background)
             if self._theme_mode == "auto":
                 # Auto mode: select theme based on background luminance
-                is_light_bg = self._is_light_color(self._background)
                 selected_theme = self._light_theme if is_light_bg else self._dark_theme
                 self.logger.debug(
                     f"Auto mode: bg={self._background}, light={is_light_bg}, "
@@ -125,17 +128,8 @@ class ShellInputHighlighter:
                 # Manual mode: use the legacy single theme setting
                 selected_theme = self._theme
 
-            # Create formatter with selected theme
-            try:
-                style = get_style_by_name(selected_theme)
-            except ClassNotFound:
-                # Fallback to monokai if theme not found
-                style = get_style_by_name("monokai")
-                self.logger.warning(
-                    f"Theme '{selected_theme}' not found, falling back to monokai"
-                )
-
-            self._formatter = Terminal256Formatter(style=style)
+            # Shared formatter; falls back to a stock style if not installed
+            self._formatter = get_terminal_formatter(selected_theme, is_light_bg)
 
             self.logger.debug(
                 f"Shell input highlighter initialized with theme: {selected_theme}"
@@ -194,6 +188,7 @@ class ShellInputHighlighter:
         with self._lock:
             self._command_buffers.pop(proxy_id, None)
             self._at_prompt.pop(proxy_id, None)
+            self._incremental_lexers.pop(proxy_id, None)
 
     def set_at_prompt(self, proxy_id: int, at_prompt: bool) -> None:
         """
@@ -291,26 +286,20 @@ class ShellInputHighlighter:
         """
         Get the color for a character based on its position in the buffer.
 
-        Tokenizes the full buffer and finds the token containing the last
-        character to determine its color.
+        Only a single-character buffer is colored here; longer buffers are
+        colored by the proxy (incrementally) and by highlight_input_line for
+        full line redraws, so they are not tokenized at all.
         """
         if not self._lexer or not self._formatter:
             return char
 
+        if len(buffer) != 1:
+            return char
+
         try:
             from pygments import highlight
 
-            # Highlight the full buffer
-            highlighted = highlight(buffer, self._lexer, self._formatter)
-
-            # For single char, just return it with color from the end of buffer
-            # This is a simplified approach that colors the whole buffer
-            if len(buffer) == 1:
-                return highlighted.rstrip("\n")
-
-            # Return just the character (the actual coloring happens in
-            # highlight_input_line for full line redraw)
-            return char
+            return highlight(buffer, self._lexer, self._formatter).rstrip("\n")
 
         except Exception:
             return char
@@ -344,6 +333,37 @@ class ShellInputHighlighter:
         except Exception:
             return line
 
+    def tokenize_buffer(self, proxy_id: int, buffer: str) -> List[Tuple[Any, str]]:
+        """
+        Tokenize a proxy's command buffer incrementally.
+
+        Lexer state is kept per proxy, so a keystroke only re-lexes from the
+        last stable token boundary before the first changed character
+        instead of the whole buffer.
+
+        Args:
+            proxy_id: The proxy ID
+            buffer: The full command buffer
+
+        Returns:
+            (token type, value) pairs, as returned by pygments.lex()
+        """
+        lexer = self._lexer
+        if lexer is None:
+            if self._fallback_lexer is None:
+                from .pygments_cache import get_lexer_by_alias
+
+                self._fallback_lexer = get_lexer_by_alias("bash")
+            lexer = self._fallback_lexer
+
+        with self._lock:
+            state = self._incremental_lexers.get(proxy_id)
+            if state is None or state.lexer is not lexer:
+                # First use, or the lexer was recreated by a settings refresh
+                state = IncrementalBashLexer(lexer)
+                self._incremental_lexers[proxy_id] = state
+        return state.tokenize(buffer)
+
     def get_current_buffer(self, proxy_id: int) -> str:
         """Get the current command buffer for a proxy."""
         with self._lock:
@@ -0,0 +1,186 @@
+# zashterminal/terminal/highlighter/shell_lexer.py
+"""
+Incremental tokenizer for shell input highlighting.
+
+Shell input highlighting used to run Pygments over the whole command buffer
+for every echoed character, which is quadratic in the length of the command
+line. IncrementalBashLexer keeps the tokens of the previous buffer together
+with the lexer state stack after every rule match. When the buffer changes,
+lexing resumes from the last checkpoint before the first changed character
+instead of from the start.
+
+The token stream is identical to ``pygments.lex(buffer, lexer)``.
+"""
+
+from typing import Any, List, Tuple
+
+from .regex_lexing import lex_steps, supports_lex_steps
+
+# (position, state stack, token count) after a rule match
+_Checkpoint = Tuple[int, Tuple[str, ...], int]
+
+_ROOT_STACK = ("root",)
+
+
+class IncrementalBashLexer:
+    """
+    Per-proxy incremental tokenizer wrapping a Pygments BashLexer.
+
+    Lexing only resumes from checkpoints where the lexer is back in its
+    root state, before any construct that may still be closed later (an
+    unmatched quote or here-document start). Such constructs change how
+    earlier text lexes once their terminator is typed.
+
+    Not thread-safe; each proxy owns its instance.
+    """
+
+    def __init__(self, lexer):
+        self._lexer = lexer
+        self._text = ""
+        self._tokens: List[Tuple[Any, str]] = []
+        self._offsets: List[int] = []
+        self._checkpoints: List[_Checkpoint] = []
+        # Resuming past this offset is unsafe (see _find_barrier)
+        self._barrier = 0
+
+    @property
+    def lexer(self):
+        return self._lexer
+
+    def reset(self) -> None:
+        """Forget the previous buffer."""
+        self._text = ""
+        self._tokens = []
+        self._offsets = []
+        self._checkpoints = []
+        self._barrier = 0
+
+    def tokenize(self, buffer: str) -> List[Tuple[Any, str]]:
+        """
+        Tokenize a command buffer, reusing the previous result.
+
+        Args:
+            buffer: The full command buffer.
+
+        Returns:
+            (token type, value) pairs, as returned by pygments.lex().
+        """
+        lexer = self._lexer
+        if lexer.filters or not supports_lex_steps(lexer):
+            from pygments import lex
+
+            return list(lex(buffer, lexer))
+
+        text = self._prepare(buffer)
+        old_text = self._text
+        limit = min(len(text), len(old_text), self._barrier)
+        # Length of the unchanged prefix (binary search on slice compares)
+        low, high = 0, limit
+        while low < high:
+            middle = (low + high + 1) // 2
+            if text[:middle] == old_text[:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        common = low
+
+        # Rules look at most one character past their match (\b, (?=\s)),
+        # so a checkpoint is reusable if the character at it is unchanged
+        # and no failed match attempt before it reached the change
+        stable = self._stable_limit(text, common)
+        checkpoint: _Checkpoint = (0, _ROOT_STACK, 0)
+        keep = 0
+        for index in range(len(self._checkpoints) - 1, -1, -1):
+            candidate = self._checkpoints[index]
+            if (
+                candidate[0] < common
+                and candidate[0] <= stable
+                and candidate[1] == _ROOT_STACK
+            ):
+                checkpoint = candidate
+                keep = index + 1
+                break
+
+        position, stack, token_count = checkpoint
+        del self._checkpoints[keep:]
+        del self._tokens[token_count:]
+        del self._offsets[token_count:]
+
+        self._lex_from(text, position, stack)
+        self._text = text
+        # Kept tokens all start before the old barrier; only the last one
+        # (a '$' before a re-lexed quote) can become a barrier
+        self._barrier = self._find_barrier(max(token_count - 1, 0), len(text))
+        return list(self._tokens)
+
+    def _prepare(self, buffer: str) -> str:
+        """Apply the input normalization of Lexer.get_tokens()."""
+        lexer = self._lexer
+        text = buffer.replace("\r\n", "\n").replace("\r", "\n")
+        if lexer.stripall:
+            text = text.strip()
+        elif lexer.stripnl:
+            text = text.strip("\n")
+        if lexer.tabsize > 0:
+            text = text.expandtabs(lexer.tabsize)
+        if lexer.ensurenl and not text.endswith("\n"):
+            text += "\n"
+        return text
+
+    @staticmethod
+    def _stable_limit(text: str, common: int) -> int:
+        """
+        Return the earliest offset a failed match attempt may span to common.
+
+        The variable assignment rule (word, whitespace, '+=') and the
+        keyword rule (keyword, whitespace, word boundary) try matches
+        across a word and the whitespace after it before falling back to
+        shorter tokens.
+        """
+        end = common
+        if end and text[end - 1] == "+":
+            end -= 1
+        while end and text[end - 1].isspace():
+            end -= 1
+        while end and (text[end - 1].isalnum() or text[end - 1] == "_"):
+            end -= 1
+        return end
+
+    def _find_barrier(self, start: int, length: int) -> int:
+        """
+        Return the offset of the first construct that may still close.
+
+        An unmatched quote lexes as an Error token and an unterminated
+        here-document as plain '<' text. A here-document that did match
+        may still grow when more text arrives. Once the terminator is
+        typed, the whole construct lexes differently. The same goes for a
+        '$' lexed as text right before a quote ($"..." and $'...').
+        """
+        from pygments.token import Error, Operator, Text
+
+        tokens = self._tokens
+        for index in range(start, len(tokens)):
+            token_type, value = tokens[index]
+            if token_type is Error or (value[:1] == "<" and token_type is not Operator):
+                return self._offsets[index]
+            if (
+                token_type is Text
+                and value == "$"
+                and index + 1 < len(tokens)
+                and tokens[index + 1][1][:1] in ("'", '"')
+            ):
+                return self._offsets[index]
+        return length
+
+    def _lex_from(self, text: str, position: int, stack: Tuple[str, ...]) -> None:
+        """Lex text from a checkpoint, recording tokens and checkpoints."""
+        tokens = self._tokens
+        offsets = self._offsets
+        checkpoints = self._checkpoints
+
+        steps = lex_steps(self._lexer, text, position, stack)
+        for position, statestack, step in steps:
+            for offset, token_type, value in step:
+                offsets.append(offset)
+                tokens.append((token_type, value))
+            checkpoints.append((position, tuple(statestack), len(tokens)))
@@ -0,0 +1,190 @@
+# zashterminal/terminal/highlighter/telemetry.py
+"""
+Per-proxy highlighting telemetry.
+
+HighlightTelemetry counts what a HighlightedTerminalProxy reads from the
+PTY, what it feeds to VTE, how many lines it highlights and how often it
+falls back to raw output, plus the latency from PTY read to feed. It tells
+apart a slow child process (bytes in is low), a slow highlighter (latency
+and fallbacks go up) and a slow VTE (bytes fed keeps pace, the screen does
+not).
+
+Telemetry is off by default: the proxy then holds no HighlightTelemetry at
+all and every hook is a single None check.
+"""
+
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+# Latency samples kept for the percentiles (most recent ones)
+_LATENCY_SAMPLES = 2048
+# Reads waiting for their output to be fed; older ones are sampled early
+_MAX_PENDING_READS = 256
+
+
+@dataclass(slots=True)
+class TelemetrySnapshot:
+    """Counters of one proxy at a point in time."""
+
+    proxy_id: int
+    uptime: float
+    bytes_in: int
+    bytes_fed: int
+    lines_highlighted: int
+    raw_fallbacks: int
+    fallback_reasons: Dict[str, int] = field(default_factory=dict)
+    queue_high_water: int = 0
+    latency_p50_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    latency_samples: int = 0
+
+    def format(self) -> str:
+        """One-line summary, as written to the log."""
+        reasons = ", ".join(
+            f"{reason}={count}" for reason, count in sorted(self.fallback_reasons.items())
+        )
+        return (
+            f"proxy {self.proxy_id}: in={self.bytes_in}B fed={self.bytes_fed}B "
+            f"lines={self.lines_highlighted} fallbacks={self.raw_fallbacks}"
+            f"{f' ({reasons})' if reasons else ''} "
+            f"queue_hw={self.queue_high_water}B "
+            f"latency p50={self.latency_p50_ms:.2f}ms p99={self.latency_p99_ms:.2f}ms "
+            f"(n={self.latency_samples})"
+        )
+
+
+class HighlightTelemetry:
+    """
+    Counters of one proxy.
+
+    Updated from the GTK main thread, except lines_highlighted, which worker
+    threads also add to; a lost increment there is acceptable.
+
+    Latency is measured per PTY wakeup: a read whose output is fed before the
+    wakeup returns is sampled right away; otherwise it waits until the
+    proxy's queues have drained and is sampled at that feed. Under sustained
+    backlog, reads older than _MAX_PENDING_READS are sampled while still
+    queued, which under-reports their latency rather than hiding it.
+    """
+
+    __slots__ = (
+        "bytes_in",
+        "bytes_fed",
+        "lines_highlighted",
+        "raw_fallbacks",
+        "fallback_reasons",
+        "queue_high_water",
+        "_started",
+        "_latencies",
+        "_latency_pos",
+        "_latency_count",
+        "_pending_reads",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.bytes_in = 0
+        self.bytes_fed = 0
+        self.lines_highlighted = 0
+        self.raw_fallbacks = 0
+        self.fallback_reasons: Dict[str, int] = {}
+        self.queue_high_water = 0
+        self._started = time.monotonic()
+        self._latencies = array("d", bytes(8 * _LATENCY_SAMPLES))
+        self._latency_pos = 0
+        self._latency_count = 0
+        self._pending_reads: List[float] = []
+
+    def record_fallback(self, reason: str) -> None:
+        """Count one switch from highlighted to raw output."""
+        self.raw_fallbacks += 1
+        self.fallback_reasons[reason] = self.fallback_reasons.get(reason, 0) + 1
+
+    def record_queue_depth(self, nbytes: int) -> None:
+        if nbytes > self.queue_high_water:
+            self.queue_high_water = nbytes
+
+    def _sample(self, seconds: float) -> None:
+        self._latencies[self._latency_pos] = seconds
+        self._latency_pos = (self._latency_pos + 1) % _LATENCY_SAMPLES
+        if self._latency_count < _LATENCY_SAMPLES:
+            self._latency_count += 1
+
+    def end_read(self, read_time: float, backlog: bool) -> None:
+        """
+        Finish a PTY wakeup.
+
+        Args:
+            read_time: monotonic() time the data was read.
+            backlog: Whether part of the output is still queued.
+        """
+        if not backlog:
+            self._sample(time.monotonic() - read_time)
+            return
+        pending = self._pending_reads
+        pending.append(read_time)
+        if len(pending) > _MAX_PENDING_READS:
+            now = time.monotonic()
+            for started in pending[: len(pending) - _MAX_PENDING_READS]:
+                self._sample(now - started)
+            del pending[: len(pending) - _MAX_PENDING_READS]
+
+    def drained(self) -> None:
+        """Sample the reads waiting for output once the queues are empty."""
+        if not self._pending_reads:
+            return
+        now = time.monotonic()
+        for started in self._pending_reads:
+            self._sample(now - started)
+        self._pending_reads.clear()
+
+    def snapshot(self, proxy_id: int) -> TelemetrySnapshot:
+        count = self._latency_count
+        samples = sorted(self._latencies[:count]) if count else []
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(count - 1, int(p * count))] * 1000
+
+        return TelemetrySnapshot(
+            proxy_id=proxy_id,
+            uptime=time.monotonic() - self._started,
+            bytes_in=self.bytes_in,
+            bytes_fed=self.bytes_fed,
+            lines_highlighted=self.lines_highlighted,
+            raw_fallbacks=self.raw_fallbacks,
+            fallback_reasons=dict(self.fallback_reasons),
+            queue_high_water=self.queue_high_water,
+            latency_p50_ms=percentile(0.5),
+            latency_p99_ms=percentile(0.99),
+            latency_samples=count,
+        )
+
+
+class MeteredTerminal:
+    """
+    Stand-in for the Vte.Terminal passed through the proxy's feed paths
+    while telemetry is on; counts fed bytes and forwards everything else.
+    """
+
+    __slots__ = ("_terminal", "_telemetry", "_on_fed")
+
+    def __init__(self, terminal, telemetry: HighlightTelemetry, on_fed=None):
+        self._terminal = terminal
+        self._telemetry = telemetry
+        self._on_fed = on_fed
+
+    def feed(self, data: bytes) -> None:
+        self._terminal.feed(data)
+        self._telemetry.bytes_fed += len(data)
+        if self._on_fed is not None:
+            self._on_fed()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._terminal, name)
+
@@ -10,7 +10,7 @@ import threading
 import time
 import weakref
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 # Lazy import psutil - only when actually needed for process info
@@ -34,8 +34,9 @@ def _get_psutil():
 import gi
 
 gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
 gi.require_version("Vte", "3.91")
-from gi.repository import Gdk, GLib, GObject, Gtk, Vte
+from gi.repository import Adw, Gdk, GLib, GObject, Gtk, Vte
 
 from ..helpers import is_valid_url
 from ..sessions.models import SessionItem
@@ -497,6 +498,7 @@ class TerminalManager:
             int, Any
         ] = {}  # Dict[int, HighlightedTerminalProxy]
         self._highlight_manager = None
+        self._highlight_guard_connected = False
         self._balabit_gateway_prompt_shown: set[int] = set()
         self._balabit_gateway_prompt_submitted: set[int] = set()
         self._balabit_gateway_pending_auth: Dict[int, Dict[str, str]] = {}
@@ -589,7 +591,9 @@ class TerminalManager:
                     from .highlighter.output import get_output_highlighter
                     from .highlighter.shell_input import get_shell_input_highlighter
 
-                    get_output_highlighter()
+                    # Compile every context now so the first command of a
+                    # kind does not compile rules on the output path
+                    get_output_highlighter().warm_up()
                     get_shell_input_highlighter()
                     # Pre-import the proxy implementation to warm up GTK stack
                     from ._highlighter_impl import (
@@ -638,6 +642,81 @@ class TerminalManager:
             self._highlight_manager = _get_highlight_manager()
         return self._highlight_manager
 
+    def _register_highlight_proxy(
+        self,
+        terminal_id: int,
+        terminal: Vte.Terminal,
+        proxy,
+        session: Optional[SessionItem] = None,
+    ) -> None:
+        self._highlight_proxies[terminal_id] = proxy
+        if session is not None:
+            proxy.defer_hidden_override = session.defer_hidden_highlighting
+        terminal_ref = weakref.ref(terminal)
+
+        def on_bypass_changed(paused: bool) -> None:
+            term = terminal_ref()
+            if term is not None and self.tab_manager:
+                self.tab_manager.set_highlight_paused(term, paused)
+
+        proxy.on_highlight_bypass_changed = on_bypass_changed
+
+        if not self._highlight_guard_connected:
+            from ..core.signals import AppSignals
+
+            self._get_highlight_manager().connect(
+                "rule-auto-disabled", self._on_highlight_rule_auto_disabled
+            )
+            AppSignals.get().connect(
+                "session-updated", self._on_session_highlighting_updated
+            )
+            self._highlight_guard_connected = True
+
+    def _on_session_highlighting_updated(self, signals, session_name: str) -> None:
+        """
+        Apply a saved session's hidden-tab deferral to its open terminals.
+
+        The other highlighting overrides only take effect for new terminals,
+        but deferral is read on every PTY read, so it is pushed to the live
+        proxies.
+        """
+        session_store = getattr(self.parent_window, "session_store", None)
+        for terminal_id in self.registry.get_terminals_for_session(session_name):
+            proxy = self._highlight_proxies.get(terminal_id)
+            if proxy is None:
+                continue
+            info = self.registry.get_terminal_info(terminal_id) or {}
+            session = info.get("identifier")
+            if not isinstance(session, SessionItem):
+                continue
+            if session_store is not None:
+                # Terminals may hold a copy of the session; use the saved one
+                for index in range(session_store.get_n_items()):
+                    saved = session_store.get_item(index)
+                    if (
+                        saved.name == session.name
+                        and saved.folder_path == session.folder_path
+                    ):
+                        session = saved
+                        break
+            proxy.defer_hidden_override = session.defer_hidden_highlighting
+
+    def _on_highlight_rule_auto_disabled(
+        self, manager, rule_name: str, context_name: str
+    ) -> None:
+        toast_overlay = getattr(self.parent_window, "toast_overlay", None)
+        if toast_overlay is None:
+            return
+        if context_name == "global":
+            message = _(
+                "Highlight rule \"{rule}\" was disabled because it is too slow"
+            ).format(rule=rule_name)
+        else:
+            message = _(
+                "Highlight rule \"{rule}\" ({context}) was disabled because it is too slow"
+            ).format(rule=rule_name, context=context_name)
+        toast_overlay.add_toast(Adw.Toast(title=message, timeout=5))
+
     def _cleanup_highlight_proxy(self, terminal_id: int):
         proxy = self._highlight_proxies.pop(terminal_id, None)
         if proxy:
@@ -650,6 +729,35 @@ class TerminalManager:
             except Exception as e:
                 self.logger.error(f"Error stopping highlight proxy: {e}")
 
+    def set_highlight_telemetry_enabled(self, enabled: bool) -> None:
+        """Enable or disable highlighting telemetry on every open terminal."""
+        for proxy in list(self._highlight_proxies.values()):
+            proxy.set_telemetry_enabled(enabled)
+
+    def reset_highlight_telemetry(self) -> None:
+        for proxy in list(self._highlight_proxies.values()):
+            proxy.reset_telemetry()
+
+    def get_highlight_telemetry(self) -> List[Tuple[str, Any]]:
+        """
+        Return (terminal name, TelemetrySnapshot) for each terminal whose
+        highlight proxy has telemetry enabled.
+        """
+        snapshots = []
+        for terminal_id, proxy in list(self._highlight_proxies.items()):
+            snapshot = proxy.get_telemetry_snapshot()
+            if snapshot is None:
+                continue
+            info = self.registry.get_terminal_info(terminal_id) or {}
+            identifier = info.get("identifier", "Unknown")
+            terminal_name = (
+                identifier
+                if isinstance(identifier, str)
+                else getattr(identifier, "name", "Unknown")
+            )
+            snapshots.append((terminal_name, snapshot))
+        return snapshots
+
     def apply_settings_to_all_terminals(self):
         self.logger.info("Applying settings to all active terminals.")
         for terminal_id in self.registry.get_all_terminal_ids():
@@ -913,7 +1021,7 @@ class TerminalManager:
                     terminal_id=terminal_id,
                 )
                 if proxy:
-                    self._highlight_proxies[terminal_id] = proxy
+                    self._register_highlight_proxy(terminal_id, terminal, proxy, session)
                     self.logger.info(
                         f"Highlighted local terminal spawned (ID: {terminal_id})"
                     )
@@ -1028,7 +1136,7 @@ class TerminalManager:
                             terminal_id=terminal_id,
                         )
                         if proxy:
-                            self._highlight_proxies[terminal_id] = proxy
+                            self._register_highlight_proxy(terminal_id, terminal, proxy, session)
                             self.logger.info(
                                 f"Highlighted SSH terminal spawned (ID: {terminal_id})"
                             )
@@ -2325,7 +2433,7 @@ class TerminalManager:
                     terminal_id=terminal_id,
                 )
                 if proxy:
-                    self._highlight_proxies[terminal_id] = proxy
+                    self._register_highlight_proxy(terminal_id, terminal, proxy, session)
                 else:
                     # Fallback to standard
                     self.spawner.spawn_ssh_session(
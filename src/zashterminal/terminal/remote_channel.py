@@ -0,0 +1,308 @@
+# zashterminal/terminal/remote_channel.py
+"""
+Long-lived command channel to an SSH session.
+
+Running every file manager command (ls, command -v, printenv, du, df) as
+its own `ssh host cmd` pays a process spawn and a channel handshake per
+call, even when a ControlMaster is up. A RemoteCommandChannel instead keeps
+one `ssh host sh` open over the session's ControlPath and writes requests
+to the remote shell as they come. Each request carries an ID; the remote
+side answers with a header line holding the ID, the exit status and the
+size of the captured stdout and stderr, followed by that output, so replies
+are demultiplexed by a single reader thread. Requests from several threads
+are pipelined, so a command costs about one round trip once the channel is
+open. A request may also stream its stdout back in chunks as the command
+writes it, for output worth showing before the command ends.
+"""
+
+import itertools
+import os
+import shlex
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+# First bytes of a reply header; a record separator keeps it apart from
+# anything the user's shell startup files may print
+_REPLY_MARKER = b"\x1eZT "
+# Close a channel nobody used for this long, so it does not keep the
+# ControlMaster alive past its ControlPersist window on its own
+_IDLE_TIMEOUT_S = 60.0
+
+# Exit status field of the header of a streamed stdout chunk
+_CHUNK_STATUS = b"-"
+
+# Sent once on start. Each request runs in a subshell with stdin closed,
+# its output goes to two temporary files, and the reply header gives their
+# sizes so the output can hold any bytes. A streamed request pipes stdout
+# through dd instead and sends each piece under a chunk header before the
+# final reply. dd stops after a fixed number of reads of the pipe, however
+# short, so a piece comes as soon as output flows and still spans enough
+# of it to keep the per-piece process spawns cheap.
+_BOOTSTRAP = b"""\
+__zt_o=$(mktemp) && __zt_e=$(mktemp) && __zt_r=$(mktemp) || exit 1
+trap 'rm -f "$__zt_o" "$__zt_e" "$__zt_r"' EXIT
+trap 'exit 1' HUP INT TERM
+__zt_run() {
+  (eval "$2") </dev/null >"$__zt_o" 2>"$__zt_e"
+  __zt_rc=$?
+  printf '\\036ZT %s %s %s %s\\n' "$1" "$__zt_rc" \
+    $(wc -c <"$__zt_o") $(wc -c <"$__zt_e")
+  cat "$__zt_o" "$__zt_e"
+}
+__zt_stream() {
+  { (eval "$2") </dev/null 2>"$__zt_e"; echo $? >"$__zt_r"; } | while :; do
+    dd bs=65536 count=16 of="$__zt_o" 2>/dev/null
+    __zt_n=$(wc -c <"$__zt_o")
+    [ $__zt_n -gt 0 ] || break
+    printf '\\036ZT %s - %s 0\\n' "$1" $__zt_n
+    cat "$__zt_o"
+  done
+  printf '\\036ZT %s %s 0 %s\\n' "$1" "$(cat "$__zt_r")" $(wc -c <"$__zt_e")
+  cat "$__zt_e"
+}
+"""
+
+
+class RemoteChannelError(Exception):
+    """Raised when the channel is closed before a request got its reply."""
+
+
+@dataclass(slots=True)
+class RemoteCommandResult:
+    """Exit status and captured output of a command run over a channel."""
+
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+
+
+@dataclass(slots=True)
+class _PendingReply:
+    event: threading.Event = field(default_factory=threading.Event)
+    result: Optional[RemoteCommandResult] = None
+    # Receives streamed stdout chunks; returns False to drop the rest
+    on_output: Optional[Callable[[bytes], bool]] = None
+    last_output: float = field(default_factory=time.monotonic)
+
+
+class RemoteCommandChannel:
+    """A persistent `ssh host sh` answering pipelined, ID-tagged requests."""
+
+    def __init__(
+        self, ssh_command: List[str], env: Optional[Dict[str, str]], name: str
+    ):
+        """
+        Args:
+            ssh_command: Full command line starting the remote shell.
+            env: Extra environment for the ssh process (e.g. SSHPASS).
+            name: Session name, for logging.
+        """
+        self.logger = get_logger("zashterminal.remote_channel")
+        self.name = name
+        self._ssh_command = ssh_command
+        self._env = env
+        self._process: Optional[subprocess.Popen] = None
+        self._pending: Dict[bytes, _PendingReply] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._answered = False
+        self._last_used = time.monotonic()
+        self._idle_timer: Optional[threading.Timer] = None
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and (
+            self._process is None or self._process.poll() is None
+        )
+
+    @property
+    def answered(self) -> bool:
+        """Whether the remote shell replied to at least one request."""
+        return self._answered
+
+    def start(self) -> None:
+        """Start the ssh process and its reader thread."""
+        run_env = None
+        if self._env:
+            run_env = os.environ.copy()
+            run_env.update(self._env)
+        self._process = subprocess.Popen(
+            self._ssh_command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=run_env,
+            start_new_session=True,
+        )
+        self._process.stdin.write(_BOOTSTRAP)
+        self._process.stdin.flush()
+        threading.Thread(
+            target=self._read_replies,
+            name=f"remote-channel-{self.name}",
+            daemon=True,
+        ).start()
+        self.logger.debug(f"Command channel started for {self.name}")
+
+    def run(
+        self,
+        command: List[str],
+        timeout: float,
+        on_output: Optional[Callable[[bytes], bool]] = None,
+    ) -> RemoteCommandResult:
+        """
+        Run a command on the remote host and wait for its reply.
+
+        The command is quoted the same way as for `ssh host cmd`, so it is
+        interpreted exactly as a one-off ssh call would.
+
+        Args:
+            command: The command to run as a list of strings.
+            timeout: Seconds to wait for the reply; when streaming, seconds
+                to wait without any output.
+            on_output: Stream stdout to this callable, called from the
+                reader thread with each chunk as it arrives; the result then
+                has empty stdout. Returning False drops the rest of the
+                output, though the command still runs to its end.
+
+        Raises:
+            RemoteChannelError: The channel closed before the reply came.
+            TimeoutError: No reply within timeout; the channel is closed.
+        """
+        command_str = " ".join(shlex.quote(part) for part in command)
+        pending = _PendingReply(on_output=on_output)
+        with self._lock:
+            if self._closed:
+                raise RemoteChannelError("channel closed")
+            request_id = str(next(self._ids)).encode()
+            self._pending[request_id] = pending
+            self._last_used = time.monotonic()
+        request = b"%s %s %s\n" % (
+            b"__zt_run" if on_output is None else b"__zt_stream",
+            request_id,
+            shlex.quote(command_str).encode("utf-8", "surrogateescape"),
+        )
+        try:
+            with self._write_lock:
+                self._process.stdin.write(request)
+                self._process.stdin.flush()
+        except (OSError, ValueError) as e:
+            self.close()
+            raise RemoteChannelError(f"write failed: {e}") from e
+
+        deadline = time.monotonic() + timeout
+        while not pending.event.wait(max(0.0, deadline - time.monotonic())):
+            # Streamed output shows the command is making progress
+            deadline = pending.last_output + timeout
+            if time.monotonic() >= deadline:
+                # The remote shell is stuck on this command and every later
+                # request would queue behind it
+                self.close()
+                raise TimeoutError(f"no reply within {timeout}s")
+        if pending.result is None:
+            raise RemoteChannelError("channel closed")
+        self._arm_idle_timer()
+        return pending.result
+
+    def close(self) -> None:
+        """Stop the remote shell and fail all pending requests."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+        for reply in pending:
+            reply.event.set()
+        process = self._process
+        if process is not None and process.poll() is None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            try:
+                process.terminate()
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            except OSError:
+                pass
+        self.logger.debug(f"Command channel closed for {self.name}")
+
+    def _arm_idle_timer(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+            self._idle_timer = threading.Timer(_IDLE_TIMEOUT_S, self._on_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _on_idle(self) -> None:
+        with self._lock:
+            idle = not self._pending and (
+                time.monotonic() - self._last_used >= _IDLE_TIMEOUT_S
+            )
+        if idle:
+            self.close()
+
+    def _read_replies(self) -> None:
+        stdout = self._process.stdout
+        try:
+            while True:
+                line = stdout.readline()
+                if not line:
+                    break
+                if not line.startswith(_REPLY_MARKER):
+                    continue
+                request_id, returncode, out_len, err_len = self._parse_header(line)
+                out = stdout.read(out_len)
+                err = stdout.read(err_len)
+                if len(out) != out_len or len(err) != err_len:
+                    break
+                if returncode is None:
+                    self._deliver_chunk(request_id, out)
+                    continue
+                with self._lock:
+                    reply = self._pending.pop(request_id, None)
+                self._answered = True
+                if reply is not None:
+                    reply.result = RemoteCommandResult(returncode, out, err)
+                    reply.event.set()
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Command channel for {self.name} failed: {e}")
+        finally:
+            self.close()
+
+    def _deliver_chunk(self, request_id: bytes, chunk: bytes) -> None:
+        with self._lock:
+            reply = self._pending.get(request_id)
+        if reply is None or reply.on_output is None:
+            return
+        reply.last_output = time.monotonic()
+        try:
+            wanted = reply.on_output(chunk)
+        except Exception as e:
+            self.logger.error(f"Streamed output handler failed: {e}")
+            wanted = False
+        if wanted is False:
+            reply.on_output = None
+
+    @staticmethod
+    def _parse_header(line: bytes) -> Tuple[bytes, Optional[int], int, int]:
+        """Split a reply header; the exit status is None for a stdout chunk."""
+        request_id, returncode, out_len, err_len = line[len(_REPLY_MARKER) :].split()
+        if returncode == _CHUNK_STATUS:
+            return request_id, None, int(out_len), int(err_len)
+        return request_id, int(returncode), int(out_len), int(err_len)
@@ -38,6 +38,12 @@ from ..utils.security import (
 )
 from ..utils.translation_utils import _
 from ..utils.osc7 import OSC7_HOST_DETECTION_SNIPPET
+from .remote_channel import RemoteChannelError, RemoteCommandChannel
+
+# After a command channel failed before answering anything (no remote sh,
+# authentication needing a prompt...), use one-off ssh calls for this long
+# before trying a channel again
+_CHANNEL_RETRY_DELAY_S = 60.0
 
 
 class ProcessTracker:
@@ -131,6 +137,9 @@ class ProcessSpawner:
         self.process_tracker = ProcessTracker()
         self.settings_manager = get_settings_manager()
         self._spawn_lock = threading.Lock()
+        self._command_channels: Dict[str, RemoteCommandChannel] = {}
+        self._channel_failures: Dict[str, float] = {}
+        self._channels_lock = threading.Lock()
         self.logger.info("Process spawner initialized on Linux")
 
     def _get_expected_terminal_size(
@@ -818,7 +827,11 @@ class ProcessSpawner:
                 return None
 
     def execute_remote_command_sync(
-        self, session: "SessionItem", command: List[str], timeout: int = 10
+        self,
+        session: "SessionItem",
+        command: List[str],
+        timeout: int = 10,
+        on_output: Optional[Callable[[bytes], bool]] = None,
     ) -> Tuple[bool, str]:
         """
         Executes a non-interactive command on a remote session synchronously.
@@ -831,6 +844,11 @@ class ProcessSpawner:
             session: The SSH session to execute the command on.
             command: The command to execute as a list of strings.
             timeout: Maximum time to wait in seconds (default 10).
+            on_output: Stream stdout to this callable as it arrives instead
+                of returning it; see RemoteCommandChannel.run(). Without a
+                channel it gets the whole output at once. A channel that
+                closes after streaming some output fails the command rather
+                than running it again.
 
         Returns:
             Tuple of (success: bool, output: str)
@@ -842,6 +860,41 @@ class ProcessSpawner:
             self._validate_ssh_session(session)
             # Use shorter connect timeout based on overall timeout
             connect_timeout = min(timeout - 2, 8) if timeout > 4 else timeout
+            channel = self._get_command_channel(session, connect_timeout)
+            if channel is not None:
+                streamed = False
+
+                def relay(chunk: bytes) -> bool:
+                    nonlocal streamed
+                    streamed = True
+                    return on_output(chunk)
+
+                try:
+                    reply = channel.run(
+                        command, timeout, relay if on_output is not None else None
+                    )
+                except TimeoutError:
+                    raise subprocess.TimeoutExpired(command, timeout)
+                except RemoteChannelError as e:
+                    self._record_channel_failure(session, channel)
+                    if streamed:
+                        # A rerun would stream the output again from the start
+                        self.logger.warning(
+                            f"Command channel for {session.name} closed mid-stream: {e}"
+                        )
+                        return False, _("Connection lost or unreachable.")
+                    self.logger.debug(
+                        f"Command channel for {session.name} unavailable ({e}), "
+                        "falling back to a one-off ssh call"
+                    )
+                else:
+                    return self._remote_command_outcome(
+                        session,
+                        reply.returncode,
+                        reply.stdout.decode("utf-8", "replace"),
+                        reply.stderr.decode("utf-8", "replace"),
+                    )
+
             result = self._build_non_interactive_ssh_command(
                 session, command, connect_timeout=connect_timeout
             )
@@ -865,33 +918,17 @@ class ProcessSpawner:
             proc_result = subprocess.run(
                 full_cmd, capture_output=True, text=True, timeout=timeout, env=run_env
             )
-
-            if proc_result.returncode == 0:
-                return True, proc_result.stdout
-            else:
-                error_output = (
-                    proc_result.stdout.strip() + "\n" + proc_result.stderr.strip()
-                ).strip()
-                # Check for connection-related errors
-                if any(
-                    err in error_output.lower()
-                    for err in [
-                        "connection",
-                        "timed out",
-                        "unreachable",
-                        "refused",
-                        "reset",
-                    ]
-                ):
-                    self.logger.warning(
-                        f"Connection issue for {session.name}: {error_output}"
-                    )
-                    return False, _("Connection lost or unreachable.")
-
-                self.logger.warning(
-                    f"Remote command failed for {session.name} with code {proc_result.returncode}: {error_output}"
-                )
-                return False, error_output
+            stdout = proc_result.stdout
+            if on_output is not None:
+                if stdout:
+                    on_output(stdout.encode("utf-8"))
+                stdout = ""
+            return self._remote_command_outcome(
+                session,
+                proc_result.returncode,
+                stdout,
+                proc_result.stderr,
+            )
         except subprocess.TimeoutExpired:
             self.logger.error(
                 f"Remote command timed out after {timeout}s for session {session.name}"
@@ -906,6 +943,103 @@ class ProcessSpawner:
             )
             return False, str(e)
 
+    def _remote_command_outcome(
+        self, session: "SessionItem", returncode: int, stdout: str, stderr: str
+    ) -> Tuple[bool, str]:
+        """Map the exit status and output of a remote command to a result."""
+        if returncode == 0:
+            return True, stdout
+
+        error_output = (stdout.strip() + "\n" + stderr.strip()).strip()
+        # Check for connection-related errors
+        if any(
+            err in error_output.lower()
+            for err in [
+                "connection",
+                "timed out",
+                "unreachable",
+                "refused",
+                "reset",
+            ]
+        ):
+            self.logger.warning(f"Connection issue for {session.name}: {error_output}")
+            return False, _("Connection lost or unreachable.")
+
+        self.logger.warning(
+            f"Remote command failed for {session.name} with code {returncode}: {error_output}"
+        )
+        return False, error_output
+
+    def _get_command_channel(
+        self, session: "SessionItem", connect_timeout: int
+    ) -> Optional[RemoteCommandChannel]:
+        """
+        Return the session's persistent command channel, starting it if needed.
+
+        Returns None when the session does not share a ControlPath (X11
+        forwarding) or a recent channel failed, so the caller runs the
+        command as a one-off ssh call instead.
+        """
+        if getattr(session, "x11_forwarding", False):
+            return None
+        key = self._get_ssh_control_path(session)
+        with self._channels_lock:
+            channel = self._command_channels.get(key)
+            if channel is not None and channel.alive:
+                return channel
+            failed_at = self._channel_failures.get(key)
+            if (
+                failed_at is not None
+                and time.monotonic() - failed_at < _CHANNEL_RETRY_DELAY_S
+            ):
+                return None
+
+            result = self._build_non_interactive_ssh_command(
+                session, ["exec", "sh"], connect_timeout=connect_timeout
+            )
+            if not result:
+                return None
+            ssh_cmd, sshpass_env = result
+            channel = RemoteCommandChannel(ssh_cmd, sshpass_env, session.name)
+            try:
+                channel.start()
+            except OSError as e:
+                self.logger.warning(
+                    f"Could not start command channel for {session.name}: {e}"
+                )
+                self._channel_failures[key] = time.monotonic()
+                return None
+            self._command_channels[key] = channel
+            return channel
+
+    def _record_channel_failure(
+        self, session: "SessionItem", channel: RemoteCommandChannel
+    ) -> None:
+        """Back off from channels for a session whose channel never answered."""
+        if channel.answered:
+            return
+        key = self._get_ssh_control_path(session)
+        with self._channels_lock:
+            self._channel_failures[key] = time.monotonic()
+
+    def close_command_channel(self, session: "SessionItem") -> None:
+        """Close the persistent command channel of a session, if any."""
+        key = self._get_ssh_control_path(session)
+        with self._channels_lock:
+            channel = self._command_channels.pop(key, None)
+            self._channel_failures.pop(key, None)
+        if channel is not None:
+            channel.close()
+
+    def close_command_channels(self) -> None:
+        """Close the persistent command channels of all sessions."""
+        with self._channels_lock:
+            channels = list(self._command_channels.values())
+            self._command_channels.clear()
+            self._channel_failures.clear()
+        for channel in channels:
+            channel.close()
+
     def test_ssh_connection(self, session: "SessionItem") -> Tuple[bool, str]:
         """
         Tests an SSH connection without spawning a full terminal.
@@ -1461,6 +1595,7 @@ class SSHConnectionChecker:
         Returns:
             True if successfully terminated (or wasn't active), False on error.
         """
+        self.spawner.close_command_channel(session)
         control_path = self.spawner._get_ssh_control_path(session)
 
         if not Path(control_path).exists():
@@ -1591,6 +1726,7 @@ def cleanup_spawner() -> None:
     if _spawner_instance is not None:
         with _spawner_lock:
             if _spawner_instance is not None:
+                _spawner_instance.close_command_channels()
                 _spawner_instance.process_tracker.terminate_all()
                 _spawner_instance = None
 
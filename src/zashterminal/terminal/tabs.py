@@ -606,6 +606,12 @@ class TabManager:
         label.set_width_chars(8)
         tab_widget.append(label)
 
+        # Shown while output highlighting is paused because of fast output
+        highlight_paused_icon = icon_image("media-playback-pause-symbolic", size=12)
+        highlight_paused_icon.set_tooltip_text(_("Highlighting paused (fast output)"))
+        highlight_paused_icon.set_visible(False)
+        tab_widget.append(highlight_paused_icon)
+
         close_button = icon_button(
             "window-close-symbolic", css_classes=["circular", "flat"]
         )
@@ -630,6 +636,8 @@ class TabManager:
 
         tab_widget.label_widget = label
         tab_widget.close_button = close_button  # Store direct reference
+        tab_widget.highlight_paused_icon = highlight_paused_icon
+        tab_widget._highlight_paused_terminals = weakref.WeakSet()
         tab_widget._base_title = session.name
         tab_widget._is_local = session.is_local()
         tab_widget.session_item = session
@@ -1408,6 +1416,22 @@ class TabManager:
             if hasattr(self.terminal_manager.parent_window, "_update_tab_layout"):
                 self.terminal_manager.parent_window._update_tab_layout()
 
+    def set_highlight_paused(self, terminal: Vte.Terminal, paused: bool) -> None:
+        """Shows or hides the "highlighting paused" indicator on a terminal's tab."""
+        page = self.get_page_for_terminal(terminal)
+        if not page:
+            return
+
+        for tab in self.tabs:
+            if self.pages.get(tab) == page:
+                paused_terminals = tab._highlight_paused_terminals
+                if paused:
+                    paused_terminals.add(terminal)
+                else:
+                    paused_terminals.discard(terminal)
+                tab.highlight_paused_icon.set_visible(len(paused_terminals) > 0)
+                break
+
     def update_all_tab_titles(self) -> None:
         """Updates all tab titles based on the current state of the terminal."""
         for tab in self.tabs:
@@ -38,6 +38,7 @@ class WindowActions:
             "ai-assistant": self.ai_assistant,
             "configure-ai": self.configure_ai,
             "highlight-settings": self.highlight_settings,
+            "highlight-telemetry": self.highlight_telemetry,
             "ask-ai-selection": self.ask_ai_selection,
             "split-horizontal": self.split_horizontal,
             "split-vertical": self.split_vertical,
@@ -213,6 +214,14 @@ class WindowActions:
         dialog = HighlightDialog(self.window)
         dialog.present()
 
+    def highlight_telemetry(self, *_args):
+        """Open the highlighting telemetry panel."""
+        self._hide_tooltip()
+        from .dialogs.highlight_telemetry_dialog import HighlightTelemetryDialog
+
+        dialog = HighlightTelemetryDialog(self.window)
+        dialog.present()
+
     def ask_ai_selection(self, *_args):
         """Ask AI about the selected text in the terminal."""
         terminal = self.window.tab_manager.get_selected_terminal()
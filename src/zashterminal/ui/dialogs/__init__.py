@@ -2,6 +2,7 @@ from .base_dialog import BaseDialog
 from .command_manager_dialog import CommandManagerDialog
 from .folder_edit_dialog import FolderEditDialog
 from .highlight_dialog import HighlightDialog, RuleEditDialog
+from .highlight_telemetry_dialog import HighlightTelemetryDialog
 from .move_dialogs import MoveLayoutDialog, MoveSessionDialog
 from .preferences_dialog import PreferencesDialog
 from .session_edit_dialog import SessionEditDialog
@@ -12,6 +13,7 @@ __all__ = [
     "CommandManagerDialog",
     "FolderEditDialog",
     "HighlightDialog",
+    "HighlightTelemetryDialog",
     "RuleEditDialog",
     "MoveLayoutDialog",
     "MoveSessionDialog",
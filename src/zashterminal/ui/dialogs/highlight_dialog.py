@@ -41,6 +41,59 @@ LOGICAL_COLOR_OPTIONS = get_foreground_color_options()
 TEXT_EFFECT_OPTIONS = get_text_effect_options()
 BACKGROUND_COLOR_OPTIONS = get_background_color_options()
 
+# Number of rules listed in the "Slowest Rules" view
+SLOWEST_RULES_LIMIT = 10
+
+
+def _get_rule_profiler():
+    """Return the output highlighter's rule profiler, or None if disabled."""
+    from ...terminal.highlighter import get_output_highlighter
+
+    return get_output_highlighter().get_rule_profiler()
+
+
+def _format_rule_cost(cost) -> str:
+    """Format a RuleCost as a compact "µs/line · hits" label."""
+    return _("{cost:.1f} µs/line · {hits} hits").format(
+        cost=cost.cost_per_line_us, hits=cost.hits
+    )
+
+
+def _add_rule_cost_suffix(row: Adw.PreferencesRow, context: str, rule_name: str) -> None:
+    """
+    Show profiled cost next to a rule row, with a warning badge if slow.
+
+    Does nothing while rule profiling is disabled or the rule has not run yet.
+    """
+    profiler = _get_rule_profiler()
+    if profiler is None:
+        return
+    cost = profiler.get(context, rule_name)
+    if cost is None:
+        return
+
+    tooltip = _(
+        "Matched {hits} times, skipped by pre-filter {rejects} times, "
+        "evaluated {evaluations} times"
+    ).format(hits=cost.hits, rejects=cost.rejects, evaluations=cost.evaluations)
+
+    if cost.is_slow:
+        warning_icon = icon_image("dialog-warning-symbolic")
+        warning_icon.add_css_class("warning")
+        warning_icon.set_valign(Gtk.Align.CENTER)
+        get_tooltip_helper().add_tooltip(
+            warning_icon,
+            _("This rule is expensive; consider a simpler pattern or a literal keyword"),
+        )
+        row.add_suffix(warning_icon)
+
+    cost_label = Gtk.Label(label=_format_rule_cost(cost))
+    cost_label.add_css_class("dim-label")
+    cost_label.add_css_class("caption")
+    cost_label.set_valign(Gtk.Align.CENTER)
+    get_tooltip_helper().add_tooltip(cost_label, tooltip)
+    row.add_suffix(cost_label)
+
 
 class ColorEntryRow(Adw.ActionRow):
     """
@@ -669,11 +722,22 @@ class RuleEditDialog(Adw.Window):
             self._validation_label.set_text(_("Invalid regex: {}").format(error_msg))
             self._validation_label.add_css_class("error")
             self._validation_label.remove_css_class("success")
+            self._validation_label.remove_css_class("warning")
             self._save_btn.set_sensitive(False)
         else:
-            self._validation_label.set_text(_("✓ Valid pattern"))
+            risks = self._manager.get_pattern_risks(pattern)
             self._validation_label.remove_css_class("error")
-            self._validation_label.add_css_class("success")
+            if risks:
+                # Still allowed: the match timeout protects the terminal
+                self._validation_label.set_text(
+                    _("⚠ Pattern may be very slow: {}").format("; ".join(risks))
+                )
+                self._validation_label.remove_css_class("success")
+                self._validation_label.add_css_class("warning")
+            else:
+                self._validation_label.set_text(_("✓ Valid pattern"))
+                self._validation_label.remove_css_class("warning")
+                self._validation_label.add_css_class("success")
             self._save_btn.set_sensitive(True)
 
     def _on_regex_help_clicked(self, button: Gtk.Button) -> None:
@@ -1154,6 +1218,7 @@ class ContextRulesDialog(Adw.Window):
         row = Adw.ActionRow()
         row.set_title(f"#{index + 1} {escaped_name}")
         row.set_subtitle(escaped_subtitle)
+        _add_rule_cost_suffix(row, self._context_name, rule.name)
 
         # Reorder buttons prefix
         reorder_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
@@ -1487,6 +1552,9 @@ class HighlightDialog(Adw.PreferencesWindow):
         # Global rules group (last, as it can be a longer list)
         self._setup_rules_group(self._global_page)
 
+        # Per-rule cost profiling
+        self._setup_rule_performance_group(self._global_page)
+
         # Apply initial sensitivity state for dependent groups
         self._update_dependent_groups_sensitivity()
 
@@ -2710,6 +2778,125 @@ class HighlightDialog(Adw.PreferencesWindow):
             self.emit("settings-changed")
             self.add_toast(Adw.Toast(title=_("Restored default ignored commands")))
 
+    def _setup_rule_performance_group(self, page: Adw.PreferencesPage) -> None:
+        """Setup the rule profiling toggle and the slowest rules view."""
+        perf_group = Adw.PreferencesGroup(
+            title=_("Rule Performance"),
+            description=_(
+                "Measure how much time each rule takes. Profiling adds some "
+                "overhead, so only enable it while tuning rules."
+            ),
+        )
+        page.add(perf_group)
+
+        self._profiling_toggle = Adw.SwitchRow(
+            title=_("Profile Rules"),
+            subtitle=_("Show hits and cost per line next to each rule"),
+        )
+        self._profiling_toggle.set_active(_get_rule_profiler() is not None)
+        self._profiling_toggle.connect("notify::active", self._on_profiling_toggled)
+        perf_group.add(self._profiling_toggle)
+
+        self._slowest_expander = Adw.ExpanderRow(title=_("Slowest Rules"))
+        self._slowest_expander.set_expanded(False)
+
+        refresh_btn = Gtk.Button(icon_name="view-refresh-symbolic")
+        refresh_btn.add_css_class("flat")
+        refresh_btn.set_valign(Gtk.Align.CENTER)
+        get_tooltip_helper().add_tooltip(refresh_btn, _("Refresh measurements"))
+        refresh_btn.connect("clicked", self._on_refresh_profile_clicked)
+        self._slowest_expander.add_suffix(refresh_btn)
+
+        reset_btn = Gtk.Button(icon_name="edit-clear-symbolic")
+        reset_btn.add_css_class("flat")
+        reset_btn.set_valign(Gtk.Align.CENTER)
+        get_tooltip_helper().add_tooltip(reset_btn, _("Clear measurements"))
+        reset_btn.connect("clicked", self._on_reset_profile_clicked)
+        self._slowest_expander.add_suffix(reset_btn)
+
+        perf_group.add(self._slowest_expander)
+
+        self._slowest_rule_rows: list[Adw.ActionRow] = []
+        self._populate_slowest_rules()
+
+        telemetry_row = Adw.ActionRow(
+            title=_("Output Telemetry"),
+            subtitle=_("Bytes, fallbacks and latency per terminal"),
+            activatable=True,
+        )
+        telemetry_row.add_suffix(icon_image("go-next-symbolic"))
+        telemetry_row.connect("activated", self._on_telemetry_row_activated)
+        perf_group.add(telemetry_row)
+
+    def _populate_slowest_rules(self) -> None:
+        """Fill the slowest rules view from the profiler."""
+        for row in self._slowest_rule_rows:
+            self._slowest_expander.remove(row)
+        self._slowest_rule_rows.clear()
+
+        profiler = _get_rule_profiler()
+        self._slowest_expander.set_sensitive(profiler is not None)
+        if profiler is None:
+            self._slowest_expander.set_subtitle(_("Profiling is disabled"))
+            return
+
+        costs = profiler.slowest(SLOWEST_RULES_LIMIT)
+        if not costs:
+            self._slowest_expander.set_subtitle(_("No measurements yet"))
+            return
+
+        self._slowest_expander.set_subtitle(
+            _("Top {count} by cost per line").format(count=len(costs))
+        )
+        for cost in costs:
+            row = Adw.ActionRow(
+                title=GLib.markup_escape_text(cost.rule_name),
+                subtitle=GLib.markup_escape_text(cost.context),
+            )
+            if cost.is_slow:
+                warning_icon = icon_image("dialog-warning-symbolic")
+                warning_icon.add_css_class("warning")
+                row.add_prefix(warning_icon)
+            cost_label = Gtk.Label(label=_format_rule_cost(cost))
+            cost_label.add_css_class("dim-label")
+            row.add_suffix(cost_label)
+            self._slowest_expander.add_row(row)
+            self._slowest_rule_rows.append(row)
+
+    def _refresh_rule_costs(self) -> None:
+        """Rebuild every view that shows profiled rule costs."""
+        self._populate_slowest_rules()
+        self._populate_rules()
+        if self._selected_context:
+            self._populate_context_rules()
+
+    def _on_profiling_toggled(self, switch: Adw.SwitchRow, _pspec) -> None:
+        """Enable or disable rule profiling."""
+        enabled = switch.get_active()
+        get_settings_manager().set("highlight_rule_profiling", enabled)
+
+        from ...terminal.highlighter import get_output_highlighter
+
+        get_output_highlighter().set_profiling_enabled(enabled)
+        self._refresh_rule_costs()
+
+    def _on_refresh_profile_clicked(self, button: Gtk.Button) -> None:
+        """Reload rule costs from the profiler."""
+        self._refresh_rule_costs()
+
+    def _on_telemetry_row_activated(self, row: Adw.ActionRow) -> None:
+        """Open the highlighting telemetry panel over this dialog."""
+        from .highlight_telemetry_dialog import HighlightTelemetryDialog
+
+        HighlightTelemetryDialog(self._parent_window, transient_for=self).present()
+
+    def _on_reset_profile_clicked(self, button: Gtk.Button) -> None:
+        """Discard collected rule costs."""
+        profiler = _get_rule_profiler()
+        if profiler is not None:
+            profiler.reset()
+        self._refresh_rule_costs()
+
     def _setup_context_settings_group(self, page: Adw.PreferencesPage) -> None:
         """Setup the context-aware settings group."""
         context_settings_group = Adw.PreferencesGroup(
@@ -3242,6 +3429,7 @@ class HighlightDialog(Adw.PreferencesWindow):
         row = Adw.ExpanderRow()
         row.set_title(f"#{index + 1} {escaped_name}")
         row.set_subtitle(escaped_subtitle)
+        _add_rule_cost_suffix(row, self._selected_context, rule.name)
 
         # Reorder buttons prefix (box with up/down arrows)
         reorder_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
@@ -3695,6 +3883,7 @@ class HighlightDialog(Adw.PreferencesWindow):
         row = Adw.ActionRow()
         row.set_title(escaped_name)
         row.set_subtitle(escaped_subtitle)
+        _add_rule_cost_suffix(row, "global", rule.name)
 
         # Color indicator prefix (shows first color)
         color_box = Gtk.Box()
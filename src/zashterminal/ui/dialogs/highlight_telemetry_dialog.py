@@ -0,0 +1,162 @@
+# zashterminal/ui/dialogs/highlight_telemetry_dialog.py
+
+from typing import List
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Adw, GLib, Gtk
+
+from ...settings.manager import get_settings_manager
+from ...utils.translation_utils import _
+from .base_dialog import BaseDialog
+
+# How often the counters shown are refreshed while the dialog is open
+REFRESH_INTERVAL_MS = 1000
+
+
+def _format_bytes(nbytes: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if nbytes < 1024:
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} GB"
+
+
+class HighlightTelemetryDialog(BaseDialog):
+    """
+    Live per-terminal counters of the output highlighting pipeline.
+
+    Shows, for each terminal of the window, the bytes read and fed, lines
+    highlighted, raw fallbacks, the highlight queue high-water mark and the
+    read-to-feed latency, to tell a slow program, a slow highlighter and a
+    slow VTE apart.
+    """
+
+    def __init__(self, parent_window, transient_for=None):
+        super().__init__(
+            parent_window,
+            _("Highlighting Telemetry"),
+            auto_setup_toolbar=True,
+            default_width=560,
+            default_height=520,
+            transient_for=transient_for or parent_window,
+        )
+        self._cancel_button.set_label(_("Close"))
+        self._terminal_rows: List[Adw.ExpanderRow] = []
+        self._refresh_source_id = None
+        self._setup_ui()
+        self._refresh()
+        self._refresh_source_id = GLib.timeout_add(
+            REFRESH_INTERVAL_MS, self._on_refresh_timeout
+        )
+        self.connect("close-request", self._on_close_request)
+
+    def _setup_ui(self) -> None:
+        page = Adw.PreferencesPage()
+
+        settings_group = Adw.PreferencesGroup(
+            description=_(
+                "Counts output read from and fed to each terminal. Collecting "
+                "adds a little overhead, so only enable it while investigating "
+                "slow output."
+            ),
+        )
+        page.add(settings_group)
+
+        self._enable_row = Adw.SwitchRow(title=_("Collect Telemetry"))
+        self._enable_row.set_active(
+            get_settings_manager().get("highlight_telemetry_enabled", False)
+        )
+        self._enable_row.connect("notify::active", self._on_enable_toggled)
+        settings_group.add(self._enable_row)
+
+        reset_btn = Gtk.Button(icon_name="edit-clear-symbolic")
+        reset_btn.add_css_class("flat")
+        reset_btn.set_valign(Gtk.Align.CENTER)
+        reset_btn.set_tooltip_text(_("Clear counters"))
+        reset_btn.connect("clicked", self._on_reset_clicked)
+        self.add_header_button(reset_btn)
+
+        self._terminals_group = Adw.PreferencesGroup(title=_("Terminals"))
+        page.add(self._terminals_group)
+
+        self.set_body_content(page)
+
+    def _get_terminal_managers(self) -> list:
+        """Terminal managers of every window, as the setting is global."""
+        app = self.parent_window.get_application()
+        windows = app.get_windows() if app else [self.parent_window]
+        return [
+            window.terminal_manager
+            for window in windows
+            if getattr(window, "terminal_manager", None) is not None
+        ]
+
+    def _refresh(self) -> None:
+        for row in self._terminal_rows:
+            self._terminals_group.remove(row)
+        self._terminal_rows.clear()
+
+        manager = getattr(self.parent_window, "terminal_manager", None)
+        snapshots = manager.get_highlight_telemetry() if manager else []
+        if not snapshots:
+            self._terminals_group.set_description(
+                _("No data yet")
+                if self._enable_row.get_active()
+                else _("Telemetry is disabled")
+            )
+            return
+        self._terminals_group.set_description(None)
+
+        for name, snapshot in snapshots:
+            row = Adw.ExpanderRow(
+                title=GLib.markup_escape_text(name),
+                subtitle=_("p50 {p50:.1f} ms, p99 {p99:.1f} ms").format(
+                    p50=snapshot.latency_p50_ms, p99=snapshot.latency_p99_ms
+                ),
+            )
+            fallbacks = str(snapshot.raw_fallbacks)
+            if snapshot.fallback_reasons:
+                fallbacks += " (" + ", ".join(
+                    f"{reason}: {count}"
+                    for reason, count in sorted(snapshot.fallback_reasons.items())
+                ) + ")"
+            for title, value in (
+                (_("Bytes In"), _format_bytes(snapshot.bytes_in)),
+                (_("Bytes Fed"), _format_bytes(snapshot.bytes_fed)),
+                (_("Lines Highlighted"), str(snapshot.lines_highlighted)),
+                (_("Raw Fallbacks"), fallbacks),
+                (_("Queue High-Water"), _format_bytes(snapshot.queue_high_water)),
+                (_("Latency Samples"), str(snapshot.latency_samples)),
+            ):
+                detail = Adw.ActionRow(title=title)
+                label = Gtk.Label(label=value)
+                label.add_css_class("dim-label")
+                detail.add_suffix(label)
+                row.add_row(detail)
+            self._terminals_group.add(row)
+            self._terminal_rows.append(row)
+
+    def _on_refresh_timeout(self) -> bool:
+        self._refresh()
+        return True
+
+    def _on_enable_toggled(self, switch: Adw.SwitchRow, _pspec) -> None:
+        enabled = switch.get_active()
+        get_settings_manager().set("highlight_telemetry_enabled", enabled)
+        for manager in self._get_terminal_managers():
+            manager.set_highlight_telemetry_enabled(enabled)
+        self._refresh()
+
+    def _on_reset_clicked(self, button: Gtk.Button) -> None:
+        for manager in self._get_terminal_managers():
+            manager.reset_highlight_telemetry()
+        self._refresh()
+
+    def _on_close_request(self, *_args) -> bool:
+        if self._refresh_source_id is not None:
+            GLib.source_remove(self._refresh_source_id)
+            self._refresh_source_id = None
+        return False
@@ -321,6 +321,7 @@ class SessionEditDialog(BaseDialog):
                 self.editing_session.command_specific_highlighting = None
                 self.editing_session.cat_colorization = None
                 self.editing_session.shell_input_highlighting = None
+                self.editing_session.defer_hidden_highlighting = None
                 return
 
             self.editing_session.output_highlighting = self._selected_to_tri_state(
@@ -337,6 +338,11 @@ class SessionEditDialog(BaseDialog):
             self.editing_session.shell_input_highlighting = self._selected_to_tri_state(
                 self.shell_input_highlighting_row.get_selected()
             )
+            self.editing_session.defer_hidden_highlighting = (
+                self._selected_to_tri_state(
+                    self.defer_hidden_highlighting_row.get_selected()
+                )
+            )
         except Exception:
             # Keep the dialog responsive even if validation raises.
             pass
@@ -347,6 +353,7 @@ class SessionEditDialog(BaseDialog):
             self.command_specific_highlighting_row,
             self.cat_colorization_row,
             self.shell_input_highlighting_row,
+            self.defer_hidden_highlighting_row,
         ):
             row.set_visible(visible)
             row.set_sensitive(visible)
@@ -366,6 +373,7 @@ class SessionEditDialog(BaseDialog):
                 self.command_specific_highlighting_row.set_selected(0)
                 self.cat_colorization_row.set_selected(0)
                 self.shell_input_highlighting_row.set_selected(0)
+                self.defer_hidden_highlighting_row.set_selected(0)
 
             self._set_highlighting_overrides_visible(active)
         finally:
@@ -398,6 +406,7 @@ class SessionEditDialog(BaseDialog):
                 "command_specific_highlighting",
                 "cat_colorization",
                 "shell_input_highlighting",
+                "defer_hidden_highlighting",
             )
         )
 
@@ -449,6 +458,16 @@ class SessionEditDialog(BaseDialog):
         )
         group.add(self.shell_input_highlighting_row)
 
+        self.defer_hidden_highlighting_row = self._create_tristate_combo_row(
+            title=_("Pause Highlighting in Background"),
+            subtitle=_("Show output of hidden tabs without highlighting to save CPU"),
+            initial_value=getattr(
+                self.editing_session, "defer_hidden_highlighting", None
+            ),
+            on_changed=self._on_highlighting_override_changed,
+        )
+        group.add(self.defer_hidden_highlighting_row)
+
         # Only show the per-setting overrides when customization is enabled.
         self._set_highlighting_overrides_visible(has_custom_overrides)
 
@@ -1503,6 +1522,7 @@ class SessionEditDialog(BaseDialog):
             session_data["command_specific_highlighting"] = None
             session_data["cat_colorization"] = None
             session_data["shell_input_highlighting"] = None
+            session_data["defer_hidden_highlighting"] = None
         else:
             if hasattr(self, "output_highlighting_row"):
                 session_data["output_highlighting"] = self._selected_to_tri_state(
@@ -1520,6 +1540,10 @@ class SessionEditDialog(BaseDialog):
                 session_data["shell_input_highlighting"] = self._selected_to_tri_state(
                     self.shell_input_highlighting_row.get_selected()
                 )
+            if hasattr(self, "defer_hidden_highlighting_row"):
+                session_data["defer_hidden_highlighting"] = self._selected_to_tri_state(
+                    self.defer_hidden_highlighting_row.get_selected()
+                )
 
         rgba = self.color_button.get_rgba()
         if rgba.alpha > 0:  # Check if a color is set
@@ -50,14 +50,11 @@ def _get_pygments():
     if _pygments_available is None:
         try:
             import pygments
-            from pygments.lexers import TextLexer, get_lexer_by_name
-            from pygments.util import ClassNotFound
+            from pygments.lexers import TextLexer
 
             _pygments_module = {
                 "pygments": pygments,
-                "get_lexer_by_name": get_lexer_by_name,
                 "TextLexer": TextLexer,
-                "ClassNotFound": ClassNotFound,
             }
             _pygments_available = True
             logger.debug("Pygments loaded successfully for syntax highlighting")
@@ -657,9 +654,9 @@ class MessageBubble(Gtk.Box):
 
     def _highlight_with_pygments(self, code: str, lang: str, pygments_mod: dict) -> str:
         """Highlight code using Pygments with Pango markup output."""
-        get_lexer_by_name = pygments_mod["get_lexer_by_name"]
+        from ...terminal.highlighter.pygments_cache import get_lexer_by_alias
+
         TextLexer = pygments_mod["TextLexer"]
-        ClassNotFound = pygments_mod["ClassNotFound"]
 
         # Map common language aliases
         lang_map = {
@@ -671,10 +668,8 @@ class MessageBubble(Gtk.Box):
         }
         lang = lang_map.get(lang.lower(), lang.lower())
 
-        try:
-            lexer = get_lexer_by_name(lang)
-        except ClassNotFound:
-            lexer = TextLexer()
+        # Lexer classes are cached process-wide, shared with the terminals
+        lexer = get_lexer_by_alias(lang) or TextLexer()
 
         # Use terminal palette colors if available, otherwise use Dracula
         if self._palette and len(self._palette) >= 8:
@@ -0,0 +1,231 @@
+# zashterminal/utils/regex_safety.py
+"""
+Static detection of regex patterns prone to catastrophic backtracking.
+
+Highlight rules are user-editable and run against every line of terminal
+output, so a single pathological pattern can stall the terminal. This module
+inspects the parsed pattern for the two classic shapes that cause
+exponential backtracking:
+
+- Nested quantifiers: an unbounded repeat inside another unbounded repeat,
+  where the inner repeat can also consume what follows it, e.g. ``(a+)+``
+  or ``(\\w+\\s?)*``. ``(\\w+\\.)+`` is fine because ``\\w`` cannot match ``.``.
+- Ambiguous alternation: alternatives that can start with the same character
+  inside an unbounded repeat, e.g. ``(a|ab)*`` or ``(\\d|\\w)+``.
+
+The analysis is conservative: patterns it cannot parse (``regex``-only
+syntax) are reported as safe, and the per-match timeout in the output
+highlighter remains the actual safety net.
+"""
+
+import string
+from typing import FrozenSet, List
+
+from .sre_compat import REPEAT_OPCODES, sre_constants, sre_parse
+from .translation_utils import _
+
+# None before Python 3.11
+_POSSESSIVE_REPEAT = getattr(sre_constants, "POSSESSIVE_REPEAT", None)
+
+# Repeats with an upper bound above this are treated as unbounded
+_UNBOUNDED_THRESHOLD = 32
+
+# First-character sets are computed over this alphabet; anything outside
+# it is represented by the _OTHER marker.
+_ALPHABET = frozenset(chr(c) for c in range(128))
+_OTHER = "\x00other"
+_EVERYTHING = _ALPHABET | {_OTHER}
+
+_CATEGORY_SETS = {
+    sre_constants.CATEGORY_DIGIT: frozenset(string.digits),
+    sre_constants.CATEGORY_WORD: (
+        frozenset(string.ascii_letters + string.digits + "_") | {_OTHER}
+    ),
+    sre_constants.CATEGORY_SPACE: frozenset(" \t\n\r\f\v"),
+}
+_CATEGORY_SETS[sre_constants.CATEGORY_NOT_DIGIT] = (
+    _EVERYTHING - _CATEGORY_SETS[sre_constants.CATEGORY_DIGIT]
+)
+_CATEGORY_SETS[sre_constants.CATEGORY_NOT_WORD] = (
+    _EVERYTHING - _CATEGORY_SETS[sre_constants.CATEGORY_WORD]
+) | {_OTHER}
+_CATEGORY_SETS[sre_constants.CATEGORY_NOT_SPACE] = (
+    _EVERYTHING - _CATEGORY_SETS[sre_constants.CATEGORY_SPACE]
+)
+
+
+def _char_set(code: int, ignore_case: bool) -> FrozenSet[str]:
+    ch = chr(code)
+    if ch not in _ALPHABET:
+        return frozenset({_OTHER})
+    if ignore_case:
+        return frozenset({ch.lower(), ch.upper()})
+    return frozenset({ch})
+
+
+def _in_set(items, ignore_case: bool) -> FrozenSet[str]:
+    """First-character set of a character class."""
+    chars = set()
+    negate = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            chars |= _char_set(av, ignore_case)
+        elif op is sre_constants.RANGE:
+            low, high = av
+            if high >= 128:
+                chars.add(_OTHER)
+            for code in range(low, min(high, 127) + 1):
+                chars |= _char_set(code, ignore_case)
+        elif op is sre_constants.CATEGORY:
+            chars |= _CATEGORY_SETS.get(av, _EVERYTHING)
+        else:
+            chars |= _EVERYTHING
+    if negate:
+        return frozenset((_EVERYTHING - chars) | {_OTHER})
+    return frozenset(chars)
+
+
+class _Analyzer:
+    """Walks a parsed pattern and collects backtracking risks."""
+
+    def __init__(self, ignore_case: bool):
+        self.ignore_case = ignore_case
+        self.risks: List[str] = []
+
+    def first_item(self, item):
+        """Return (first-character set, nullable) for one parsed item."""
+        op, av = item
+        if op is sre_constants.LITERAL:
+            return _char_set(av, self.ignore_case), False
+        if op is sre_constants.NOT_LITERAL:
+            return _EVERYTHING - _char_set(av, self.ignore_case), False
+        if op is sre_constants.ANY:
+            return _EVERYTHING, False
+        if op is sre_constants.IN:
+            return _in_set(av, self.ignore_case), False
+        if op is sre_constants.SUBPATTERN:
+            return self.first_seq(av[-1])
+        if op is sre_constants.BRANCH:
+            chars = set()
+            nullable = False
+            for branch in av[1]:
+                branch_chars, branch_nullable = self.first_seq(branch)
+                chars |= branch_chars
+                nullable = nullable or branch_nullable
+            return frozenset(chars), nullable
+        if op in REPEAT_OPCODES:
+            min_count, _max_count, body = av
+            body_chars, body_nullable = self.first_seq(body)
+            return body_chars, body_nullable or min_count == 0
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return frozenset(), True
+        # Back-references, conditionals, atomic groups: assume anything
+        return _EVERYTHING, True
+
+    def first_seq(self, items):
+        """Return (first-character set, nullable) for a sequence."""
+        chars = set()
+        for item in items:
+            item_chars, nullable = self.first_item(item)
+            chars |= item_chars
+            if not nullable:
+                return frozenset(chars), False
+        return frozenset(chars), True
+
+    def follow(self, items, index: int, cont: FrozenSet[str]) -> FrozenSet[str]:
+        """Characters that may follow items[index]."""
+        rest_chars, rest_nullable = self.first_seq(items[index + 1 :])
+        return rest_chars | cont if rest_nullable else rest_chars
+
+    def walk(self, items, cont: FrozenSet[str], in_loop: bool) -> None:
+        """
+        Inspect a sequence.
+
+        Args:
+            items: Parsed items of the sequence.
+            cont: Characters that may follow the sequence. Inside an
+                unbounded repeat this includes the start of the next
+                iteration.
+            in_loop: Whether the sequence is inside an unbounded repeat.
+        """
+        for index, (op, av) in enumerate(items):
+            follow = self.follow(items, index, cont)
+            if op in REPEAT_OPCODES:
+                _min_count, max_count, body = av
+                if max_count > _UNBOUNDED_THRESHOLD and op is not _POSSESSIVE_REPEAT:
+                    body_chars, _nullable = self.first_seq(body)
+                    if in_loop and body_chars & follow:
+                        self.risks.append(
+                            _("nested quantifiers can match the same text in many ways")
+                        )
+                    self.check_alternation(body)
+                    self.walk(body, body_chars, True)
+                else:
+                    if in_loop:
+                        self.check_optional(op, av, follow)
+                    self.walk(body, follow, in_loop)
+            elif op is sre_constants.SUBPATTERN:
+                self.walk(av[-1], follow, in_loop)
+            elif op is sre_constants.BRANCH:
+                if in_loop:
+                    self.check_optional(op, av, follow)
+                for branch in av[1]:
+                    self.walk(branch, follow, in_loop)
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                self.walk(av[1], frozenset(), False)
+
+    def check_optional(self, op, av, follow: FrozenSet[str]) -> None:
+        """
+        Flag an optional item inside a repeat that overlaps what follows it.
+
+        The parser factors common prefixes out of alternations, so
+        ``(a|aa)+`` arrives here as ``(a(?:|a))+``: the optional tail is
+        what makes the iterations ambiguous.
+        """
+        chars, nullable = self.first_item((op, av))
+        if nullable and chars & follow:
+            self.risks.append(_("alternatives inside a repeat can match the same text"))
+
+    def check_alternation(self, body) -> None:
+        """Flag alternations with overlapping first characters in a repeat."""
+        for op, av in body:
+            if op is sre_constants.SUBPATTERN:
+                self.check_alternation(av[-1])
+            elif op is sre_constants.BRANCH:
+                seen = set()
+                for branch in av[1]:
+                    branch_chars, _nullable = self.first_seq(branch)
+                    if branch_chars & seen:
+                        self.risks.append(
+                            _("alternatives inside a repeat can match the same text")
+                        )
+                        return
+                    seen |= branch_chars
+
+
+def find_backtracking_risks(pattern: str, ignore_case: bool = True) -> List[str]:
+    """
+    Find constructs in a pattern that may cause catastrophic backtracking.
+
+    Args:
+        pattern: Regular expression source.
+        ignore_case: Whether the pattern is matched case-insensitively (the
+            output highlighter always does).
+
+    Returns:
+        Human-readable descriptions of the risks found, without duplicates.
+        Empty if the pattern looks safe or cannot be analyzed.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+
+    analyzer = _Analyzer(ignore_case)
+    try:
+        analyzer.walk(list(parsed), frozenset(), False)
+    except RecursionError:
+        return []
+    return list(dict.fromkeys(analyzer.risks))
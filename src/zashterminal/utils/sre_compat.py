@@ -0,0 +1,30 @@
+# zashterminal/utils/sre_compat.py
+"""
+Access to the standard library's regex parser.
+
+The parser and its opcode constants moved from the sre_parse and
+sre_constants modules into the re package in Python 3.11; the old modules
+are deprecated there. Modules that inspect parsed patterns import them from
+here.
+"""
+
+try:
+    # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older Python
+    import sre_constants
+    import sre_parse
+
+__all__ = ["REPEAT_OPCODES", "sre_constants", "sre_parse"]
+
+# Opcodes of the repeat operators (POSSESSIVE_REPEAT is new in 3.11)
+REPEAT_OPCODES = tuple(
+    op
+    for op in (
+        sre_constants.MAX_REPEAT,
+        sre_constants.MIN_REPEAT,
+        getattr(sre_constants, "POSSESSIVE_REPEAT", None),
+    )
+    if op is not None
+)